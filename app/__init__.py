@@ -13,6 +13,10 @@ def create_app(config_name=None):
     app.config.from_object(config[config_name])
 
     db.init_app(app)
+
+    from app import database
+
+    database.init_app(app)
     migrate.init_app(app, db)
     csrf.init_app(app)
     login_manager.init_app(app)
@@ -20,20 +24,29 @@ def create_app(config_name=None):
     # Import models so Alembic can detect them
     from app import models  # noqa: F401
 
+    from app import user_cache
+
     @login_manager.user_loader
     def load_user(user_id):
-        from app.models.user import User
-
-        return db.session.get(User, int(user_id))
+        return user_cache.load_user(int(user_id))
 
     from app.routes import register_blueprints
 
     register_blueprints(app)
 
+    from app import instrumentation, jobs
+
+    instrumentation.init_app(app)
+    jobs.init_app(app)
+
     @app.errorhandler(404)
     def not_found(e):
         return render_template("errors/404.html"), 404
 
+    @app.errorhandler(413)
+    def too_large(e):
+        return render_template("errors/413.html"), 413
+
     @app.errorhandler(500)
     def internal_error(e):
         app.logger.exception("Internal server error")
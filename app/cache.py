@@ -0,0 +1,214 @@
+"""Response cache with pluggable backends and per-user data versions.
+
+Cached values are keyed on a per-user data version that is bumped whenever a
+session commits a write to that user's transactions, budget items, analysis
+periods or analysis rows. A bump makes every older entry unreachable, so
+nothing has to be deleted explicitly; stale entries age out of the backend.
+
+Backends (CACHE_BACKEND):
+
+- "memory" (default): a thread-safe in-process LRU. Each worker process has
+  its own cache and versions, so with several workers a write is only seen by
+  the worker that committed it. Entries keyed on data_version() are then only
+  safe in single-process deployments; entries keyed on a conditional GET ETag
+  (app/conditional.py), like the dashboard's, are read from the database and
+  stay correct under any number of workers.
+- "redis": any Redis-compatible server at CACHE_URL, shared by all workers.
+  Requires the optional ``redis`` package.
+- "null": caching disabled.
+
+ORM writes are tracked automatically. Bulk Core statements that bypass the
+mapper (executemany inserts, Query.delete) must call mark_user_changed().
+"""
+
+import pickle
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.models.budget import BudgetedExpense
+from app.models.expense_analysis import AnalysisPeriod, ExpenseAnalysis
+from app.models.transaction import Transaction
+
+_EXTENSION_KEY = "cache"
+_CHANGED_KEY = "changed_user_ids"
+_MISSING = object()
+
+
+class NullCache:
+    """Stores nothing; data versions still work so callers need no branches."""
+
+    def __init__(self):
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def version(self, name: str) -> int:
+        return self._versions.get(name, 0)
+
+    def bump(self, name: str) -> int:
+        with self._lock:
+            self._versions[name] = self._versions.get(name, 0) + 1
+            return self._versions[name]
+
+
+class LRUCache(NullCache):
+    """In-process least-recently-used cache holding at most max_entries values.
+
+    Versions are kept apart from the entries so eviction can never reset a
+    version and resurrect an older entry.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache:
+    """Cache on a Redis-compatible server; values are pickled.
+
+    Entries expire after ``timeout`` seconds; version counters never expire.
+    """
+
+    def __init__(self, client, *, prefix: str = "budget:", timeout: int = 3600):
+        self.client = client
+        self.prefix = prefix
+        self.timeout = timeout
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisCache":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requires the 'redis' package"
+            ) from e
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, key: str) -> Any:
+        raw = self.client.get(self.prefix + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any) -> None:
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=self.timeout)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def version(self, name: str) -> int:
+        return int(self.client.get(f"{self.prefix}version:{name}") or 0)
+
+    def bump(self, name: str) -> int:
+        return int(self.client.incr(f"{self.prefix}version:{name}"))
+
+
+def _create_backend(config) -> NullCache | RedisCache:
+    backend = config.get("CACHE_BACKEND", "memory")
+    if backend == "memory":
+        return LRUCache(config.get("CACHE_MAX_ENTRIES", 1024))
+    if backend == "redis":
+        return RedisCache.from_url(
+            config["CACHE_URL"], timeout=config.get("CACHE_TIMEOUT", 3600)
+        )
+    if backend == "null":
+        return NullCache()
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend!r}")
+
+
+def get_cache() -> NullCache | RedisCache:
+    cache = current_app.extensions.get(_EXTENSION_KEY)
+    if cache is None:
+        cache = current_app.extensions.setdefault(
+            _EXTENSION_KEY, _create_backend(current_app.config)
+        )
+    return cache
+
+
+def data_version(user_id: int) -> int:
+    """Current data version of user_id; changes after every committed write."""
+    return get_cache().version(f"user:{user_id}")
+
+
+def get_or_set(key: str, factory: Callable[[], Any]) -> Any:
+    """Return the cached value for key, computing and storing it on a miss."""
+    cache = get_cache()
+    value = cache.get(key)
+    if value is None:
+        value = factory()
+        cache.set(key, value)
+    return value
+
+
+def mark_user_changed(session: Session, user_id: int) -> None:
+    """Bump user_id's data version when session next commits."""
+    session.info.setdefault(_CHANGED_KEY, set()).add(user_id)
+
+
+@event.listens_for(Transaction, "after_insert")
+@event.listens_for(Transaction, "after_update")
+@event.listens_for(Transaction, "after_delete")
+@event.listens_for(BudgetedExpense, "after_insert")
+@event.listens_for(BudgetedExpense, "after_update")
+@event.listens_for(BudgetedExpense, "after_delete")
+@event.listens_for(AnalysisPeriod, "after_insert")
+@event.listens_for(AnalysisPeriod, "after_update")
+@event.listens_for(AnalysisPeriod, "after_delete")
+@event.listens_for(ExpenseAnalysis, "after_insert")
+@event.listens_for(ExpenseAnalysis, "after_update")
+@event.listens_for(ExpenseAnalysis, "after_delete")
+def _mark_owner_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None and target.user_id is not None:
+        mark_user_changed(session, target.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session):
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if changed and has_app_context():
+        cache = get_cache()
+        for user_id in changed:
+            cache.bump(f"user:{user_id}")
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_on_rollback(session, previous_transaction):
+    session.info.pop(_CHANGED_KEY, None)
@@ -0,0 +1,86 @@
+"""HTTP conditional GET for read-heavy pages.
+
+A page's validator is derived from MAX(updated_at) and COUNT(*) of the rows
+it renders (TimestampMixin keeps updated_at current on every write; the
+count catches deletes), fetched together in one statement. The ETag also
+covers the user, any extra request state passed in, and the CSRF token
+lifetime so a revalidated page never carries an expired token.
+
+Usage in a view::
+
+    validators = conditional.validators(
+        conditional.table_state(Model, Model.user_id == user_id), extra=(...)
+    )
+    if response := conditional.not_modified(validators):
+        return response
+    return conditional.with_validators(render_template(...), validators)
+"""
+
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+from sqlalchemy import func, select
+
+from app.database import replica_read
+from app.extensions import db
+
+
+def table_state(model, *criteria):
+    """Scalar subqueries for MAX(updated_at) and COUNT(*) of matching rows."""
+    return (
+        select(func.max(model.updated_at)).where(*criteria).scalar_subquery(),
+        select(func.count()).select_from(model).where(*criteria).scalar_subquery(),
+    )
+
+
+def _csrf_window() -> int:
+    limit = current_app.config.get("WTF_CSRF_TIME_LIMIT", 3600)
+    return int(time.time() // (limit / 2)) if limit else 0
+
+
+@replica_read
+def validators(*states, extra: tuple = ()) -> tuple[str, datetime | None]:
+    """Return (etag, last_modified) for the given table_state() pairs."""
+    values = db.session.execute(
+        select(*(column for state in states for column in state))
+    ).one()
+    stamps = [v for v in values[::2] if v is not None]
+    last_modified = max(stamps).replace(tzinfo=timezone.utc) if stamps else None
+
+    user = (current_user.get_id(), getattr(current_user, "updated_at", None))
+    raw = repr((user, _csrf_window(), tuple(values), extra))
+    return hashlib.sha1(raw.encode()).hexdigest(), last_modified
+
+
+def not_modified(validators: tuple[str, datetime | None]):
+    """A 304 response if the client's cached copy is current, else None.
+
+    Pending flash messages must be rendered, so they always get a full page.
+    """
+    if "_flashes" in session:
+        return None
+    etag, last_modified = validators
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since and last_modified:
+        fresh = last_modified.replace(microsecond=0) <= request.if_modified_since
+    else:
+        fresh = False
+    if not fresh:
+        return None
+    return with_validators(make_response("", 304), validators)
+
+
+def with_validators(response, validators: tuple[str, datetime | None]):
+    """Attach ETag, Last-Modified and revalidation headers to response."""
+    response = make_response(response)
+    etag, last_modified = validators
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
@@ -0,0 +1,118 @@
+"""Per-connection database tuning and read-replica routing.
+
+SQLite settings such as journal_mode and busy_timeout are connection state,
+so they are applied with PRAGMA statements from a connect-event hook on every
+new DBAPI connection. The pragmas come from the SQLITE_PRAGMAS config dict;
+server databases are tuned through SQLALCHEMY_ENGINE_OPTIONS instead (see
+config.engine_options).
+
+When SQLALCHEMY_BINDS has a "replica" engine, service functions decorated
+with replica_read() run their SELECTs against it while everything else,
+including flushes and DML, stays on the primary. Reads fall back to the
+primary while the session holds uncommitted writes and, for
+REPLICA_READ_AFTER_WRITE_SECONDS after a browser session's own commit, so
+users always see their own writes despite replication lag.
+"""
+
+import functools
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+
+import sqlalchemy as sa
+from flask import current_app, has_request_context, session as http_session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+REPLICA_BIND = "replica"
+_READ_DEPTH_KEY = "replica_read_depth"
+_WROTE_KEY = "wrote"
+_LAST_WRITE_KEY = "_last_write_at"
+
+
+def _recent_write() -> bool:
+    if not has_request_context():
+        return False
+    last = http_session.get(_LAST_WRITE_KEY)
+    window = current_app.config.get("REPLICA_READ_AFTER_WRITE_SECONDS", 5)
+    return last is not None and time.time() - last < window
+
+
+class RoutingSession(Session):
+    """Session that sends replica_read() SELECTs to the replica bind."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and (self._flushing or isinstance(clause, sa.UpdateBase)):
+            self.info[_WROTE_KEY] = True
+        elif (
+            bind is None
+            and self.info.get(_READ_DEPTH_KEY)
+            and not self.info.get(_WROTE_KEY)
+            and not _recent_write()
+        ):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+@contextmanager
+def read_replica():
+    """Route the current session's reads to the replica inside the block."""
+    from app.extensions import db
+
+    info = db.session.info
+    info[_READ_DEPTH_KEY] = info.get(_READ_DEPTH_KEY, 0) + 1
+    try:
+        yield
+    finally:
+        info[_READ_DEPTH_KEY] -= 1
+
+
+def replica_read(fn: Callable) -> Callable:
+    """Decorator for read-only service functions; see read_replica()."""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with read_replica():
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_write(session):
+    if session.info.pop(_WROTE_KEY, False) and has_request_context():
+        http_session[_LAST_WRITE_KEY] = time.time()
+
+
+@event.listens_for(RoutingSession, "after_soft_rollback")
+def _forget_write(session, previous_transaction):
+    session.info.pop(_WROTE_KEY, None)
+
+
+def _pragma_listener(pragmas: dict):
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()]
+
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    return apply_pragmas
+
+
+def init_app(app) -> None:
+    """Register the SQLITE_PRAGMAS connect hook on the app's SQLite engines."""
+    from app.extensions import db
+
+    pragmas = app.config.get("SQLITE_PRAGMAS")
+    if not pragmas:
+        return
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == "sqlite":
+                event.listen(engine, "connect", _pragma_listener(pragmas))
@@ -5,6 +5,8 @@ from flask_wtf.csrf import CSRFProtect
 from sqlalchemy import MetaData
 from sqlalchemy.orm import DeclarativeBase
 
+from app.database import RoutingSession
+
 # Explicit naming convention for Alembic compatibility
 _convention = {
     "ix": "ix_%(column_0_label)s",
@@ -19,7 +21,7 @@ class Base(DeclarativeBase):
     metadata = MetaData(naming_convention=_convention)
 
 
-db = SQLAlchemy(model_class=Base)
+db = SQLAlchemy(model_class=Base, session_options={"class_": RoutingSession})
 migrate = Migrate()
 csrf = CSRFProtect()
 login_manager = LoginManager()
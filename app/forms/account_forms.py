@@ -16,5 +16,7 @@ class AccountForm(FlaskForm):
     account_number_last4 = StringField(
         "Last 4 Digits", validators=[Optional(), Length(max=4)]
     )
-    balance = DecimalField("Balance", default=0.00, places=2, validators=[Optional()])
+    balance = DecimalField(
+        "Opening Balance", default=0.00, places=2, validators=[Optional()]
+    )
     is_active = BooleanField("Active", default=True)
@@ -0,0 +1,167 @@
+"""Opt-in per-request SQL instrumentation.
+
+When SQL_METRICS_ENABLED is set, every statement executed on the app's
+engines is timed and attributed to the current request. After each request
+a structured log line is written with the endpoint, status, statement count,
+total DB time and the slowest statements, a Server-Timing header is added,
+and per-endpoint totals are accumulated for the /_debug/metrics endpoint,
+readable only by the users named in SQL_METRICS_USERS.
+"""
+
+import json
+import threading
+import time
+
+from flask import (
+    Blueprint,
+    abort,
+    current_app,
+    g,
+    has_request_context,
+    jsonify,
+    request,
+)
+from flask_login import current_user, login_required
+from sqlalchemy import event
+
+from app.extensions import db
+
+_EXTENSION_KEY = "sql_metrics"
+_STATEMENT_PREVIEW = 200
+
+bp = Blueprint("debug", __name__)
+
+
+class EndpointMetrics:
+    """Thread-safe running totals per endpoint."""
+
+    def __init__(self, slowest: int):
+        self.slowest = slowest
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, dict] = {}
+
+    def record(self, endpoint: str, metrics: dict, request_ms: float) -> None:
+        with self._lock:
+            stats = self._endpoints.setdefault(
+                endpoint,
+                {
+                    "requests": 0,
+                    "statements": 0,
+                    "max_statements": 0,
+                    "db_ms": 0.0,
+                    "request_ms": 0.0,
+                    "slowest": [],
+                },
+            )
+            stats["requests"] += 1
+            stats["statements"] += metrics["count"]
+            stats["max_statements"] = max(stats["max_statements"], metrics["count"])
+            stats["db_ms"] += metrics["db_ms"]
+            stats["request_ms"] += request_ms
+            stats["slowest"] = _top(stats["slowest"] + metrics["slowest"], self.slowest)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            result = {}
+            for endpoint, stats in self._endpoints.items():
+                n = stats["requests"]
+                result[endpoint] = {
+                    "requests": n,
+                    "avg_statements": round(stats["statements"] / n, 2),
+                    "max_statements": stats["max_statements"],
+                    "avg_db_ms": round(stats["db_ms"] / n, 3),
+                    "avg_request_ms": round(stats["request_ms"] / n, 3),
+                    "slowest": [dict(s) for s in stats["slowest"]],
+                }
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+
+def _top(statements: list[dict], n: int) -> list[dict]:
+    return sorted(statements, key=lambda s: s["ms"], reverse=True)[:n]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info.pop("query_start")) * 1000
+    if not has_request_context():
+        return
+    metrics = g.get("sql_metrics")
+    if metrics is None:
+        return
+    metrics["count"] += 1
+    metrics["db_ms"] += elapsed_ms
+    metrics["slowest"] = _top(
+        metrics["slowest"]
+        + [{"ms": round(elapsed_ms, 3), "sql": statement[:_STATEMENT_PREVIEW]}],
+        current_app.config["SQL_METRICS_SLOWEST"],
+    )
+
+
+def _start_request():
+    g.sql_metrics = {"count": 0, "db_ms": 0.0, "slowest": []}
+    g.request_started = time.perf_counter()
+
+
+def _finish_request(response):
+    metrics = g.pop("sql_metrics", None)
+    if metrics is None:
+        return response
+    request_ms = (time.perf_counter() - g.pop("request_started")) * 1000
+    endpoint = request.endpoint or "<unmatched>"
+
+    current_app.extensions[_EXTENSION_KEY].record(endpoint, metrics, request_ms)
+    current_app.logger.info(
+        json.dumps(
+            {
+                "event": "request_metrics",
+                "endpoint": endpoint,
+                "method": request.method,
+                "status": response.status_code,
+                "statements": metrics["count"],
+                "db_ms": round(metrics["db_ms"], 3),
+                "request_ms": round(request_ms, 3),
+                "slowest": metrics["slowest"],
+            }
+        )
+    )
+    response.headers.add(
+        "Server-Timing",
+        f'db;dur={metrics["db_ms"]:.3f};desc="{metrics["count"]} queries"',
+    )
+    return response
+
+
+@bp.route("/metrics")
+@login_required
+def metrics():
+    # Statement previews cover every user's requests, so hide them from others
+    if current_user.username not in current_app.config.get("SQL_METRICS_USERS", ()):
+        abort(404)
+    return jsonify(current_app.extensions[_EXTENSION_KEY].snapshot())
+
+
+def get_metrics() -> EndpointMetrics | None:
+    return current_app.extensions.get(_EXTENSION_KEY)
+
+
+def init_app(app) -> None:
+    """Attach instrumentation to app if SQL_METRICS_ENABLED is set."""
+    if not app.config.get("SQL_METRICS_ENABLED"):
+        return
+
+    app.extensions[_EXTENSION_KEY] = EndpointMetrics(app.config["SQL_METRICS_SLOWEST"])
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.register_blueprint(bp, url_prefix="/_debug")
@@ -0,0 +1,386 @@
+"""Background jobs for work that should not hold up a request.
+
+Tasks are plain functions registered with @task(name). enqueue() records a
+job and returns it immediately; a worker later runs the task inside an
+application context. Jobs carry a coalescing key: enqueueing while a job
+with the same key is still queued merges the new arguments into it (with
+the task's merge function) instead of adding another job. Jobs of the same
+user never run concurrently, so a slower, older job cannot overwrite the
+results of a newer one.
+
+Job arguments must be JSON-serializable; a task is called with them plus
+user_id when the job has one. A job is a dict with id, name, key,
+user_id, kwargs, status (queued, running, done, failed), error and
+created_at / started_at / finished_at timestamps.
+
+Backends (JOBS_BACKEND):
+
+- "thread" (default): in-memory queue run by a thread pool of JOBS_WORKERS.
+  Queued jobs are lost if the process exits.
+- "sqlite": durable queue in the SQLite file JOBS_DATABASE, drained by
+  JOBS_WORKERS polling threads in every process using it. Jobs left running
+  by a dead process are retried after JOBS_STALE_SECONDS.
+- "sync": runs each job inside enqueue(); used by the test suite.
+"""
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from flask import Blueprint, abort, current_app, jsonify
+from flask_login import current_user, login_required
+
+_EXTENSION_KEY = "jobs"
+
+TASKS: dict[str, tuple[Callable, Callable]] = {}
+
+bp = Blueprint("jobs", __name__)
+
+
+def _keep_latest(old: dict, new: dict) -> dict:
+    return new
+
+
+def merge_date_range(old: dict, new: dict) -> dict:
+    """Merge kwargs whose min_date/max_date ISO strings bound a date range."""
+    return {
+        **new,
+        "min_date": min(old["min_date"], new["min_date"]),
+        "max_date": max(old["max_date"], new["max_date"]),
+    }
+
+
+def task(name: str, *, merge: Callable[[dict, dict], dict] = _keep_latest):
+    """Register fn as the task called name; merge(old, new) coalesces kwargs."""
+
+    def register(fn: Callable) -> Callable:
+        TASKS[name] = (fn, merge)
+        return fn
+
+    return register
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _new_job(job_id: int, name: str, key: str, user_id, kwargs: dict) -> dict:
+    return {
+        "id": job_id,
+        "name": name,
+        "key": key,
+        "user_id": user_id,
+        "kwargs": kwargs,
+        "status": "queued",
+        "error": None,
+        "created_at": _now(),
+        "started_at": None,
+        "finished_at": None,
+    }
+
+
+def _execute(app, job: dict) -> tuple[str, str | None]:
+    """Run job's task in an app context. Returns (status, error)."""
+    fn, _ = TASKS[job["name"]]
+    kwargs = dict(job["kwargs"])
+    if job["user_id"] is not None:
+        kwargs["user_id"] = job["user_id"]
+    with app.app_context():
+        try:
+            fn(**kwargs)
+        except Exception as e:
+            app.logger.exception("Job %s (%s) failed", job["id"], job["name"])
+            return "failed", f"{type(e).__name__}: {e}"
+    return "done", None
+
+
+class SyncQueue:
+    """Runs every job immediately in the caller; keeps a bounded history."""
+
+    def __init__(self, app, history: int = 1000):
+        self.app = app
+        self.history = history
+        self._jobs: OrderedDict[int, dict] = OrderedDict()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def _record(self, name: str, key: str, user_id, kwargs: dict) -> dict:
+        job = _new_job(self._next_id, name, key, user_id, kwargs)
+        self._next_id += 1
+        self._jobs[job["id"]] = job
+        while len(self._jobs) > self.history:
+            oldest = next(iter(self._jobs.values()))
+            if oldest["status"] in ("queued", "running"):
+                break
+            self._jobs.popitem(last=False)
+        return job
+
+    def enqueue(self, name: str, *, key: str, user_id=None, **kwargs) -> dict:
+        with self._lock:
+            job = self._record(name, key, user_id, kwargs)
+        self._run(job)
+        return dict(job)
+
+    def _run(self, job: dict) -> None:
+        job["status"], job["started_at"] = "running", _now()
+        job["status"], job["error"] = _execute(self.app, job)
+        job["finished_at"] = _now()
+
+    def get(self, job_id: int) -> dict | None:
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+    def active_for_user(self, user_id: int) -> list[dict]:
+        with self._lock:
+            return [
+                dict(job)
+                for job in self._jobs.values()
+                if job["user_id"] == user_id and job["status"] in ("queued", "running")
+            ]
+
+
+class ThreadQueue(SyncQueue):
+    """In-memory queue executed by a thread pool."""
+
+    def __init__(self, app, workers: int = 2, history: int = 1000):
+        super().__init__(app, history)
+        self._queued: dict[str, int] = {}
+        self._user_locks: dict[object, threading.Lock] = {}
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="job")
+
+    def enqueue(self, name: str, *, key: str, user_id=None, **kwargs) -> dict:
+        _, merge = TASKS[name]
+        with self._lock:
+            queued_id = self._queued.get(key)
+            if queued_id is not None:
+                job = self._jobs[queued_id]
+                job["kwargs"] = merge(job["kwargs"], kwargs)
+                return dict(job)
+            job = self._record(name, key, user_id, kwargs)
+            self._queued[key] = job["id"]
+        self._executor.submit(self._work, job)
+        return dict(job)
+
+    def _work(self, job: dict) -> None:
+        with self._lock:
+            user_lock = self._user_locks.setdefault(job["user_id"], threading.Lock())
+        with user_lock:
+            with self._lock:
+                # Until now the job could still absorb new enqueues for its key
+                if self._queued.get(job["key"]) == job["id"]:
+                    del self._queued[job["key"]]
+            self._run(job)
+
+
+class SQLiteQueue:
+    """Durable queue stored in its own SQLite file."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            key TEXT NOT NULL,
+            user_id INTEGER,
+            kwargs TEXT NOT NULL,
+            status TEXT NOT NULL,
+            error TEXT,
+            created_at TEXT NOT NULL,
+            started_at TEXT,
+            finished_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS ix_jobs_status_key ON jobs (status, key);
+        CREATE INDEX IF NOT EXISTS ix_jobs_user_id_status ON jobs (user_id, status);
+    """
+
+    def __init__(
+        self,
+        app,
+        path: str,
+        *,
+        workers: int = 2,
+        poll_seconds: float = 1.0,
+        stale_seconds: float = 3600,
+    ):
+        self.app = app
+        self.path = path
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.stale_seconds = stale_seconds
+        self._wake = threading.Event()
+        self._started = False
+        self._start_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(self.SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Autocommit mode; multi-statement updates use explicit BEGIN IMMEDIATE
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row | None) -> dict | None:
+        if row is None:
+            return None
+        job = dict(row)
+        job["kwargs"] = json.loads(job["kwargs"])
+        return job
+
+    def enqueue(self, name: str, *, key: str, user_id=None, **kwargs) -> dict:
+        _, merge = TASKS[name]
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE key = ? AND status = 'queued'", (key,)
+            ).fetchone()
+            if row is not None:
+                merged = merge(json.loads(row["kwargs"]), kwargs)
+                conn.execute(
+                    "UPDATE jobs SET kwargs = ? WHERE id = ?",
+                    (json.dumps(merged), row["id"]),
+                )
+                job_id = row["id"]
+            else:
+                job_id = conn.execute(
+                    "INSERT INTO jobs (name, key, user_id, kwargs, status, created_at)"
+                    " VALUES (?, ?, ?, ?, 'queued', ?)",
+                    (name, key, user_id, json.dumps(kwargs), _now()),
+                ).lastrowid
+            conn.execute("COMMIT")
+            job = self._to_job(
+                conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            )
+        self.start()
+        self._wake.set()
+        return job
+
+    def get(self, job_id: int) -> dict | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row)
+
+    def active_for_user(self, user_id: int) -> list[dict]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs WHERE user_id = ?"
+                " AND status IN ('queued', 'running') ORDER BY id",
+                (user_id,),
+            ).fetchall()
+        return [self._to_job(row) for row in rows]
+
+    def claim(self) -> dict | None:
+        """Mark the oldest runnable job running and return it, or None."""
+        stale = (
+            datetime.now(timezone.utc) - timedelta(seconds=self.stale_seconds)
+        ).isoformat()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL"
+                " WHERE status = 'running' AND started_at < ?",
+                (stale,),
+            )
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' AND (user_id IS NULL"
+                " OR user_id NOT IN (SELECT user_id FROM jobs"
+                " WHERE status = 'running' AND user_id IS NOT NULL))"
+                " ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?",
+                    (_now(), row["id"]),
+                )
+            conn.execute("COMMIT")
+        return self._to_job(row)
+
+    def run_pending(self) -> int:
+        """Run runnable jobs in the calling thread until none is left."""
+        count = 0
+        while job := self.claim():
+            status, error = _execute(self.app, job)
+            with self._connect() as conn:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ?"
+                    " WHERE id = ?",
+                    (status, error, _now(), job["id"]),
+                )
+            count += 1
+        return count
+
+    def _worker(self) -> None:
+        while True:
+            if not self.run_pending():
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+
+    def start(self) -> None:
+        """Start the polling worker threads once per process."""
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+        for i in range(self.workers):
+            threading.Thread(target=self._worker, name=f"job-{i}", daemon=True).start()
+
+
+def _create_queue(app):
+    config = app.config
+    backend = config.get("JOBS_BACKEND", "thread")
+    if backend == "thread":
+        return ThreadQueue(app, config.get("JOBS_WORKERS", 2))
+    if backend == "sqlite":
+        return SQLiteQueue(
+            app,
+            config["JOBS_DATABASE"],
+            workers=config.get("JOBS_WORKERS", 2),
+            poll_seconds=config.get("JOBS_POLL_SECONDS", 1.0),
+            stale_seconds=config.get("JOBS_STALE_SECONDS", 3600),
+        )
+    if backend == "sync":
+        return SyncQueue(app)
+    raise ValueError(f"Unknown JOBS_BACKEND: {backend!r}")
+
+
+def get_queue():
+    queue = current_app.extensions.get(_EXTENSION_KEY)
+    if queue is None:
+        app = current_app._get_current_object()
+        queue = app.extensions.setdefault(_EXTENSION_KEY, _create_queue(app))
+    return queue
+
+
+def enqueue(name: str, *, key: str, user_id: int | None = None, **kwargs) -> dict:
+    return get_queue().enqueue(name, key=key, user_id=user_id, **kwargs)
+
+
+def get_job(job_id: int) -> dict | None:
+    return get_queue().get(job_id)
+
+
+def active_for_user(user_id: int) -> list[dict]:
+    """Queued and running jobs of user_id."""
+    return get_queue().active_for_user(user_id)
+
+
+@bp.route("/<int:job_id>")
+@login_required
+def job_status(job_id):
+    job = get_job(job_id)
+    if job is None or job["user_id"] != current_user.id:
+        abort(404)
+    return jsonify(job)
+
+
+def init_app(app) -> None:
+    app.register_blueprint(bp, url_prefix="/jobs")
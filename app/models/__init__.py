@@ -1,18 +1,22 @@
 from app.models.user import User
 from app.models.vendor import Vendor
-from app.models.account import Account
+from app.models.account import Account, AccountBalanceSnapshot
 from app.models.category import Category
 from app.models.budget import BudgetedExpense
-from app.models.transaction import Transaction
+from app.models.transaction import Transaction, TransactionMonthlyRollup
 from app.models.expense_analysis import AnalysisPeriod, ExpenseAnalysis
+from app.models.import_job import ImportJob
 
 __all__ = [
     "User",
     "Vendor",
     "Account",
+    "AccountBalanceSnapshot",
     "Category",
     "BudgetedExpense",
     "Transaction",
+    "TransactionMonthlyRollup",
     "AnalysisPeriod",
     "ExpenseAnalysis",
+    "ImportJob",
 ]
@@ -1,6 +1,7 @@
+from datetime import date
 from decimal import Decimal
 
-from sqlalchemy import String, Boolean, ForeignKey, Numeric
+from sqlalchemy import String, Boolean, Date, ForeignKey, Index, Numeric
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.extensions import db
@@ -16,6 +17,7 @@ class Account(TimestampMixin, db.Model):
     vendor_id: Mapped[int] = mapped_column(ForeignKey("vendors.id"), index=True)
     account_type: Mapped[str] = mapped_column(String(50))
     account_number_last4: Mapped[str | None] = mapped_column(String(4))
+    # Opening balance, before the first transaction (see account_service.get_balance)
     balance: Mapped[Decimal] = mapped_column(Numeric(12, 2), default=Decimal("0.00"))
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
@@ -30,3 +32,30 @@ class Account(TimestampMixin, db.Model):
 
     def __repr__(self):
         return f"<Account {self.name}>"
+
+
+class AccountBalanceSnapshot(TimestampMixin, db.Model):
+    """Net of every transaction on an account dated on or before ``as_of``.
+
+    ``as_of`` is the last day of a calendar month. The opening balance is not
+    included, so editing it leaves snapshots valid. transaction_service adds
+    each write's delta to every later snapshot of the accounts it touches.
+    """
+
+    __tablename__ = "account_balance_snapshots"
+    __table_args__ = (
+        Index(
+            "ix_account_balance_snapshots_account_id_as_of",
+            "account_id",
+            "as_of",
+            unique=True,
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"))
+    as_of: Mapped[date] = mapped_column(Date)
+    balance: Mapped[Decimal] = mapped_column(Numeric(14, 2), default=Decimal("0.00"))
+
+    def __repr__(self):
+        return f"<AccountBalanceSnapshot {self.account_id} {self.as_of}>"
@@ -1,7 +1,15 @@
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import String, Date, ForeignKey, Numeric, Integer, UniqueConstraint
+from sqlalchemy import (
+    String,
+    Date,
+    DateTime,
+    ForeignKey,
+    Numeric,
+    Integer,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.extensions import db
@@ -19,6 +27,9 @@ class AnalysisPeriod(TimestampMixin, db.Model):
     start_date: Mapped[date] = mapped_column(Date)
     end_date: Mapped[date] = mapped_column(Date)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+    # When the analysis rows were last fully computed for the current date
+    # range; NULL until then, and deltas cannot be applied to such a period
+    computed_at: Mapped[datetime | None] = mapped_column(DateTime)
 
     # Relationships
     user = relationship("User", back_populates="analysis_periods")
@@ -0,0 +1,39 @@
+from datetime import date, datetime
+
+from sqlalchemy import String, Text, Date, DateTime, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+from app.models.base import TimestampMixin
+
+
+class ImportJob(TimestampMixin, db.Model):
+    """A CSV upload spooled to disk and imported by a background job.
+
+    Progress columns are updated in the same commit as each imported batch,
+    so last_row is an exact checkpoint for resuming an interrupted import.
+    """
+
+    __tablename__ = "import_jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+    account_id: Mapped[int | None] = mapped_column(ForeignKey("accounts.id"))
+    filename: Mapped[str] = mapped_column(String(255))
+    spool_path: Mapped[str] = mapped_column(String(500))
+    status: Mapped[str] = mapped_column(String(10), default="queued")
+    total_bytes: Mapped[int] = mapped_column(Integer, default=0)
+    processed_bytes: Mapped[int] = mapped_column(Integer, default=0)
+    last_row: Mapped[int] = mapped_column(Integer, default=0)
+    imported: Mapped[int] = mapped_column(Integer, default=0)
+    skipped: Mapped[int] = mapped_column(Integer, default=0)
+    error_count: Mapped[int] = mapped_column(Integer, default=0)
+    errors: Mapped[str | None] = mapped_column(Text)  # JSON list, first few only
+    min_date: Mapped[date | None] = mapped_column(Date)
+    max_date: Mapped[date | None] = mapped_column(Date)
+    message: Mapped[str | None] = mapped_column(Text)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+    def __repr__(self):
+        return f"<ImportJob {self.id} {self.status}>"
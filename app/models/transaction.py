@@ -1,7 +1,7 @@
 from datetime import date
 from decimal import Decimal
 
-from sqlalchemy import String, Text, Date, ForeignKey, Numeric, Index
+from sqlalchemy import String, Text, Date, ForeignKey, Numeric, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.extensions import db
@@ -12,9 +12,39 @@ from app.models.enums import TransactionType
 class Transaction(TimestampMixin, db.Model):
     __tablename__ = "transactions"
     __table_args__ = (
+        # List paging: user_id = ? ORDER BY transaction_date, id (id is the rowid)
         Index(
             "ix_transactions_user_id_transaction_date", "user_id", "transaction_date"
         ),
+        # Analysis actuals: covers the whole query, so no table rows are read
+        Index(
+            "ix_transactions_user_id_type_date_category",
+            "user_id",
+            "transaction_type",
+            "transaction_date",
+            "category_id",
+            "subcategory_id",
+            "amount",
+        ),
+        # Conditional GET validators: MAX(updated_at) and COUNT(*) per user
+        Index("ix_transactions_user_id_updated_at", "user_id", "updated_at"),
+        # Account filter: one per side of the debit/credit OR, in date order
+        Index(
+            "ix_transactions_debit_account_id_transaction_date",
+            "debit_account_id",
+            "transaction_date",
+        ),
+        Index(
+            "ix_transactions_credit_account_id_transaction_date",
+            "credit_account_id",
+            "transaction_date",
+        ),
+        Index(
+            "ix_transactions_user_id_fingerprint",
+            "user_id",
+            "fingerprint",
+            unique=True,
+        ),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -25,19 +55,17 @@ class Transaction(TimestampMixin, db.Model):
     amount: Mapped[Decimal] = mapped_column(Numeric(12, 2))
     transaction_type: Mapped[str] = mapped_column(String(10))
     notes: Mapped[str | None] = mapped_column(Text)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
-    debit_account_id: Mapped[int | None] = mapped_column(
-        ForeignKey("accounts.id"), index=True
-    )
-    credit_account_id: Mapped[int | None] = mapped_column(
-        ForeignKey("accounts.id"), index=True
-    )
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    debit_account_id: Mapped[int | None] = mapped_column(ForeignKey("accounts.id"))
+    credit_account_id: Mapped[int | None] = mapped_column(ForeignKey("accounts.id"))
     category_id: Mapped[int | None] = mapped_column(
         ForeignKey("categories.id"), index=True
     )
     subcategory_id: Mapped[int | None] = mapped_column(
         ForeignKey("categories.id"), index=True
     )
+    # Content hash of an imported row (see transaction_service.transaction_fingerprint)
+    fingerprint: Mapped[str | None] = mapped_column(String(40))
 
     # Relationships
     user = relationship("User", back_populates="transactions")
@@ -52,3 +80,38 @@ class Transaction(TimestampMixin, db.Model):
 
     def __repr__(self):
         return f"<Transaction {self.payee} {self.amount}>"
+
+
+class TransactionMonthlyRollup(TimestampMixin, db.Model):
+    """Per-month sum and count of transactions, maintained by transaction_service.
+
+    ``month`` is the first day of the calendar month. Category columns may be
+    NULL, so the key is not enforced by a unique constraint; readers always
+    SUM over matching rows.
+    """
+
+    __tablename__ = "transaction_monthly_rollups"
+    __table_args__ = (
+        Index(
+            "ix_transaction_monthly_rollups_user_id_month",
+            "user_id",
+            "month",
+            "category_id",
+            "subcategory_id",
+            "transaction_type",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    month: Mapped[date] = mapped_column(Date)
+    category_id: Mapped[int | None] = mapped_column(ForeignKey("categories.id"))
+    subcategory_id: Mapped[int | None] = mapped_column(ForeignKey("categories.id"))
+    transaction_type: Mapped[str] = mapped_column(String(10))
+    total_amount: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2), default=Decimal("0.00")
+    )
+    transaction_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    def __repr__(self):
+        return f"<TransactionMonthlyRollup {self.user_id} {self.month}>"
@@ -0,0 +1,39 @@
+"""Password hashing with a configurable cost.
+
+PASSWORD_HASH_METHOD is any werkzeug method string, e.g. "scrypt:32768:8:1"
+or "pbkdf2:sha256:600000"; a bare "scrypt" or "pbkdf2" means werkzeug's
+current defaults. Every login pays for one hash, so the cost sets how many
+logins a worker core can serve: the benchmarks report hashes per second for
+each policy. Hashes made under another policy still verify and are replaced
+with one under the current policy at the user's next successful login.
+"""
+
+from functools import lru_cache
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = "scrypt"
+
+
+def hash_method() -> str:
+    return current_app.config.get("PASSWORD_HASH_METHOD", DEFAULT_METHOD)
+
+
+@lru_cache
+def _parameters(method: str) -> str:
+    # Hash once to learn the full parameter string werkzeug writes for method
+    return generate_password_hash("", method).split("$", 1)[0]
+
+
+def hash_password(password: str) -> str:
+    return generate_password_hash(password, hash_method())
+
+
+def verify_password(pwhash: str, password: str) -> bool:
+    return check_password_hash(pwhash, password)
+
+
+def needs_rehash(pwhash: str) -> bool:
+    """True if pwhash was not made with the current PASSWORD_HASH_METHOD."""
+    return pwhash.split("$", 1)[0] != _parameters(hash_method())
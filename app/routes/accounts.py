@@ -16,10 +16,14 @@ bp = Blueprint("accounts", __name__)
 def list_accounts():
     show_inactive = request.args.get("show_inactive", "0") == "1"
     accounts = account_service.get_accounts_for_user(
-        current_user.id, active_only=not show_inactive
+        current_user.id, active_only=not show_inactive, load="list"
     )
+    balances = account_service.get_balances([a.id for a in accounts])
     return render_template(
-        "accounts/list.html", accounts=accounts, show_inactive=show_inactive
+        "accounts/list.html",
+        accounts=accounts,
+        balances=balances,
+        show_inactive=show_inactive,
     )
 
 
@@ -1,10 +1,11 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_required, current_user
 
-from app.extensions import db
+from app import conditional, jobs
 from app.forms.analysis_forms import AnalysisPeriodForm
 from app.models.category import Category
-from app.services import analysis_service
+from app.models.expense_analysis import AnalysisPeriod, ExpenseAnalysis
+from app.services import analysis_service, category_service
 
 bp = Blueprint("analysis", __name__)
 
@@ -21,12 +22,13 @@ def list_periods():
 def create_period():
     form = AnalysisPeriodForm()
     if form.validate_on_submit():
-        analysis_service.create_period(
+        period = analysis_service.create_period(
             name=form.name.data,
             start_date=form.start_date.data,
             end_date=form.end_date.data,
             user_id=current_user.id,
         )
+        analysis_service.enqueue_recompute_period(period.id, current_user.id)
         flash("Analysis period created.", "success")
         return redirect(url_for("analysis.list_periods"))
     return render_template("analysis/form.html", form=form, title="Create Period")
@@ -42,12 +44,14 @@ def edit_period(period_id):
 
     form = AnalysisPeriodForm(obj=period)
     if form.validate_on_submit():
-        analysis_service.update_period(
+        period = analysis_service.update_period(
             period_id,
             name=form.name.data,
             start_date=form.start_date.data,
             end_date=form.end_date.data,
         )
+        if period.computed_at is None:
+            analysis_service.enqueue_recompute_period(period_id, current_user.id)
         flash("Period updated.", "success")
         return redirect(url_for("analysis.list_periods"))
     return render_template("analysis/form.html", form=form, title="Edit Period")
@@ -74,19 +78,37 @@ def period_report(period_id):
         flash("Period not found.", "danger")
         return redirect(url_for("analysis.list_periods"))
 
+    recomputing = bool(jobs.active_for_user(user_id))
+    validators = conditional.validators(
+        conditional.table_state(AnalysisPeriod, AnalysisPeriod.id == period_id),
+        conditional.table_state(
+            ExpenseAnalysis,
+            ExpenseAnalysis.period_id == period_id,
+            ExpenseAnalysis.user_id == user_id,
+        ),
+        conditional.table_state(Category),
+        extra=(recomputing,),
+    )
+    if response := conditional.not_modified(validators):
+        return response
+
     category_id = request.args.get("category_id", type=int)
     rows = analysis_service.aggregate_by_category(period_id, user_id, category_id)
 
     drill_category = None
     if category_id:
-        drill_category = db.session.get(Category, category_id)
-
-    return render_template(
-        "analysis/report.html",
-        period=period,
-        rows=rows,
-        category_id=category_id,
-        drill_category=drill_category,
+        drill_category = category_service.get_category(category_id)
+
+    return conditional.with_validators(
+        render_template(
+            "analysis/report.html",
+            period=period,
+            rows=rows,
+            category_id=category_id,
+            drill_category=drill_category,
+            recomputing=recomputing,
+        ),
+        validators,
     )
 
 
@@ -98,6 +120,6 @@ def recompute_period(period_id):
     if not period:
         flash("Period not found.", "danger")
         return redirect(url_for("analysis.list_periods"))
-    analysis_service.recompute_analysis(period_id, user_id)
-    flash("Analysis recomputed.", "success")
+    analysis_service.enqueue_recompute_period(period_id, user_id)
+    flash("Analysis is recomputing in the background.", "info")
     return redirect(url_for("analysis.period_report", period_id=period_id))
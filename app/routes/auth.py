@@ -19,6 +19,8 @@ def login():
     if form.validate_on_submit():
         user = User.query.filter_by(username=form.username.data).first()
         if user and user.check_password(form.password.data):
+            # Saves the hash check_password upgraded to the current policy
+            db.session.commit()
             login_user(user)
             next_page = request.args.get("next")
             if next_page:
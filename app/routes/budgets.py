@@ -3,9 +3,8 @@ from decimal import Decimal
 from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
 from flask_login import login_required, current_user
 
-from app.models.category import Category
 from app.models.enums import Variability, Frequency
-from app.services import budget_service
+from app.services import budget_service, category_service
 from app.forms.budget_forms import BudgetForm
 
 bp = Blueprint("budgets", __name__)
@@ -16,7 +15,7 @@ bp = Blueprint("budgets", __name__)
 def list_budgets():
     show_inactive = request.args.get("show_inactive", "0") == "1"
     items = budget_service.get_budget_items_for_user(
-        current_user.id, active_only=not show_inactive
+        current_user.id, active_only=not show_inactive, load="list"
     )
     return render_template(
         "budgets/list.html", items=items, show_inactive=show_inactive
@@ -93,19 +92,15 @@ def deactivate_budget(budget_id):
 @login_required
 def subcategories_for_category(category_id):
     """JSON endpoint for dynamic subcategory dropdown."""
-    subs = Category.query.filter_by(parent_id=category_id).order_by(Category.name).all()
+    subs = category_service.get_subcategories(category_id)
     return jsonify([{"id": s.id, "name": s.name} for s in subs])
 
 
 def _populate_category_choices(form):
-    top_level = Category.query.filter_by(parent_id=None).order_by(Category.name).all()
+    top_level = category_service.get_top_level_categories()
     form.category_id.choices = [(c.id, c.name) for c in top_level]
     # Populate subcategories — all subcategories initially, JS will filter
-    all_subs = (
-        Category.query.filter(Category.parent_id.is_not(None))
-        .order_by(Category.name)
-        .all()
-    )
+    all_subs = category_service.get_subcategories()
     form.subcategory_id.choices = [("", "— None —")] + [
         (s.id, s.name) for s in all_subs
     ]
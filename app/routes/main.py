@@ -1,27 +1,37 @@
 from datetime import date
 from decimal import Decimal
+from types import SimpleNamespace
 
 from flask import Blueprint, render_template, request
 from flask_login import login_required, current_user
 
+from app import cache, conditional, jobs
+from app.models.category import Category
+from app.models.expense_analysis import AnalysisPeriod, ExpenseAnalysis
+from app.models.transaction import Transaction
 from app.services import analysis_service, transaction_service
 
 bp = Blueprint("main", __name__)
 
 
-@bp.route("/")
-@login_required
-def dashboard():
-    user_id = current_user.id
+def _period_view(period) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=period.id,
+        name=period.name,
+        start_date=period.start_date,
+        end_date=period.end_date,
+    )
+
+
+def _dashboard_context(user_id: int, period_id: int | None, today: date) -> dict:
+    """Template context for the dashboard, built from plain cacheable values."""
     periods = analysis_service.get_periods_for_user(user_id)
-    today = date.today()
 
     # Determine active period: explicit override → auto-detect → most recent
-    period_id = request.args.get("period_id", type=int)
     active_period = None
 
     if period_id:
-        active_period = analysis_service.get_period_for_user(period_id, user_id)
+        active_period = next((p for p in periods if p.id == period_id), None)
 
     if not active_period:
         for p in periods:
@@ -39,24 +49,62 @@ def dashboard():
         category_rows = analysis_service.aggregate_by_category(
             active_period.id, user_id
         )
-        recent_txns = transaction_service.get_transactions_for_user(
-            user_id,
-            start_date=active_period.start_date,
-            end_date=active_period.end_date,
-            limit=10,
-        )
+        recent_txns = [
+            SimpleNamespace(
+                transaction_date=txn.transaction_date,
+                payee=txn.payee,
+                transaction_type=txn.transaction_type,
+                amount=txn.amount,
+            )
+            for txn in transaction_service.get_transactions_for_user(
+                user_id,
+                start_date=active_period.start_date,
+                end_date=active_period.end_date,
+                limit=10,
+            )
+        ]
 
     total_budgeted = sum((r.budgeted_amount for r in category_rows), Decimal("0.00"))
     total_actual = sum((r.actual_amount for r in category_rows), Decimal("0.00"))
     total_variance = total_budgeted - total_actual
 
-    return render_template(
-        "dashboard.html",
-        periods=periods,
-        active_period=active_period,
-        category_rows=category_rows,
-        recent_txns=recent_txns,
-        total_budgeted=total_budgeted,
-        total_actual=total_actual,
-        total_variance=total_variance,
+    return {
+        "periods": [_period_view(p) for p in periods],
+        "active_period": _period_view(active_period) if active_period else None,
+        "category_rows": category_rows,
+        "recent_txns": recent_txns,
+        "total_budgeted": total_budgeted,
+        "total_actual": total_actual,
+        "total_variance": total_variance,
+    }
+
+
+@bp.route("/")
+@login_required
+def dashboard():
+    user_id = current_user.id
+    period_id = request.args.get("period_id", type=int)
+    today = date.today()
+    recomputing = bool(jobs.active_for_user(user_id))
+
+    validators = conditional.validators(
+        conditional.table_state(AnalysisPeriod, AnalysisPeriod.user_id == user_id),
+        conditional.table_state(ExpenseAnalysis, ExpenseAnalysis.user_id == user_id),
+        conditional.table_state(Transaction, Transaction.user_id == user_id),
+        conditional.table_state(Category),
+        extra=(today, recomputing),
+    )
+    if response := conditional.not_modified(validators):
+        return response
+
+    # Keyed on the ETag, which every worker derives from the same rows, so a
+    # write committed by another process is never served from a stale entry
+    etag, _ = validators
+    key = f"dashboard:{user_id}:{etag}:{period_id}"
+    context = cache.get_or_set(
+        key, lambda: _dashboard_context(user_id, period_id, today)
+    )
+    return conditional.with_validators(
+        render_template("dashboard.html", recomputing=recomputing, **context),
+        validators,
     )
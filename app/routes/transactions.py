@@ -1,13 +1,30 @@
 from datetime import date
 from decimal import Decimal
 
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask import (
+    Blueprint,
+    render_template,
+    redirect,
+    url_for,
+    flash,
+    request,
+    abort,
+    jsonify,
+)
 from flask_login import login_required, current_user
 
-from app.models.category import Category
+from app import cache, conditional
 from app.models.account import Account
+from app.models.category import Category
 from app.models.enums import TransactionType
-from app.services import transaction_service, analysis_service
+from app.models.transaction import Transaction
+from app.services import (
+    transaction_service,
+    analysis_service,
+    category_service,
+    import_service,
+    account_service,
+)
 from app.forms.transaction_forms import TransactionForm, CSVImportForm
 
 bp = Blueprint("transactions", __name__)
@@ -18,45 +35,74 @@ PER_PAGE = 25
 @bp.route("/")
 @login_required
 def list_transactions():
-    page = request.args.get("page", 1, type=int)
     start = request.args.get("start_date")
     end = request.args.get("end_date")
     category_id = request.args.get("category_id", type=int)
     account_id = request.args.get("account_id", type=int)
+    q = request.args.get("q", "").strip()
 
     user_id = current_user.id
-    kwargs = {"user_id": user_id}
+    filters = {}
     if start:
-        kwargs["start_date"] = date.fromisoformat(start)
+        filters["start_date"] = date.fromisoformat(start)
     if end:
-        kwargs["end_date"] = date.fromisoformat(end)
+        filters["end_date"] = date.fromisoformat(end)
     if category_id:
-        kwargs["category_id"] = category_id
+        filters["category_id"] = category_id
     if account_id:
-        kwargs["account_id"] = account_id
+        filters["account_id"] = account_id
+    if q:
+        filters["q"] = q
+
+    validators = conditional.validators(
+        conditional.table_state(Transaction, Transaction.user_id == user_id),
+        conditional.table_state(Account, Account.owner_id == user_id),
+        conditional.table_state(Category),
+    )
+    if response := conditional.not_modified(validators):
+        return response
 
-    # Simple offset-based pagination
-    all_txns = transaction_service.get_transactions_for_user(**kwargs)
-    total = len(all_txns)
-    start_idx = (page - 1) * PER_PAGE
-    txns = all_txns[start_idx : start_idx + PER_PAGE]
-    total_pages = (total + PER_PAGE - 1) // PER_PAGE
+    # Keyset pagination: only PER_PAGE rows are loaded regardless of ledger size
+    page = transaction_service.get_transactions_page(
+        user_id,
+        after=request.args.get("after"),
+        before=request.args.get("before"),
+        per_page=PER_PAGE,
+        load="list",
+        **filters,
+    )
+    # The COUNT scans every matching row, so it is computed once per version
+    # of the ledger and filter set: paging and revisits reuse it
+    etag, _ = validators
+    total = cache.get_or_set(
+        f"transactions:count:{user_id}:{etag}:{sorted(filters.items())}",
+        lambda: transaction_service.count_transactions_for_user(user_id, **filters),
+    )
 
-    categories = Category.query.filter_by(parent_id=None).order_by(Category.name).all()
+    categories = category_service.get_top_level_categories()
     accounts = (
         Account.query.filter_by(owner_id=user_id, is_active=True)
         .order_by(Account.name)
         .all()
     )
 
-    return render_template(
-        "transactions/list.html",
-        transactions=txns,
-        page=page,
-        total_pages=total_pages,
-        categories=categories,
-        accounts=accounts,
-        filters=request.args,
+    filter_args = {
+        k: v for k, v in request.args.items() if k not in ("after", "before") and v
+    }
+
+    return conditional.with_validators(
+        render_template(
+            "transactions/list.html",
+            transactions=page.items,
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
+            total=total,
+            categories=categories,
+            accounts=accounts,
+            filters=request.args,
+            filter_args=filter_args,
+        ),
+        validators,
     )
 
 
@@ -68,6 +114,8 @@ def create_transaction():
 
     if form.validate_on_submit():
         user_id = current_user.id
+        # The write and its analysis delta commit together under the lock
+        analysis_service.lock_analysis(user_id)
         txn = transaction_service.create_transaction(
             transaction_date=form.transaction_date.data,
             payee=form.payee.data,
@@ -81,10 +129,12 @@ def create_transaction():
             credit_account_id=form.credit_account_id.data or None,
             category_id=form.category_id.data or None,
             subcategory_id=form.subcategory_id.data or None,
+            commit=False,
         )
-        analysis_service.recompute_periods_in_range(
-            user_id, txn.transaction_date, txn.transaction_date
+        analysis_service.apply_transaction_delta(
+            user_id, new=analysis_service.transaction_snapshot(txn)
         )
+        account_service.enqueue_snapshots_if_due(user_id)
         flash("Transaction created.", "success")
         return redirect(url_for("transactions.list_transactions"))
 
@@ -106,11 +156,12 @@ def edit_transaction(transaction_id):
     _populate_form_choices(form)
 
     if form.validate_on_submit():
-        old_date = txn.transaction_date
-        new_date = form.transaction_date.data
-        transaction_service.update_transaction(
+        before = analysis_service.transaction_snapshot(txn)
+        analysis_service.lock_analysis(user_id)
+        txn = transaction_service.update_transaction(
             transaction_id,
-            transaction_date=new_date,
+            commit=False,
+            transaction_date=form.transaction_date.data,
             payee=form.payee.data,
             amount=Decimal(str(form.amount.data)),
             transaction_type=form.transaction_type.data,
@@ -122,9 +173,10 @@ def edit_transaction(transaction_id):
             category_id=form.category_id.data or None,
             subcategory_id=form.subcategory_id.data or None,
         )
-        analysis_service.recompute_periods_in_range(
-            user_id, min(old_date, new_date), max(old_date, new_date)
+        analysis_service.apply_transaction_delta(
+            user_id, before, analysis_service.transaction_snapshot(txn)
         )
+        account_service.enqueue_snapshots_if_due(user_id)
         flash("Transaction updated.", "success")
         return redirect(url_for("transactions.list_transactions"))
 
@@ -139,9 +191,11 @@ def delete_transaction(transaction_id):
     user_id = current_user.id
     txn = transaction_service.get_transaction_for_user(transaction_id, user_id)
     if txn:
-        txn_date = txn.transaction_date
-        transaction_service.delete_transaction(transaction_id)
-        analysis_service.recompute_periods_in_range(user_id, txn_date, txn_date)
+        before = analysis_service.transaction_snapshot(txn)
+        analysis_service.lock_analysis(user_id)
+        transaction_service.delete_transaction(transaction_id, commit=False)
+        analysis_service.apply_transaction_delta(user_id, old=before)
+        account_service.enqueue_snapshots_if_due(user_id)
         flash("Transaction deleted.", "success")
     else:
         flash("Transaction not found.", "danger")
@@ -161,35 +215,53 @@ def import_csv():
     form.account_id.choices = [("", "— None —")] + [(a.id, a.name) for a in accounts]
 
     if form.validate_on_submit():
-        csv_file = form.csv_file.data
-        csv_text = csv_file.read().decode("utf-8")
-        account_id = form.account_id.data or None
-        result = transaction_service.import_csv(
-            csv_text, user_id, account_id=account_id
+        job = import_service.start_import(
+            form.csv_file.data, user_id, form.account_id.data or None
         )
-        if result["min_date"] and result["max_date"]:
-            analysis_service.recompute_periods_in_range(
-                user_id, result["min_date"], result["max_date"]
-            )
-        flash(f"Imported {result['imported']} transactions.", "success")
-        if result["errors"]:
-            for err in result["errors"][:5]:
-                flash(f"Row {err['row']}: {err['error']}", "warning")
-        return redirect(url_for("transactions.list_transactions"))
+        return redirect(url_for("transactions.import_status", import_id=job.id))
 
     return render_template("transactions/import.html", form=form)
 
 
+@bp.route("/import/<int:import_id>")
+@login_required
+def import_status(import_id):
+    job = import_service.get_import_for_user(import_id, current_user.id)
+    if job is None:
+        abort(404)
+    return render_template(
+        "transactions/import_status.html",
+        job=job,
+        progress=import_service.import_progress(job),
+    )
+
+
+@bp.route("/import/<int:import_id>/retry", methods=["POST"])
+@login_required
+def retry_import(import_id):
+    job = import_service.get_import_for_user(import_id, current_user.id)
+    if job is None:
+        abort(404)
+    if not import_service.retry_import(job):
+        flash("This import cannot be retried.", "danger")
+    return redirect(url_for("transactions.import_status", import_id=import_id))
+
+
+@bp.route("/import/<int:import_id>/progress")
+@login_required
+def import_progress(import_id):
+    job = import_service.get_import_for_user(import_id, current_user.id)
+    if job is None:
+        abort(404)
+    return jsonify(import_service.import_progress(job))
+
+
 def _populate_form_choices(form):
     user_id = current_user.id
-    categories = Category.query.filter_by(parent_id=None).order_by(Category.name).all()
+    categories = category_service.get_top_level_categories()
     form.category_id.choices = [("", "— None —")] + [(c.id, c.name) for c in categories]
 
-    all_subs = (
-        Category.query.filter(Category.parent_id.is_not(None))
-        .order_by(Category.name)
-        .all()
-    )
+    all_subs = category_service.get_subcategories()
     form.subcategory_id.choices = [("", "— None —")] + [
         (s.id, s.name) for s in all_subs
     ]
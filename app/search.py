@@ -0,0 +1,154 @@
+"""Full-text search over transaction payee, description and notes.
+
+On SQLite the text lives in an external-content FTS5 table, transactions_fts,
+whose rowid is the transaction id. FTS5 does not watch its content table, so
+transaction_service calls index(), unindex() and indexing_inserts() from
+every write path. On PostgreSQL a GIN expression index over to_tsvector() is
+kept current by the database itself and index()/unindex() do nothing. Other
+databases fall back to case-insensitive substring matching.
+
+Every whitespace-separated term must match, each as a word prefix, so
+"amaz prime" finds "AMAZON PRIME VIDEO".
+"""
+
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+
+import sqlalchemy as sa
+from sqlalchemy import DDL, event
+
+from app.extensions import db
+from app.models.transaction import Transaction
+
+FTS_TABLE = "transactions_fts"
+PG_INDEX = "ix_transactions_search"
+COLUMNS = ("payee", "description", "notes")
+
+SQLITE_CREATE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"{', '.join(COLUMNS)}, content='transactions', content_rowid='id')"
+)
+# Queries must repeat this expression verbatim for the index to be used
+PG_DOCUMENT = (
+    "to_tsvector('simple', coalesce(payee, '') || ' ' || "
+    "coalesce(description, '') || ' ' || coalesce(notes, ''))"
+)
+PG_CREATE = (
+    f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON transactions USING gin ({PG_DOCUMENT})"
+)
+
+_fts = sa.table(
+    FTS_TABLE,
+    sa.column("rowid", sa.Integer),
+    sa.column(FTS_TABLE, sa.String),
+    *(sa.column(name, sa.String) for name in COLUMNS),
+)
+
+event.listen(
+    Transaction.__table__,
+    "after_create",
+    DDL(SQLITE_CREATE).execute_if(dialect="sqlite"),
+)
+event.listen(
+    Transaction.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite"),
+)
+event.listen(
+    Transaction.__table__,
+    "after_create",
+    DDL(PG_CREATE).execute_if(dialect="postgresql"),
+)
+
+
+def _dialect() -> str:
+    return db.engine.dialect.name
+
+
+def _fts5_query(terms: list[str]) -> str:
+    # Quoting makes FTS5 operators and punctuation in user input literal
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+
+def _tsquery(terms: list[str]) -> str:
+    return " & ".join(
+        "'" + term.replace("\\", "\\\\").replace("'", "''") + "':*" for term in terms
+    )
+
+
+def match(q: str):
+    """WHERE criterion for transactions matching every term of search string q."""
+    terms = q.split()
+    if not terms:
+        return sa.true()
+    dialect = _dialect()
+    if dialect == "sqlite":
+        return Transaction.id.in_(
+            sa.select(_fts.c.rowid).where(_fts.c[FTS_TABLE].match(_fts5_query(terms)))
+        )
+    if dialect == "postgresql":
+        return sa.text(f"{PG_DOCUMENT} @@ to_tsquery('simple', :tsquery)").bindparams(
+            tsquery=_tsquery(terms)
+        )
+    return sa.and_(
+        *(
+            sa.or_(
+                *(
+                    getattr(Transaction, name).icontains(term, autoescape=True)
+                    for name in COLUMNS
+                )
+            )
+            for term in terms
+        )
+    )
+
+
+def search_values(txn: Transaction) -> dict:
+    """The id and indexed text of a transaction."""
+    return {"id": txn.id, **{name: getattr(txn, name) for name in COLUMNS}}
+
+
+def _rows(values: Iterable[dict], **extra) -> list[dict]:
+    return [
+        {"rowid": v["id"], **{name: v[name] for name in COLUMNS}, **extra}
+        for v in values
+    ]
+
+
+def index(values: Iterable[dict]) -> None:
+    """Add search_values() of new or changed transactions to the index."""
+    if _dialect() == "sqlite" and (rows := _rows(values)):
+        db.session.execute(sa.insert(_fts), rows)
+
+
+def unindex(values: Iterable[dict]) -> None:
+    """Remove transactions from the index.
+
+    FTS5 needs the exact text that was indexed, so pass the search_values()
+    taken before the row was changed or deleted.
+    """
+    if _dialect() == "sqlite" and (rows := _rows(values, **{FTS_TABLE: "delete"})):
+        db.session.execute(sa.insert(_fts), rows)
+
+
+@contextmanager
+def indexing_inserts() -> Iterator[None]:
+    """Index every transaction inserted inside the block with one statement.
+
+    SQLite gives new rows ids above the current maximum and serialises
+    writers, so within this transaction the rows past the maximum read at the
+    start are exactly the ones inserted here. Cheaper than RETURNING, which
+    SQLite must answer one row at a time when the order matters.
+    """
+    if _dialect() != "sqlite":
+        yield
+        return
+    last_id = db.session.scalar(sa.select(sa.func.max(Transaction.id))) or 0
+    yield
+    columns = [getattr(Transaction, name) for name in COLUMNS]
+    db.session.execute(
+        sa.insert(_fts).from_select(
+            ["rowid", *COLUMNS],
+            sa.select(Transaction.id, *columns).where(Transaction.id > last_id),
+        )
+    )
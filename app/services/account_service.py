@@ -1,8 +1,35 @@
+"""Accounts and their balances.
+
+An account's balance is its opening balance (``Account.balance``) plus every
+transaction crediting it minus every transaction debiting it. To avoid
+summing the whole ledger, AccountBalanceSnapshot keeps the running net at
+each month end; a balance is the latest snapshot on or before the date plus
+the transactions after it, found through the (account, date) indexes.
+Snapshots for completed months are written by the "snapshot_balances" job,
+queued after each import and by the first transaction write after a month
+closes.
+"""
+
+import calendar
+from collections.abc import Iterable
+from datetime import date, timedelta
 from decimal import Decimal
 
+from sqlalchemy import and_, func, insert, literal, select, union_all
+from sqlalchemy.orm import joinedload
+
+from app import jobs
+from app.database import replica_read
 from app.extensions import db
-from app.models.account import Account
+from app.models.account import Account, AccountBalanceSnapshot
 from app.models.enums import AccountType
+from app.models.transaction import Transaction
+from app.services import analysis_service
+
+# Named eager-loading profiles for list queries, keyed by the ``load`` argument
+LOAD_PROFILES = {
+    "list": (joinedload(Account.vendor),),
+}
 
 
 def create_account(
@@ -35,8 +62,13 @@ def get_account_for_user(account_id: int, user_id: int) -> Account | None:
     return Account.query.filter_by(id=account_id, owner_id=user_id).first()
 
 
-def get_accounts_for_user(user_id: int, *, active_only: bool = True) -> list[Account]:
+@replica_read
+def get_accounts_for_user(
+    user_id: int, *, active_only: bool = True, load: str | None = None
+) -> list[Account]:
     query = Account.query.filter_by(owner_id=user_id)
+    if load:
+        query = query.options(*LOAD_PROFILES[load])
     if active_only:
         query = query.filter_by(is_active=True)
     return query.order_by(Account.name).all()
@@ -61,3 +93,186 @@ def update_account(account_id: int, **kwargs) -> Account | None:
 
 def deactivate_account(account_id: int) -> Account | None:
     return update_account(account_id, is_active=False)
+
+
+def snapshot_date(d: date) -> date:
+    """The snapshot covering d: the last day of d's month."""
+    return d.replace(day=calendar.monthrange(d.year, d.month)[1])
+
+
+# Balance sign of each side of a transaction
+_SIDES = ((Transaction.credit_account_id, 1), (Transaction.debit_account_id, -1))
+
+
+def _movements(account_id: int, after: date | None, through: date):
+    """(account_id, sign, total) per side for transactions in (after, through]."""
+    selects = []
+    for column, sign in _SIDES:
+        criteria = [column == account_id, Transaction.transaction_date <= through]
+        if after:
+            criteria.append(Transaction.transaction_date > after)
+        selects.append(
+            select(
+                literal(account_id).label("account_id"),
+                literal(sign).label("sign"),
+                func.sum(Transaction.amount).label("total"),
+            ).where(*criteria)
+        )
+    return selects
+
+
+@replica_read
+def get_balances(
+    account_ids: Iterable[int], as_of: date | None = None
+) -> dict[int, Decimal]:
+    """Balances of several accounts at the end of as_of (default today).
+
+    Two queries whatever the number of accounts: one for the opening balances
+    and latest snapshots, one summing the transactions since each snapshot.
+    """
+    account_ids = list(account_ids)
+    if not account_ids:
+        return {}
+    as_of = as_of or date.today()
+
+    snap = AccountBalanceSnapshot
+    latest = (
+        select(snap.account_id, func.max(snap.as_of).label("as_of"))
+        .where(snap.account_id.in_(account_ids), snap.as_of <= as_of)
+        .group_by(snap.account_id)
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(Account.id, Account.balance, snap.as_of, snap.balance)
+        .outerjoin(latest, latest.c.account_id == Account.id)
+        .outerjoin(
+            snap,
+            and_(snap.account_id == latest.c.account_id, snap.as_of == latest.c.as_of),
+        )
+        .where(Account.id.in_(account_ids))
+    ).all()
+
+    balances = {}
+    selects = []
+    for account_id, opening, snapshot_as_of, snapshot_balance in rows:
+        balances[account_id] = (opening or Decimal("0.00")) + (
+            snapshot_balance or Decimal("0.00")
+        )
+        selects.extend(_movements(account_id, snapshot_as_of, as_of))
+    if selects:
+        for account_id, sign, total in db.session.execute(union_all(*selects)):
+            balances[account_id] += sign * Decimal(total or 0)
+    return balances
+
+
+def get_balance(account_id: int, as_of: date | None = None) -> Decimal | None:
+    """Balance of an account at the end of as_of (default today)."""
+    return get_balances([account_id], as_of).get(account_id)
+
+
+def _last_month_end() -> date:
+    return date.today().replace(day=1) - timedelta(days=1)
+
+
+def snapshot_balances(account_id: int, through: date | None = None) -> int:
+    """Write the missing month-end snapshots of an account up to through.
+
+    ``through`` defaults to the end of last month; snapshots are written for
+    every month ending on or before it, from the account's first transaction
+    (or just ``through``'s month for an account without any). Returns the
+    number of snapshots written.
+    """
+    through = through or _last_month_end()
+    if through != snapshot_date(through):
+        through = through.replace(day=1) - timedelta(days=1)
+
+    snap = AccountBalanceSnapshot
+    last = db.session.execute(
+        select(snap.as_of, snap.balance)
+        .where(snap.account_id == account_id)
+        .order_by(snap.as_of.desc())
+        .limit(1)
+    ).first()
+    if last:
+        start = snapshot_date(last.as_of + timedelta(days=1))
+        running = last.balance
+    else:
+        first = db.session.scalar(
+            select(func.min(Transaction.transaction_date)).where(
+                Transaction.id.in_(
+                    union_all(
+                        *(
+                            select(Transaction.id).where(column == account_id)
+                            for column, _ in _SIDES
+                        )
+                    )
+                )
+            )
+        )
+        start = snapshot_date(min(first, through) if first else through)
+        running = Decimal("0.00")
+    if start > through:
+        return 0
+
+    # Daily net per side, found through the account indexes
+    by_month: dict[date, Decimal] = {}
+    for column, sign in _SIDES:
+        criteria = [column == account_id, Transaction.transaction_date <= through]
+        if last:
+            criteria.append(Transaction.transaction_date > last.as_of)
+        for day, total in db.session.execute(
+            select(Transaction.transaction_date, func.sum(Transaction.amount))
+            .where(*criteria)
+            .group_by(Transaction.transaction_date)
+        ):
+            month = snapshot_date(day)
+            by_month[month] = by_month.get(month, Decimal("0.00")) + sign * total
+
+    rows = []
+    month = start
+    while month <= through:
+        running += by_month.get(month, Decimal("0.00"))
+        rows.append({"account_id": account_id, "as_of": month, "balance": running})
+        month = snapshot_date(month + timedelta(days=1))
+    db.session.execute(insert(snap.__table__), rows)
+    db.session.commit()
+    return len(rows)
+
+
+@jobs.task("snapshot_balances")
+def _snapshot_job(user_id: int) -> None:
+    account_ids = db.session.scalars(
+        select(Account.id).where(Account.owner_id == user_id)
+    ).all()
+    for account_id in account_ids:
+        # A transaction write only adjusts snapshots that already exist, so
+        # one committed between the ledger read and the insert would be lost.
+        # Writes take the same lock; snapshot_balances() commits, releasing it.
+        analysis_service.lock_analysis(user_id)
+        snapshot_balances(account_id)
+    db.session.commit()
+
+
+def enqueue_snapshots(user_id: int) -> dict:
+    """Queue writing the missing balance snapshots of a user's accounts."""
+    return jobs.enqueue("snapshot_balances", key=f"balances:{user_id}", user_id=user_id)
+
+
+def enqueue_snapshots_if_due(user_id: int) -> dict | None:
+    """Queue snapshot_balances if an account lacks last month's snapshot.
+
+    Called after transaction writes: one indexed lookup, and only the first
+    write after a month closes finds anything missing.
+    """
+    snap = AccountBalanceSnapshot
+    due = db.session.scalar(
+        select(Account.id)
+        .where(
+            Account.owner_id == user_id,
+            ~select(snap.id)
+            .where(snap.account_id == Account.id, snap.as_of == _last_month_end())
+            .exists(),
+        )
+        .limit(1)
+    )
+    return enqueue_snapshots(user_id) if due is not None else None
@@ -1,15 +1,35 @@
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 from types import SimpleNamespace
 
-from sqlalchemy import func
+from sqlalchemy import func, insert, or_, update
+from sqlalchemy.orm import aliased
 
+from app import cache, jobs
+from app.database import replica_read
 from app.extensions import db
 from app.models.category import Category
 from app.models.expense_analysis import AnalysisPeriod, ExpenseAnalysis
-from app.models.transaction import Transaction
-from app.models.budget import BudgetedExpense
+from app.models.transaction import Transaction, TransactionMonthlyRollup
 from app.models.enums import TransactionType
+from app.models.user import User
+from app.services import budget_service
+
+
+def lock_analysis(user_id: int) -> None:
+    """Hold user_id's analysis lock until the session's transaction ends.
+
+    Recomputes read transactions and rewrite a user's analysis rows, while a
+    transaction write adds its delta on top of them; if the two interleave,
+    the change is counted twice or lost. Both therefore start by taking this
+    lock: a no-op UPDATE of the user's row, which is a row lock on server
+    databases and the database write lock on SQLite. A transaction write
+    and its delta must commit together under it.
+    """
+    users = User.__table__
+    db.session.execute(
+        update(users).where(users.c.id == user_id).values(updated_at=users.c.updated_at)
+    )
 
 
 def create_period(
@@ -31,6 +51,7 @@ def get_period_for_user(period_id: int, user_id: int) -> AnalysisPeriod | None:
     return AnalysisPeriod.query.filter_by(id=period_id, user_id=user_id).first()
 
 
+@replica_read
 def get_periods_for_user(user_id: int) -> list[AnalysisPeriod]:
     return (
         AnalysisPeriod.query.filter_by(user_id=user_id)
@@ -43,9 +64,13 @@ def update_period(period_id: int, **kwargs) -> AnalysisPeriod | None:
     period = db.session.get(AnalysisPeriod, period_id)
     if not period:
         return None
+    old_range = (period.start_date, period.end_date)
     for key, value in kwargs.items():
         if hasattr(period, key):
             setattr(period, key, value)
+    if (period.start_date, period.end_date) != old_range:
+        # The stored rows describe the old range
+        period.computed_at = None
     db.session.commit()
     return period
 
@@ -61,96 +86,188 @@ def delete_period(period_id: int) -> bool:
     return True
 
 
-def recompute_analysis(period_id: int, user_id: int) -> list[ExpenseAnalysis]:
-    """Recompute budget-vs-actual for a period.
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
-    1. Delete existing analysis rows for this period/user.
-    2. Query transactions in the period's date range grouped by category/subcategory.
-    3. Query budgeted amounts that fall in the period.
-    4. Merge into ExpenseAnalysis rows with variance = budgeted - actual.
-    """
-    period = db.session.get(AnalysisPeriod, period_id)
-    if not period:
-        return []
 
-    # Clear existing analysis rows
-    ExpenseAnalysis.query.filter_by(period_id=period_id, user_id=user_id).delete()
+def _merge_analysis(
+    actuals: dict[tuple, tuple], budgeted: dict[tuple, Decimal]
+) -> dict[tuple, dict]:
+    """Merge per-key actuals (amount, count) and budgets into analysis data.
 
-    # Aggregate actual spending from transactions (debits only)
-    actuals = (
-        db.session.query(
-            Transaction.category_id,
-            Transaction.subcategory_id,
-            func.sum(Transaction.amount).label("total_amount"),
-            func.count(Transaction.id).label("txn_count"),
-        )
-        .filter(
-            Transaction.user_id == user_id,
-            Transaction.transaction_date >= period.start_date,
-            Transaction.transaction_date <= period.end_date,
-            Transaction.transaction_type == TransactionType.DEBIT.value,
-            Transaction.category_id.is_not(None),
-        )
-        .group_by(Transaction.category_id, Transaction.subcategory_id)
-        .all()
-    )
-
-    # Aggregate budgeted amounts for expenses scheduled in the period
-    budgeted = (
-        db.session.query(
-            BudgetedExpense.category_id,
-            BudgetedExpense.subcategory_id,
-            func.sum(BudgetedExpense.budgeted_amount).label("total_budgeted"),
-        )
-        .filter(
-            BudgetedExpense.user_id == user_id,
-            BudgetedExpense.is_active.is_(True),
-            BudgetedExpense.date_scheduled >= period.start_date,
-            BudgetedExpense.date_scheduled <= period.end_date,
-        )
-        .group_by(BudgetedExpense.category_id, BudgetedExpense.subcategory_id)
-        .all()
-    )
-
-    # Build lookup: (category_id, subcategory_id) -> data
+    Keys are (category_id, subcategory_id).
+    """
     analysis_map: dict[tuple, dict] = {}
 
-    for row in actuals:
-        key = (row.category_id, row.subcategory_id)
+    for key, (amount, count) in actuals.items():
         analysis_map[key] = {
-            "actual_amount": row.total_amount or Decimal("0.00"),
-            "transaction_count": row.txn_count or 0,
+            "actual_amount": amount or Decimal("0.00"),
+            "transaction_count": count or 0,
             "budgeted_amount": Decimal("0.00"),
         }
 
-    for row in budgeted:
-        key = (row.category_id, row.subcategory_id)
+    for key, amount in budgeted.items():
         if key in analysis_map:
-            analysis_map[key]["budgeted_amount"] = row.total_budgeted or Decimal("0.00")
+            analysis_map[key]["budgeted_amount"] = amount or Decimal("0.00")
         else:
             analysis_map[key] = {
                 "actual_amount": Decimal("0.00"),
                 "transaction_count": 0,
-                "budgeted_amount": row.total_budgeted or Decimal("0.00"),
+                "budgeted_amount": amount or Decimal("0.00"),
             }
+    return analysis_map
+
+
+def _analysis_params(
+    period_id: int, user_id: int, analysis_map: dict[tuple, dict]
+) -> list[dict]:
+    """Column values for the ExpenseAnalysis rows of one period."""
+    return [
+        {
+            "period_id": period_id,
+            "user_id": user_id,
+            "category_id": cat_id,
+            "subcategory_id": subcat_id,
+            "budgeted_amount": data["budgeted_amount"],
+            "actual_amount": data["actual_amount"],
+            "variance": data["budgeted_amount"] - data["actual_amount"],
+            "transaction_count": data["transaction_count"],
+        }
+        for (cat_id, subcat_id), data in analysis_map.items()
+    ]
+
+
+def _next_month(d: date) -> date:
+    return (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _split_months(
+    start: date, end: date
+) -> tuple[tuple[date, date] | None, list[tuple[date, date]]]:
+    """Split [start, end] into whole calendar months and partial edge days.
+
+    Returns ((first_month, last_month), edges) where the months are the first
+    days of the whole months covered (None if there are none) and edges are
+    the inclusive date ranges left over at either end.
+    """
+    first = start if start.day == 1 else _next_month(start)
+    # First day after the last whole month
+    after_end = end + timedelta(days=1)
+    stop = after_end if after_end.day == 1 else end.replace(day=1)
+    if first >= stop:
+        return None, [(start, end)]
+
+    edges = []
+    if start < first:
+        edges.append((start, first - timedelta(days=1)))
+    if stop <= end:
+        edges.append((stop, end))
+    last = (stop - timedelta(days=1)).replace(day=1)
+    return (first, last), edges
+
+
+def _rollup_actuals_query(user_id: int, first_month: date, last_month: date):
+    """Categorized debit totals from TransactionMonthlyRollup over whole months."""
+    return db.session.query(
+        TransactionMonthlyRollup.category_id,
+        TransactionMonthlyRollup.subcategory_id,
+        func.sum(TransactionMonthlyRollup.total_amount).label("total_amount"),
+        func.sum(TransactionMonthlyRollup.transaction_count).label("txn_count"),
+    ).filter(
+        TransactionMonthlyRollup.user_id == user_id,
+        TransactionMonthlyRollup.month >= first_month,
+        TransactionMonthlyRollup.month <= last_month,
+        TransactionMonthlyRollup.transaction_type == TransactionType.DEBIT.value,
+        TransactionMonthlyRollup.category_id.is_not(None),
+    )
+
+
+def _raw_actuals_query(user_id: int, ranges: list[tuple[date, date]]):
+    """Categorized debit totals from raw transactions within the date ranges."""
+    return db.session.query(
+        Transaction.category_id,
+        Transaction.subcategory_id,
+        func.sum(Transaction.amount).label("total_amount"),
+        func.count(Transaction.id).label("txn_count"),
+    ).filter(
+        Transaction.user_id == user_id,
+        or_(*(Transaction.transaction_date.between(lo, hi) for lo, hi in ranges)),
+        Transaction.transaction_type == TransactionType.DEBIT.value,
+        Transaction.category_id.is_not(None),
+    )
+
+
+def _add_actual(actuals: dict[tuple, tuple], key: tuple, total, count) -> None:
+    prev_total, prev_count = actuals.get(key, (Decimal("0.00"), 0))
+    actuals[key] = (prev_total + (total or Decimal("0.00")), prev_count + (count or 0))
+
+
+def _actuals_between(user_id: int, start: date, end: date) -> dict[tuple, tuple]:
+    """Categorized debit (amount, count) per (category_id, subcategory_id).
+
+    Whole calendar months come from TransactionMonthlyRollup and only the
+    partial months at either end are aggregated from raw transactions.
+    """
+    months, edges = _split_months(start, end)
+    rows = []
+    if months:
+        rows += _rollup_actuals_query(user_id, *months).group_by(
+            TransactionMonthlyRollup.category_id,
+            TransactionMonthlyRollup.subcategory_id,
+        )
+    if edges:
+        rows += _raw_actuals_query(user_id, edges).group_by(
+            Transaction.category_id, Transaction.subcategory_id
+        )
+
+    actuals: dict[tuple, tuple] = {}
+    for row in rows:
+        _add_actual(
+            actuals,
+            (row.category_id, row.subcategory_id),
+            row.total_amount,
+            row.txn_count,
+        )
+    return actuals
+
+
+def recompute_analysis(period_id: int, user_id: int) -> list[ExpenseAnalysis]:
+    """Recompute budget-vs-actual for a period.
+
+    1. Delete existing analysis rows for this period/user.
+    2. Total categorized debits per category/subcategory in the period's date
+       range: whole months from the monthly rollup, edge days from transactions.
+    3. Total budgeted amounts for every occurrence of each recurring item
+       in the period (see budget_service.budgeted_totals).
+    4. Merge into ExpenseAnalysis rows with variance = budgeted - actual.
+    """
+    period = db.session.get(AnalysisPeriod, period_id)
+    if not period:
+        return []
+
+    lock_analysis(user_id)
+    # Clear existing analysis rows
+    ExpenseAnalysis.query.filter_by(period_id=period_id, user_id=user_id).delete()
+    cache.mark_user_changed(db.session, user_id)
+
+    # Actual spending (debits only): rollup for whole months, raw edge days
+    actuals = _actuals_between(user_id, period.start_date, period.end_date)
+
+    # Budgeted amounts for every occurrence of recurring items in the period
+    budgeted = budget_service.budgeted_totals(
+        user_id, {period_id: (period.start_date, period.end_date)}
+    )[period_id]
+
+    analysis_map = _merge_analysis(actuals, budgeted)
 
     # Create ExpenseAnalysis rows
     results = []
-    for (cat_id, subcat_id), data in analysis_map.items():
-        variance = data["budgeted_amount"] - data["actual_amount"]
-        ea = ExpenseAnalysis(
-            period_id=period_id,
-            user_id=user_id,
-            category_id=cat_id,
-            subcategory_id=subcat_id,
-            budgeted_amount=data["budgeted_amount"],
-            actual_amount=data["actual_amount"],
-            variance=variance,
-            transaction_count=data["transaction_count"],
-        )
+    for params in _analysis_params(period_id, user_id, analysis_map):
+        ea = ExpenseAnalysis(**params)
         db.session.add(ea)
         results.append(ea)
 
+    period.computed_at = _utcnow()
     db.session.commit()
     return results
 
@@ -164,17 +281,297 @@ def get_overlapping_periods(user_id: int, a_date: date) -> list[AnalysisPeriod]:
     ).all()
 
 
+def _containing(spans: list[tuple[int, tuple[date, date]]]):
+    """Memoized lookup of the ids whose (lo, hi) span contains a date."""
+    memo: dict[date, list[int]] = {}
+
+    def lookup(day: date) -> list[int]:
+        if day not in memo:
+            memo[day] = [pid for pid, (lo, hi) in spans if lo <= day <= hi]
+        return memo[day]
+
+    return lookup
+
+
 def recompute_periods_in_range(user_id: int, min_date: date, max_date: date) -> None:
-    """Recompute all periods for user_id that overlap [min_date, max_date]."""
+    """Recompute all periods for user_id that overlap [min_date, max_date].
+
+    Rather than recomputing period by period, the monthly rollup is scanned
+    once across the whole months of the overlapping periods and each month is
+    credited to every period covering it; raw transactions are read, grouped
+    per day, only for the partial months at period edges. All periods are
+    then rewritten with one bulk DELETE, one executemany INSERT and a single
+    commit.
+    """
     periods = AnalysisPeriod.query.filter(
         AnalysisPeriod.user_id == user_id,
         AnalysisPeriod.start_date <= max_date,
         AnalysisPeriod.end_date >= min_date,
     ).all()
-    for period in periods:
-        recompute_analysis(period.id, user_id)
+    if not periods:
+        return
+    # Only once there is something to rewrite, so the early return never
+    # leaves the lock held by an open transaction
+    lock_analysis(user_id)
+
+    period_budgeted = budget_service.budgeted_totals(
+        user_id, {p.id: (p.start_date, p.end_date) for p in periods}
+    )
+    period_actuals: dict[int, dict[tuple, tuple]] = {p.id: {} for p in periods}
+
+    # Each period is its whole months plus partial edge ranges
+    splits = {p.id: _split_months(p.start_date, p.end_date) for p in periods}
+    month_spans = [(pid, m) for pid, (m, _) in splits.items() if m]
+    edge_spans = [(pid, e) for pid, (_, edges) in splits.items() for e in edges]
+
+    if month_spans:
+        rows = (
+            _rollup_actuals_query(
+                user_id,
+                min(m[0] for _, m in month_spans),
+                max(m[1] for _, m in month_spans),
+            )
+            .add_columns(TransactionMonthlyRollup.month)
+            .group_by(
+                TransactionMonthlyRollup.month,
+                TransactionMonthlyRollup.category_id,
+                TransactionMonthlyRollup.subcategory_id,
+            )
+            .all()
+        )
+        containing_month = _containing(month_spans)
+        for row in rows:
+            for pid in containing_month(row.month):
+                _add_actual(
+                    period_actuals[pid],
+                    (row.category_id, row.subcategory_id),
+                    row.total_amount,
+                    row.txn_count,
+                )
+
+    if edge_spans:
+        rows = (
+            _raw_actuals_query(user_id, sorted({e for _, e in edge_spans}))
+            .add_columns(Transaction.transaction_date)
+            .group_by(
+                Transaction.transaction_date,
+                Transaction.category_id,
+                Transaction.subcategory_id,
+            )
+            .all()
+        )
+        containing_day = _containing(edge_spans)
+        for row in rows:
+            for pid in containing_day(row.transaction_date):
+                _add_actual(
+                    period_actuals[pid],
+                    (row.category_id, row.subcategory_id),
+                    row.total_amount,
+                    row.txn_count,
+                )
+
+    params = []
+    for p in periods:
+        analysis_map = _merge_analysis(period_actuals[p.id], period_budgeted[p.id])
+        params.extend(_analysis_params(p.id, user_id, analysis_map))
+
+    ExpenseAnalysis.query.filter(
+        ExpenseAnalysis.user_id == user_id,
+        ExpenseAnalysis.period_id.in_([p.id for p in periods]),
+    ).delete(synchronize_session=False)
+    if params:
+        db.session.execute(insert(ExpenseAnalysis.__table__), params)
+    db.session.execute(
+        update(AnalysisPeriod)
+        .where(AnalysisPeriod.id.in_([p.id for p in periods]))
+        .values(computed_at=_utcnow())
+    )
+    cache.mark_user_changed(db.session, user_id)
+    db.session.commit()
+
+
+@jobs.task("recompute_periods_in_range", merge=jobs.merge_date_range)
+def _recompute_range_job(user_id: int, min_date: str, max_date: str) -> None:
+    recompute_periods_in_range(
+        user_id, date.fromisoformat(min_date), date.fromisoformat(max_date)
+    )
+
+
+@jobs.task("recompute_analysis")
+def _recompute_period_job(user_id: int, period_id: int) -> None:
+    recompute_analysis(period_id, user_id)
+
+
+def enqueue_recompute_range(user_id: int, min_date: date, max_date: date) -> dict:
+    """Queue recompute_periods_in_range() as a background job.
+
+    Pending requests for the same user coalesce into one job covering the
+    union of their date ranges. Returns the job dict.
+    """
+    return jobs.enqueue(
+        "recompute_periods_in_range",
+        key=f"recompute:{user_id}",
+        user_id=user_id,
+        min_date=min_date.isoformat(),
+        max_date=max_date.isoformat(),
+    )
+
+
+def enqueue_recompute_period(period_id: int, user_id: int) -> dict:
+    """Queue recompute_analysis() for one period; repeats coalesce."""
+    return jobs.enqueue(
+        "recompute_analysis",
+        key=f"recompute:{user_id}:period:{period_id}",
+        user_id=user_id,
+        period_id=period_id,
+    )
+
+
+def transaction_snapshot(txn: Transaction) -> SimpleNamespace:
+    """Capture the fields of a transaction that feed ExpenseAnalysis.
+
+    Take the snapshot before mutating or deleting a transaction so the old
+    contribution can be reversed by apply_transaction_delta().
+    """
+    return SimpleNamespace(
+        transaction_date=txn.transaction_date,
+        transaction_type=txn.transaction_type,
+        category_id=txn.category_id,
+        subcategory_id=txn.subcategory_id,
+        amount=Decimal(txn.amount),
+    )
+
+
+def _delta_entries(snapshot: SimpleNamespace | None, sign: int) -> list[tuple]:
+    # Only categorized debits count toward actual spending (see recompute_analysis)
+    if (
+        snapshot is None
+        or snapshot.transaction_type != TransactionType.DEBIT.value
+        or snapshot.category_id is None
+    ):
+        return []
+    return [
+        (
+            snapshot.transaction_date,
+            snapshot.category_id,
+            snapshot.subcategory_id,
+            snapshot.amount * sign,
+            sign,
+        )
+    ]
+
+
+def _budgeted_for_key(
+    period: AnalysisPeriod, user_id: int, category_id: int, subcategory_id: int | None
+) -> Decimal:
+    key = (category_id, subcategory_id)
+    totals = budget_service.budgeted_totals(
+        user_id, {period.id: (period.start_date, period.end_date)}, key=key
+    )
+    return totals[period.id].get(key, Decimal("0.00"))
+
+
+def _apply_delta_row(
+    period: AnalysisPeriod,
+    user_id: int,
+    category_id: int,
+    subcategory_id: int | None,
+    amount: Decimal,
+    count: int,
+) -> bool:
+    """Apply one signed delta to a period's analysis row.
+
+    Returns False when the stored rows cannot absorb the delta (they were
+    never computed or have drifted), in which case the caller must recompute.
+    """
+    ea = ExpenseAnalysis.query.filter_by(
+        period_id=period.id,
+        user_id=user_id,
+        category_id=category_id,
+        subcategory_id=subcategory_id,
+    ).first()
+
+    if ea is None:
+        if count < 0:
+            return False
+        ea = ExpenseAnalysis(
+            period_id=period.id,
+            user_id=user_id,
+            category_id=category_id,
+            subcategory_id=subcategory_id,
+            budgeted_amount=_budgeted_for_key(
+                period, user_id, category_id, subcategory_id
+            ),
+            actual_amount=Decimal("0.00"),
+            transaction_count=0,
+        )
+        db.session.add(ea)
+
+    ea.actual_amount = Decimal(ea.actual_amount) + amount
+    ea.transaction_count += count
+    if ea.transaction_count < 0:
+        return False
+    ea.variance = Decimal(ea.budgeted_amount) - ea.actual_amount
+
+    # Mirror recompute_analysis, which only emits rows with spending or budget
+    if ea.transaction_count == 0 and not ea.budgeted_amount:
+        db.session.delete(ea)
+    return True
+
+
+def apply_transaction_delta(
+    user_id: int,
+    old: SimpleNamespace | None = None,
+    new: SimpleNamespace | None = None,
+) -> None:
+    """Incrementally update ExpenseAnalysis for a single transaction change.
+
+    ``old`` and ``new`` are transaction_snapshot() values from before and
+    after the change; pass None for old on create and for new on delete.
+    The old contribution is subtracted and the new one added to every
+    (period, category, subcategory) row it falls in, so the cost depends on
+    the number of periods touched rather than on the transactions in them.
+
+    A period that has never been computed for its current range, or whose
+    stored rows cannot absorb the delta, gets a full recompute_analysis()
+    instead: a missing row there means "not computed", not "nothing spent".
+
+    Take lock_analysis() before writing the transaction and leave that write
+    uncommitted, so the write and its delta commit together here.
+    """
+    entries = _delta_entries(old, -1) + _delta_entries(new, 1)
+    if not entries:
+        db.session.commit()
+        return
+
+    lock_analysis(user_id)
+
+    dates = [entry[0] for entry in entries]
+    periods = AnalysisPeriod.query.filter(
+        AnalysisPeriod.user_id == user_id,
+        AnalysisPeriod.start_date <= max(dates),
+        AnalysisPeriod.end_date >= min(dates),
+    ).all()
+
+    repair = {p.id for p in periods if p.computed_at is None}
+    for txn_date, category_id, subcategory_id, amount, count in entries:
+        for period in periods:
+            if period.id in repair:
+                continue
+            if not period.start_date <= txn_date <= period.end_date:
+                continue
+            if not _apply_delta_row(
+                period, user_id, category_id, subcategory_id, amount, count
+            ):
+                repair.add(period.id)
+
+    db.session.commit()
+    # recompute_analysis clears the period first, discarding any partial delta
+    for period_id in repair:
+        recompute_analysis(period_id, user_id)
 
 
+@replica_read
 def aggregate_by_category(
     period_id: int, user_id: int, category_id: int | None = None
 ) -> list[SimpleNamespace]:
@@ -187,48 +584,58 @@ def aggregate_by_category(
     budgeted_amount, actual_amount, variance, transaction_count, pct.
     pct = int(actual/budgeted*100) when budgeted > 0, else None.
     """
-    rows = ExpenseAnalysis.query.filter_by(period_id=period_id, user_id=user_id).all()
-
     if category_id is None:
-        # Aggregate by top-level category
-        agg: dict[int, dict] = {}
-        for row in rows:
-            cid = row.category_id
-            if cid not in agg:
-                agg[cid] = {
-                    "budgeted": Decimal("0.00"),
-                    "actual": Decimal("0.00"),
-                    "count": 0,
-                }
-            agg[cid]["budgeted"] += row.budgeted_amount
-            agg[cid]["actual"] += row.actual_amount
-            agg[cid]["count"] += row.transaction_count
+        # Roll up to top-level categories in SQL, names joined in the same query
+        rows = (
+            db.session.query(
+                ExpenseAnalysis.category_id,
+                Category.name,
+                func.sum(ExpenseAnalysis.budgeted_amount).label("budgeted"),
+                func.sum(ExpenseAnalysis.actual_amount).label("actual"),
+                func.sum(ExpenseAnalysis.transaction_count).label("count"),
+            )
+            .outerjoin(Category, Category.id == ExpenseAnalysis.category_id)
+            .filter(
+                ExpenseAnalysis.period_id == period_id,
+                ExpenseAnalysis.user_id == user_id,
+            )
+            .group_by(ExpenseAnalysis.category_id, Category.name)
+            .all()
+        )
 
         result = []
-        for cid, data in agg.items():
-            cat = db.session.get(Category, cid)
-            budgeted = data["budgeted"]
-            actual = data["actual"]
+        for row in rows:
+            budgeted = row.budgeted or Decimal("0.00")
+            actual = row.actual or Decimal("0.00")
             pct = int(actual / budgeted * 100) if budgeted > 0 else None
             result.append(
                 SimpleNamespace(
-                    category_id=cid,
-                    category_name=cat.name if cat else "Unknown",
+                    category_id=row.category_id,
+                    category_name=row.name or "Unknown",
                     budgeted_amount=budgeted,
                     actual_amount=actual,
                     variance=budgeted - actual,
-                    transaction_count=data["count"],
+                    transaction_count=row.count or 0,
                     pct=pct,
                 )
             )
     else:
         # Subcategory drill-down for a specific top-level category
-        cat_rows = [r for r in rows if r.category_id == category_id]
+        subcategory = aliased(Category)
+        rows = (
+            db.session.query(ExpenseAnalysis, subcategory.name)
+            .outerjoin(subcategory, subcategory.id == ExpenseAnalysis.subcategory_id)
+            .filter(
+                ExpenseAnalysis.period_id == period_id,
+                ExpenseAnalysis.user_id == user_id,
+                ExpenseAnalysis.category_id == category_id,
+            )
+            .all()
+        )
         result = []
-        for row in cat_rows:
+        for row, subcat_name in rows:
             if row.subcategory_id:
-                subcat = db.session.get(Category, row.subcategory_id)
-                name = subcat.name if subcat else "Unknown"
+                name = subcat_name or "Unknown"
             else:
                 name = "Uncategorized"
             budgeted = row.budgeted_amount
@@ -1,10 +1,29 @@
+import calendar
+from collections.abc import Hashable
 from datetime import date
 from decimal import Decimal
 
+from sqlalchemy import or_
+from sqlalchemy.orm import joinedload
+
+from app.database import replica_read
 from app.extensions import db
 from app.models.budget import BudgetedExpense
 from app.models.enums import Variability, Frequency
 
+# Named eager-loading profiles for list queries, keyed by the ``load`` argument
+LOAD_PROFILES = {
+    "list": (
+        joinedload(BudgetedExpense.category),
+        joinedload(BudgetedExpense.subcategory),
+    ),
+}
+
+# Recurrence steps: day-based frequencies repeat every N days, month-based
+# ones on the scheduled day of every Nth month (clamped to short months)
+_STEP_DAYS = {Frequency.WEEKLY: 7, Frequency.BIWEEKLY: 14}
+_STEP_MONTHS = {Frequency.MONTHLY: 1, Frequency.QUARTERLY: 3, Frequency.ANNUAL: 12}
+
 
 def create_budget_item(
     payee: str,
@@ -42,10 +61,13 @@ def get_budget_item_for_user(budget_id: int, user_id: int) -> BudgetedExpense |
     return BudgetedExpense.query.filter_by(id=budget_id, user_id=user_id).first()
 
 
+@replica_read
 def get_budget_items_for_user(
-    user_id: int, *, active_only: bool = True
+    user_id: int, *, active_only: bool = True, load: str | None = None
 ) -> list[BudgetedExpense]:
     query = BudgetedExpense.query.filter_by(user_id=user_id)
+    if load:
+        query = query.options(*LOAD_PROFILES[load])
     if active_only:
         query = query.filter_by(is_active=True)
     return query.order_by(BudgetedExpense.date_scheduled).all()
@@ -72,3 +94,102 @@ def update_budget_item(budget_id: int, **kwargs) -> BudgetedExpense | None:
 
 def deactivate_budget_item(budget_id: int) -> BudgetedExpense | None:
     return update_budget_item(budget_id, is_active=False)
+
+
+def _month_index(d: date) -> int:
+    return d.year * 12 + d.month - 1
+
+
+def _add_months(anchor: date, months: int) -> date:
+    year, month0 = divmod(_month_index(anchor) + months, 12)
+    day = min(anchor.day, calendar.monthrange(year, month0 + 1)[1])
+    return date(year, month0 + 1, day)
+
+
+def count_occurrences(
+    frequency: Frequency | str, anchor: date, start: date, end: date
+) -> int:
+    """Number of times an item recurs within [start, end], computed in O(1).
+
+    ``anchor`` is the item's date_scheduled, its first occurrence. Items
+    recur indefinitely from there; ONE_TIME items occur only on the anchor.
+    Monthly-based occurrences fall on the anchor's day of month, or on the
+    last day of shorter months.
+    """
+    frequency = Frequency(frequency)
+    if end < start or end < anchor:
+        return 0
+    if frequency == Frequency.ONE_TIME:
+        return int(start <= anchor <= end)
+
+    if frequency in _STEP_DAYS:
+        step = _STEP_DAYS[frequency]
+        first = max(0, -((anchor - start).days // step))  # ceil division
+        last = (end - anchor).days // step
+        return max(0, last - first + 1)
+
+    step = _STEP_MONTHS[frequency]
+    origin = _month_index(anchor)
+    first = max(0, -((origin - _month_index(start)) // step))
+    last = (_month_index(end) - origin) // step
+    if last < first:
+        return 0
+    # Only the boundary occurrences can share a month with start/end
+    if _add_months(anchor, first * step) < start:
+        first += 1
+    if _add_months(anchor, last * step) > end:
+        last -= 1
+    return max(0, last - first + 1)
+
+
+def budgeted_totals(
+    user_id: int,
+    windows: dict[Hashable, tuple[date, date]],
+    *,
+    key: tuple[int, int | None] | None = None,
+) -> dict[Hashable, dict[tuple, Decimal]]:
+    """Budgeted amount per (category_id, subcategory_id) for each date window.
+
+    Active items are loaded once for the union of the windows and each item's
+    occurrences are counted arithmetically per window, so the cost is
+    O(items x windows) no matter how often items recur. ``key`` restricts
+    the result to a single (category_id, subcategory_id).
+    """
+    totals: dict[Hashable, dict[tuple, Decimal]] = {w: {} for w in windows}
+    if not windows:
+        return totals
+
+    span_start = min(start for start, _ in windows.values())
+    span_end = max(end for _, end in windows.values())
+    query = db.session.query(
+        BudgetedExpense.category_id,
+        BudgetedExpense.subcategory_id,
+        BudgetedExpense.frequency,
+        BudgetedExpense.date_scheduled,
+        BudgetedExpense.budgeted_amount,
+    ).filter(
+        BudgetedExpense.user_id == user_id,
+        BudgetedExpense.is_active.is_(True),
+        BudgetedExpense.date_scheduled <= span_end,
+        or_(
+            BudgetedExpense.frequency != Frequency.ONE_TIME.value,
+            BudgetedExpense.date_scheduled >= span_start,
+        ),
+    )
+    if key is not None:
+        query = query.filter(
+            BudgetedExpense.category_id == key[0],
+            BudgetedExpense.subcategory_id == key[1],  # IS NULL for None
+        )
+
+    for item in query:
+        item_key = (item.category_id, item.subcategory_id)
+        for window, (start, end) in windows.items():
+            n = count_occurrences(item.frequency, item.date_scheduled, start, end)
+            if n:
+                window_totals = totals[window]
+                window_totals[item_key] = (
+                    window_totals.get(item_key, Decimal("0.00"))
+                    + item.budgeted_amount * n
+                )
+    return totals
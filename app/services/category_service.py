@@ -0,0 +1,161 @@
+"""In-memory category tree cache.
+
+Categories are seeded once and rarely change, so form choices and the
+subcategory API are served from a lazily loaded tree held per application
+(i.e. per worker process). Any ORM insert, update or delete of a Category
+bumps the cache version when the writing session commits, and the next read
+reloads the tree with a single query.
+
+Writes committed by another process are not seen that way, so once the
+tree is CATEGORY_CACHE_TTL seconds old the next read compares the table's
+MAX(updated_at) and COUNT(*) (see app/conditional.py) with the values it was
+loaded with and reloads only if they differ. Raw SQL that leaves updated_at
+alone still needs invalidate_category_cache().
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+from app import conditional
+from app.extensions import db
+from app.models.category import Category
+
+_EXTENSION_KEY = "category_cache"
+_DIRTY_KEY = "categories_dirty"
+
+
+class CategoryCache:
+    """Versioned holder for the category tree of one application."""
+
+    def __init__(self, ttl: float = 30):
+        self.version = 0
+        self.ttl = ttl
+        # (version, table state, time the state was last confirmed, tree)
+        self._entry: tuple[int, tuple, float, SimpleNamespace] | None = None
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.version += 1
+
+    def _fresh(self, entry, now: float) -> bool:
+        return (
+            entry is not None and entry[0] == self.version and now - entry[2] < self.ttl
+        )
+
+    def get(self) -> SimpleNamespace:
+        now = time.monotonic()
+        entry = self._entry
+        if self._fresh(entry, now):
+            return entry[3]
+        with self._lock:
+            entry = self._entry
+            if self._fresh(entry, now):
+                return entry[3]
+            if entry is not None and entry[0] == self.version:
+                state = _table_state()
+                if state == entry[1]:
+                    self._entry = (entry[0], state, now, entry[3])
+                    return entry[3]
+                self.version += 1
+            state, tree = _load_tree(self.version)
+            self._entry = (self.version, state, now, tree)
+            return tree
+
+
+def _table_state() -> tuple:
+    return tuple(db.session.execute(select(*conditional.table_state(Category))).one())
+
+
+def _load_tree(version: int) -> tuple[tuple, SimpleNamespace]:
+    """The table state and category tree, read in one statement."""
+    by_id = {}
+    children: dict[int, list[SimpleNamespace]] = {}
+    top_level = []
+    subcategories = []
+    rows = db.session.execute(
+        select(Category, *conditional.table_state(Category)).order_by(
+            Category.name, Category.id
+        )
+    ).all()
+    for cat, *_ in rows:
+        node = SimpleNamespace(id=cat.id, name=cat.name, parent_id=cat.parent_id)
+        by_id[node.id] = node
+        if node.parent_id is None:
+            top_level.append(node)
+        else:
+            subcategories.append(node)
+            children.setdefault(node.parent_id, []).append(node)
+    state = tuple(rows[0][1:]) if rows else (None, 0)
+    return state, SimpleNamespace(
+        version=version,
+        by_id=by_id,
+        top_level=top_level,
+        subcategories=subcategories,
+        children=children,
+    )
+
+
+def _cache() -> CategoryCache:
+    cache = current_app.extensions.get(_EXTENSION_KEY)
+    if cache is None:
+        cache = current_app.extensions.setdefault(
+            _EXTENSION_KEY,
+            CategoryCache(current_app.config.get("CATEGORY_CACHE_TTL", 30)),
+        )
+    return cache
+
+
+def get_category_tree() -> SimpleNamespace:
+    """Return the cached tree.
+
+    The SimpleNamespace has: version, by_id, top_level, subcategories and
+    children (parent_id -> list). Nodes carry id, name and parent_id and
+    lists are sorted by name.
+    """
+    return _cache().get()
+
+
+def get_top_level_categories() -> list[SimpleNamespace]:
+    return get_category_tree().top_level
+
+
+def get_subcategories(parent_id: int | None = None) -> list[SimpleNamespace]:
+    """Children of parent_id, or every subcategory when parent_id is None."""
+    tree = get_category_tree()
+    if parent_id is None:
+        return tree.subcategories
+    return tree.children.get(parent_id, [])
+
+
+def get_category(category_id: int) -> SimpleNamespace | None:
+    return get_category_tree().by_id.get(category_id)
+
+
+def invalidate_category_cache() -> None:
+    _cache().invalidate()
+
+
+@event.listens_for(Category, "after_insert")
+@event.listens_for(Category, "after_update")
+@event.listens_for(Category, "after_delete")
+def _mark_categories_dirty(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    if session.info.pop(_DIRTY_KEY, False) and has_app_context():
+        invalidate_category_cache()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_on_rollback(session, previous_transaction):
+    session.info.pop(_DIRTY_KEY, None)
@@ -0,0 +1,270 @@
+"""Background CSV imports.
+
+An upload is copied to IMPORT_SPOOL_DIR and an ImportJob row is created;
+the request returns straight away and an "import_csv" job parses and inserts
+the file in batches. Each batch commits together with the job's progress
+columns, so a job that is run again (e.g. a stale job requeued by the SQLite
+queue) resumes after ``last_row`` without duplicating transactions.
+
+A failed import keeps its spool file and can be queued again with
+retry_import() for IMPORT_RETRY_SECONDS; after that the next upload deletes
+the file (purge_failed_spools()). A running import that has committed no
+batch for JOBS_STALE_SECONDS lost its worker (the thread backend drops jobs
+when its process exits) and is marked failed the next time it is looked up,
+so it can be retried too. A failed job is only run again once
+retry_import() has queued it, so a late worker and a retry never import the
+same file at once.
+"""
+
+import io
+import json
+import os
+import shutil
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from flask import current_app
+
+from app import jobs
+from app.extensions import db
+from app.models.import_job import ImportJob
+from app.services import account_service, analysis_service, transaction_service
+
+MAX_STORED_ERRORS = 50
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def purge_failed_spools() -> int:
+    """Delete the spool files of imports failed over IMPORT_RETRY_SECONDS ago.
+
+    Those imports can no longer be retried. Returns the number of jobs purged.
+    """
+    cutoff = _utcnow() - timedelta(
+        seconds=current_app.config.get("IMPORT_RETRY_SECONDS", 7 * 24 * 3600)
+    )
+    expired = ImportJob.query.filter(
+        ImportJob.status == "failed",
+        ImportJob.finished_at < cutoff,
+        ImportJob.spool_path != "",
+    ).all()
+    for job in expired:
+        if os.path.exists(job.spool_path):
+            os.remove(job.spool_path)
+        job.spool_path = ""
+    db.session.commit()
+    return len(expired)
+
+
+def start_import(file_storage, user_id: int, account_id: int | None = None):
+    """Spool an uploaded CSV to disk and queue its import. Returns the ImportJob."""
+    purge_failed_spools()
+    spool_dir = current_app.config["IMPORT_SPOOL_DIR"]
+    os.makedirs(spool_dir, exist_ok=True)
+    path = os.path.join(spool_dir, f"{uuid.uuid4().hex}.csv")
+    with open(path, "wb") as f:
+        shutil.copyfileobj(file_storage.stream, f)
+
+    job = ImportJob(
+        user_id=user_id,
+        account_id=account_id,
+        filename=file_storage.filename or "upload.csv",
+        spool_path=path,
+        status="queued",
+        total_bytes=os.path.getsize(path),
+        processed_bytes=0,
+        last_row=0,
+        imported=0,
+        skipped=0,
+        error_count=0,
+    )
+    db.session.add(job)
+    db.session.commit()
+    _enqueue_import(job)
+    return job
+
+
+def _enqueue_import(job: ImportJob) -> None:
+    jobs.enqueue(
+        "import_csv", key=f"import:{job.id}", user_id=job.user_id, import_id=job.id
+    )
+    # The job runs in its own session (inline with the sync backend)
+    db.session.expire(job)
+
+
+def get_import_for_user(import_id: int, user_id: int) -> ImportJob | None:
+    """The user's ImportJob, marked failed first if its worker has gone.
+
+    Queued jobs are left alone: they may be waiting behind another job of
+    the same user.
+    """
+    job = ImportJob.query.filter_by(id=import_id, user_id=user_id).first()
+    if job is not None and job.status == "running":
+        stale = _utcnow() - timedelta(
+            seconds=current_app.config.get("JOBS_STALE_SECONDS", 3600)
+        )
+        # Starting and every committed batch touch updated_at
+        if job.updated_at < stale:
+            _finish(
+                job,
+                "failed",
+                f"Import stopped responding after {job.imported} transactions.",
+            )
+    return job
+
+
+def can_retry(job: ImportJob) -> bool:
+    return job.status == "failed" and os.path.exists(job.spool_path)
+
+
+def retry_import(job: ImportJob) -> bool:
+    """Queue a failed import again to resume after last_row.
+
+    Returns False if the job has not failed or its file is gone.
+    """
+    if not can_retry(job):
+        return False
+    job.status = "queued"
+    job.message = None
+    job.finished_at = None
+    db.session.commit()
+    _enqueue_import(job)
+    return True
+
+
+def _widen(current: date | None, new: date | None, pick) -> date | None:
+    if current is None or new is None:
+        return current or new
+    return pick(current, new)
+
+
+def _enqueue_recompute(job: ImportJob) -> bool:
+    if job.min_date and job.max_date:
+        analysis_service.enqueue_recompute_range(
+            job.user_id, job.min_date, job.max_date
+        )
+        return True
+    return False
+
+
+def _finish(job: ImportJob, status: str, message: str) -> None:
+    job.status = status
+    job.message = message
+    job.finished_at = _utcnow()
+    db.session.commit()
+
+
+def run_import(import_id: int) -> None:
+    """Import the spooled file of ImportJob import_id, resuming after last_row.
+
+    Only queued jobs and running ones (requeued by the SQLite queue after
+    their worker died) are run; done and failed jobs are left alone.
+    """
+    job = db.session.get(ImportJob, import_id)
+    if (
+        job is None
+        or job.status not in ("queued", "running")
+        or not os.path.exists(job.spool_path)
+    ):
+        return
+    job.status = "running"
+    job.started_at = job.started_at or _utcnow()
+    db.session.commit()
+
+    base_imported = job.imported
+    base_skipped = job.skipped
+    base_error_count = job.error_count
+    stored_errors = json.loads(job.errors) if job.errors else []
+
+    def record(result: dict) -> None:
+        new_errors = result["errors"]
+        job.imported = base_imported + result["imported"]
+        job.skipped = base_skipped + result["skipped"]
+        job.error_count = base_error_count + len(new_errors)
+        kept = stored_errors + new_errors[:MAX_STORED_ERRORS]
+        job.errors = json.dumps(kept[:MAX_STORED_ERRORS])
+        job.last_row = result["last_row"]
+        # The decoder reads ahead, so this is approximate; fine for a progress bar
+        job.processed_bytes = min(raw.tell(), job.total_bytes)
+        job.min_date = _widen(job.min_date, result["min_date"], min)
+        job.max_date = _widen(job.max_date, result["max_date"], max)
+
+    try:
+        with (
+            open(job.spool_path, "rb") as raw,
+            io.TextIOWrapper(raw, encoding="utf-8-sig", newline="") as stream,
+        ):
+            transaction_service.import_csv(
+                stream,
+                job.user_id,
+                account_id=job.account_id,
+                batch_size=current_app.config["IMPORT_BATCH_SIZE"],
+                resume_after=job.last_row,
+                on_batch=record,
+            )
+    except UnicodeDecodeError:
+        # Batches before the bad byte are already committed
+        db.session.rollback()
+        _enqueue_recompute(job)
+        _finish(
+            job,
+            "failed",
+            f"Import stopped: the file is not valid UTF-8 text. "
+            f"Imported {job.imported} transactions.",
+        )
+        os.remove(job.spool_path)
+        return
+    except Exception as e:
+        # Keep the spool file so running the job again resumes from last_row
+        db.session.rollback()
+        _enqueue_recompute(job)
+        _finish(job, "failed", f"Import failed: {e}")
+        raise
+
+    job.processed_bytes = job.total_bytes
+    message = f"Imported {job.imported} transactions."
+    if job.skipped:
+        message += f" Skipped {job.skipped} already imported."
+    if _enqueue_recompute(job):
+        message += " Analysis is recomputing in the background."
+    if job.imported:
+        account_service.enqueue_snapshots(job.user_id)
+    _finish(job, "done", message)
+    os.remove(job.spool_path)
+
+
+@jobs.task("import_csv")
+def _import_job(user_id: int, import_id: int) -> None:
+    run_import(import_id)
+
+
+def import_progress(job: ImportJob) -> dict:
+    """JSON-ready progress of an import, with an ETA while it is running."""
+    percent = (
+        100.0
+        if job.status == "done"
+        else round(100 * job.processed_bytes / job.total_bytes, 1)
+        if job.total_bytes
+        else 0.0
+    )
+    eta_seconds = None
+    if job.status == "running" and job.started_at and job.processed_bytes:
+        elapsed = (_utcnow() - job.started_at).total_seconds()
+        remaining = job.total_bytes - job.processed_bytes
+        eta_seconds = round(elapsed * remaining / job.processed_bytes)
+    return {
+        "id": job.id,
+        "filename": job.filename,
+        "status": job.status,
+        "percent": percent,
+        "rows_processed": max(job.last_row - 1, 0),
+        "imported": job.imported,
+        "skipped": job.skipped,
+        "error_count": job.error_count,
+        "errors": json.loads(job.errors) if job.errors else [],
+        "eta_seconds": eta_seconds,
+        "message": job.message,
+        "can_retry": can_retry(job),
+    }
@@ -1,11 +1,54 @@
+import base64
+import binascii
 import csv
+import hashlib
 import io
+import sqlite3
+from contextlib import closing
 from datetime import date
 from decimal import Decimal, InvalidOperation
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from types import SimpleNamespace
+from typing import IO
 
+from sqlalchemy import (
+    bindparam,
+    delete,
+    func,
+    insert,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+
+from app import cache, search
+from app.database import replica_read
 from app.extensions import db
-from app.models.transaction import Transaction
+from app.models.account import AccountBalanceSnapshot
+from app.models.transaction import Transaction, TransactionMonthlyRollup
 from app.models.enums import TransactionType
+from app.services import account_service
+
+# Rows parsed, validated and inserted per round trip / commit during CSV import
+IMPORT_BATCH_SIZE = 1000
+
+# Named eager-loading profiles for list queries, keyed by the ``load`` argument
+LOAD_PROFILES = {
+    "list": (
+        joinedload(Transaction.category),
+        joinedload(Transaction.subcategory),
+    ),
+    "detail": (
+        joinedload(Transaction.category),
+        joinedload(Transaction.subcategory),
+        joinedload(Transaction.debit_account),
+        joinedload(Transaction.credit_account),
+    ),
+}
 
 
 def create_transaction(
@@ -22,6 +65,7 @@ def create_transaction(
     credit_account_id: int | None = None,
     category_id: int | None = None,
     subcategory_id: int | None = None,
+    commit: bool = True,
 ) -> Transaction:
     txn = Transaction(
         transaction_date=transaction_date,
@@ -37,8 +81,13 @@ def create_transaction(
         category_id=category_id,
         subcategory_id=subcategory_id,
     )
+    txn.fingerprint = _next_fingerprint(txn)
     db.session.add(txn)
-    db.session.commit()
+    db.session.flush()
+    _apply_ledger_deltas(added=[_rollup_values(txn)])
+    search.index([search.search_values(txn)])
+    if commit:
+        db.session.commit()
     return txn
 
 
@@ -50,6 +99,62 @@ def get_transaction_for_user(transaction_id: int, user_id: int) -> Transaction |
     return Transaction.query.filter_by(id=transaction_id, user_id=user_id).first()
 
 
+def _account_transaction_ids(account_id: int):
+    """Ids of transactions debiting or crediting account_id.
+
+    A UNION ALL of one index seek per side rather than an OR across the two
+    columns, which most planners can only answer with a table scan. IN
+    removes the duplicate when both sides name the same account.
+    """
+    return union_all(
+        select(Transaction.id).where(Transaction.debit_account_id == account_id),
+        select(Transaction.id).where(Transaction.credit_account_id == account_id),
+    )
+
+
+def _criteria(
+    *,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    category_id: int | None = None,
+    q: str | None = None,
+) -> list:
+    criteria = []
+    if start_date:
+        criteria.append(Transaction.transaction_date >= start_date)
+    if end_date:
+        criteria.append(Transaction.transaction_date <= end_date)
+    if category_id:
+        criteria.append(Transaction.category_id == category_id)
+    if q and q.strip():
+        criteria.append(search.match(q))
+    return criteria
+
+
+def _filtered_query(
+    user_id: int,
+    *,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    category_id: int | None = None,
+    account_id: int | None = None,
+    q: str | None = None,
+    load: str | None = None,
+):
+    query = Transaction.query.filter_by(user_id=user_id)
+    if load:
+        query = query.options(*LOAD_PROFILES[load])
+    query = query.filter(
+        *_criteria(
+            start_date=start_date, end_date=end_date, category_id=category_id, q=q
+        )
+    )
+    if account_id:
+        query = query.filter(Transaction.id.in_(_account_transaction_ids(account_id)))
+    return query
+
+
+@replica_read
 def get_transactions_for_user(
     user_id: int,
     *,
@@ -57,30 +162,178 @@ def get_transactions_for_user(
     end_date: date | None = None,
     category_id: int | None = None,
     account_id: int | None = None,
+    q: str | None = None,
     limit: int | None = None,
+    load: str | None = None,
 ) -> list[Transaction]:
-    query = Transaction.query.filter_by(user_id=user_id)
-
-    if start_date:
-        query = query.filter(Transaction.transaction_date >= start_date)
-    if end_date:
-        query = query.filter(Transaction.transaction_date <= end_date)
-    if category_id:
-        query = query.filter_by(category_id=category_id)
-    if account_id:
-        query = query.filter(
-            (Transaction.debit_account_id == account_id)
-            | (Transaction.credit_account_id == account_id)
-        )
+    query = _filtered_query(
+        user_id,
+        start_date=start_date,
+        end_date=end_date,
+        category_id=category_id,
+        account_id=account_id,
+        q=q,
+        load=load,
+    )
 
-    query = query.order_by(Transaction.transaction_date.desc())
+    query = query.order_by(Transaction.transaction_date.desc(), Transaction.id.desc())
     if limit:
         query = query.limit(limit)
 
     return query.all()
 
 
-def update_transaction(transaction_id: int, **kwargs) -> Transaction | None:
+def encode_cursor(txn: Transaction) -> str:
+    """Return an opaque, URL-safe cursor for a transaction's sort position."""
+    raw = f"{txn.transaction_date.isoformat()}:{txn.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[date, int] | None:
+    """Decode a cursor from encode_cursor(). Returns None if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        date_part, id_part = raw.split(":")
+        return date.fromisoformat(date_part), int(id_part)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def _seek(
+    user_id: int,
+    filters: dict,
+    account_id: int | None,
+    seek: list,
+    order: tuple,
+    limit: int,
+    load: str | None,
+) -> list[Transaction]:
+    """The first ``limit`` filtered rows past the ``seek`` criteria in ``order``.
+
+    With an account, each side of the account filter walks its own
+    (account, date) index in order and stops after ``limit`` ids, so a page
+    costs the same however many transactions the account has.
+    """
+    if not account_id:
+        query = _filtered_query(user_id, load=load, **filters)
+        return query.filter(*seek).order_by(*order).limit(limit).all()
+    # The outer query checks user_id; leaving it out here keeps each side on
+    # its account index rather than the user's date index
+    sides = [
+        select(Transaction.id)
+        .where(column == account_id, *_criteria(**filters), *seek)
+        .order_by(*order)
+        .limit(limit)
+        .subquery()
+        for column in (Transaction.debit_account_id, Transaction.credit_account_id)
+    ]
+    ids = union_all(*(select(side.c.id) for side in sides))
+    return (
+        _filtered_query(user_id, load=load)
+        .filter(Transaction.id.in_(ids))
+        .order_by(*order)
+        .limit(limit)
+        .all()
+    )
+
+
+@replica_read
+def get_transactions_page(
+    user_id: int,
+    *,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    category_id: int | None = None,
+    account_id: int | None = None,
+    q: str | None = None,
+    after: str | None = None,
+    before: str | None = None,
+    per_page: int = 25,
+    load: str | None = None,
+) -> SimpleNamespace:
+    """Return one page of transactions using keyset pagination.
+
+    Rows are ordered newest first on (transaction_date, id). ``after`` seeks to
+    the rows following a cursor, ``before`` to the rows preceding it; with
+    neither, the first page is returned. An invalid cursor also yields the
+    first page. ``load`` names an eager-loading profile from LOAD_PROFILES.
+    ``q`` narrows the rows to a full-text search (see app/search.py) before
+    the keyset seek, so cursors work unchanged within search results.
+
+    The returned SimpleNamespace has: items, next_cursor, prev_cursor.
+    A cursor is None when there is no page in that direction.
+    """
+    filters = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "category_id": category_id,
+        "q": q,
+    }
+    sort_key = tuple_(Transaction.transaction_date, Transaction.id)
+    newest_first = (Transaction.transaction_date.desc(), Transaction.id.desc())
+    oldest_first = (Transaction.transaction_date.asc(), Transaction.id.asc())
+
+    after_key = decode_cursor(after) if after else None
+    before_key = decode_cursor(before) if before and not after_key else None
+
+    if before_key:
+        # Walk backwards in ascending order, then flip back to newest first
+        rows = _seek(
+            user_id,
+            filters,
+            account_id,
+            [sort_key > tuple_(*before_key)],
+            oldest_first,
+            per_page + 1,
+            load,
+        )
+        if len(rows) > per_page:
+            return SimpleNamespace(
+                items=list(reversed(rows[:per_page])),
+                next_cursor=encode_cursor(rows[0]),
+                prev_cursor=encode_cursor(rows[per_page - 1]),
+            )
+        # Fewer than a full page remains before the cursor: show the first page
+
+    seek = [sort_key < tuple_(*after_key)] if after_key else []
+    rows = _seek(user_id, filters, account_id, seek, newest_first, per_page + 1, load)
+    items = rows[:per_page]
+    has_next = len(rows) > per_page
+    has_prev = after_key is not None
+
+    return SimpleNamespace(
+        items=items,
+        next_cursor=encode_cursor(items[-1]) if items and has_next else None,
+        prev_cursor=encode_cursor(items[0]) if items and has_prev else None,
+    )
+
+
+@replica_read
+def count_transactions_for_user(
+    user_id: int,
+    *,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    category_id: int | None = None,
+    account_id: int | None = None,
+    q: str | None = None,
+) -> int:
+    """Count matching transactions without loading any rows."""
+    query = _filtered_query(
+        user_id,
+        start_date=start_date,
+        end_date=end_date,
+        category_id=category_id,
+        account_id=account_id,
+        q=q,
+    )
+    return query.with_entities(func.count(Transaction.id)).scalar() or 0
+
+
+def update_transaction(
+    transaction_id: int, *, commit: bool = True, **kwargs
+) -> Transaction | None:
     txn = db.session.get(Transaction, transaction_id)
     if not txn:
         return None
@@ -90,97 +343,565 @@ def update_transaction(transaction_id: int, **kwargs) -> Transaction | None:
     ):
         kwargs["transaction_type"] = kwargs["transaction_type"].value
 
+    old = _rollup_values(txn)
+    old_text = search.search_values(txn)
     for key, value in kwargs.items():
         if hasattr(txn, key):
             setattr(txn, key, value)
 
-    db.session.commit()
+    _apply_ledger_deltas(added=[_rollup_values(txn)], removed=[old])
+    new_text = search.search_values(txn)
+    if new_text != old_text:
+        search.unindex([old_text])
+        search.index([new_text])
+    if commit:
+        db.session.commit()
     return txn
 
 
-def delete_transaction(transaction_id: int) -> bool:
+def delete_transaction(transaction_id: int, *, commit: bool = True) -> bool:
     txn = db.session.get(Transaction, transaction_id)
     if not txn:
         return False
+    _apply_ledger_deltas(removed=[_rollup_values(txn)])
+    search.unindex([search.search_values(txn)])
     db.session.delete(txn)
-    db.session.commit()
+    if commit:
+        db.session.commit()
     return True
 
 
+def _rollup_values(txn: Transaction | dict) -> dict:
+    """The columns of a transaction (ORM object or insert params) deltas use."""
+    if isinstance(txn, Transaction):
+        txn = {
+            name: getattr(txn, name)
+            for name in (
+                "user_id",
+                "transaction_date",
+                "category_id",
+                "subcategory_id",
+                "transaction_type",
+                "amount",
+                "debit_account_id",
+                "credit_account_id",
+            )
+        }
+    return txn
+
+
+def _apply_ledger_deltas(
+    added: Iterable[dict] = (), removed: Iterable[dict] = ()
+) -> None:
+    """Update the monthly rollup and balance snapshots for a write."""
+    added, removed = list(added), list(removed)
+    _apply_rollup_deltas(_rollup_deltas(added, removed))
+    _apply_balance_deltas(_balance_deltas(added, removed))
+
+
+def _rollup_deltas(
+    added: Iterable[dict] = (), removed: Iterable[dict] = ()
+) -> dict[tuple, tuple[Decimal, int]]:
+    """Fold transactions into signed (amount, count) deltas per rollup key.
+
+    Keys are (user_id, month, category_id, subcategory_id, transaction_type)
+    with month the first day of the transaction's calendar month.
+    """
+    deltas: dict[tuple, tuple[Decimal, int]] = {}
+    for rows, sign in ((added, 1), (removed, -1)):
+        for row in rows:
+            key = (
+                row["user_id"],
+                row["transaction_date"].replace(day=1),
+                row["category_id"],
+                row["subcategory_id"],
+                row["transaction_type"],
+            )
+            amount, count = deltas.get(key, (Decimal("0.00"), 0))
+            deltas[key] = (amount + Decimal(row["amount"]) * sign, count + sign)
+    return {key: delta for key, delta in deltas.items() if delta != (0, 0)}
+
+
+def _apply_rollup_deltas(deltas: dict[tuple, tuple[Decimal, int]]) -> None:
+    """Add deltas to TransactionMonthlyRollup in the current transaction.
+
+    Existing rows are looked up with one query, then updated and created
+    with one executemany each; rows whose count drops to zero are removed.
+    The caller commits.
+    """
+    if not deltas:
+        return
+    rollup = TransactionMonthlyRollup.__table__
+    user_ids = {key[0] for key in deltas}
+    months = {key[1] for key in deltas}
+    existing = {}
+    for row in db.session.execute(
+        select(
+            rollup.c.id,
+            rollup.c.user_id,
+            rollup.c.month,
+            rollup.c.category_id,
+            rollup.c.subcategory_id,
+            rollup.c.transaction_type,
+        ).where(rollup.c.user_id.in_(user_ids), rollup.c.month.in_(months))
+    ):
+        existing.setdefault(tuple(row[1:]), row.id)
+
+    updates, inserts = [], []
+    for key, (amount, count) in deltas.items():
+        if key in existing:
+            updates.append(
+                {"rollup_id": existing[key], "amount": amount, "count": count}
+            )
+        elif count > 0:
+            user_id, month, category_id, subcategory_id, txn_type = key
+            inserts.append(
+                {
+                    "user_id": user_id,
+                    "month": month,
+                    "category_id": category_id,
+                    "subcategory_id": subcategory_id,
+                    "transaction_type": txn_type,
+                    "total_amount": amount,
+                    "transaction_count": count,
+                }
+            )
+
+    if updates:
+        db.session.execute(
+            update(rollup)
+            .where(rollup.c.id == bindparam("rollup_id"))
+            .values(
+                total_amount=rollup.c.total_amount + bindparam("amount"),
+                transaction_count=rollup.c.transaction_count + bindparam("count"),
+            ),
+            updates,
+        )
+        if any(u["count"] < 0 for u in updates):
+            db.session.execute(
+                delete(rollup).where(
+                    rollup.c.id.in_([u["rollup_id"] for u in updates]),
+                    rollup.c.transaction_count <= 0,
+                )
+            )
+    if inserts:
+        db.session.execute(insert(rollup), inserts)
+
+
+def _balance_deltas(
+    added: Iterable[dict] = (), removed: Iterable[dict] = ()
+) -> dict[tuple[int, date], Decimal]:
+    """Fold transactions into signed balance deltas per (account_id, month end)."""
+    deltas: dict[tuple[int, date], Decimal] = {}
+    for rows, sign in ((added, 1), (removed, -1)):
+        for row in rows:
+            month_end = account_service.snapshot_date(row["transaction_date"])
+            amount = Decimal(row["amount"]) * sign
+            for column, side in (("credit_account_id", 1), ("debit_account_id", -1)):
+                if row.get(column):
+                    key = (row[column], month_end)
+                    deltas[key] = deltas.get(key, Decimal("0.00")) + amount * side
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+def _apply_balance_deltas(deltas: dict[tuple[int, date], Decimal]) -> None:
+    """Add deltas to every AccountBalanceSnapshot from their month onwards.
+
+    One executemany UPDATE; months without a snapshot yet are summed from
+    the ledger when the snapshot job writes them. The caller commits.
+    """
+    if not deltas:
+        return
+    snapshots = AccountBalanceSnapshot.__table__
+    db.session.execute(
+        update(snapshots)
+        .where(
+            snapshots.c.account_id == bindparam("account"),
+            snapshots.c.as_of >= bindparam("month_end"),
+        )
+        .values(balance=snapshots.c.balance + bindparam("delta")),
+        [
+            {"account": account_id, "month_end": month_end, "delta": delta}
+            for (account_id, month_end), delta in deltas.items()
+        ],
+    )
+
+
+def rebuild_monthly_rollup(user_id: int) -> int:
+    """Recreate a user's TransactionMonthlyRollup rows from raw transactions.
+
+    Only needed after writes that bypass this module. Returns the number of
+    rollup rows written.
+    """
+    daily = (
+        db.session.query(
+            Transaction.transaction_date,
+            Transaction.category_id,
+            Transaction.subcategory_id,
+            Transaction.transaction_type,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id),
+        )
+        .filter(Transaction.user_id == user_id)
+        .group_by(
+            Transaction.transaction_date,
+            Transaction.category_id,
+            Transaction.subcategory_id,
+            Transaction.transaction_type,
+        )
+        .all()
+    )
+    months: dict[tuple, tuple[Decimal, int]] = {}
+    for day, category_id, subcategory_id, txn_type, amount, count in daily:
+        key = (day.replace(day=1), category_id, subcategory_id, txn_type)
+        total, n = months.get(key, (Decimal("0.00"), 0))
+        months[key] = (total + (amount or 0), n + count)
+
+    TransactionMonthlyRollup.query.filter_by(user_id=user_id).delete()
+    if months:
+        db.session.execute(
+            insert(TransactionMonthlyRollup.__table__),
+            [
+                {
+                    "user_id": user_id,
+                    "month": month,
+                    "category_id": category_id,
+                    "subcategory_id": subcategory_id,
+                    "transaction_type": txn_type,
+                    "total_amount": total,
+                    "transaction_count": count,
+                }
+                for (month, category_id, subcategory_id, txn_type), (
+                    total,
+                    count,
+                ) in months.items()
+            ],
+        )
+    db.session.commit()
+    return len(months)
+
+
+def _parse_csv_row(
+    row: dict, user_id: int, account_id: int | None
+) -> tuple[dict | None, str | None]:
+    """Validate one CSV row. Returns (insert params, None) or (None, error)."""
+    try:
+        amount = Decimal(row["amount"].strip().replace(",", ""))
+    except (InvalidOperation, KeyError, AttributeError) as e:
+        return None, f"Invalid amount: {e}"
+
+    try:
+        txn_date = date.fromisoformat(row["date"].strip())
+    except (ValueError, KeyError, AttributeError) as e:
+        return None, f"Invalid date: {e}"
+
+    txn_type_str = (row.get("type", "debit") or "").strip().lower()
+    try:
+        txn_type = TransactionType(txn_type_str)
+    except ValueError:
+        return None, f"Invalid type: {txn_type_str}"
+
+    post_date = None
+    if row.get("post_date"):
+        try:
+            post_date = date.fromisoformat(row["post_date"].strip())
+        except ValueError:
+            pass  # non-critical — skip post_date
+
+    return {
+        "transaction_date": txn_date,
+        "post_date": post_date,
+        "payee": (row.get("payee") or "").strip(),
+        "description": (row.get("description") or "").strip() or None,
+        "amount": amount,
+        "transaction_type": txn_type.value,
+        "notes": (row.get("notes") or "").strip() or None,
+        "user_id": user_id,
+        "debit_account_id": account_id if txn_type == TransactionType.DEBIT else None,
+        "credit_account_id": account_id if txn_type == TransactionType.CREDIT else None,
+        "category_id": None,
+        "subcategory_id": None,
+    }, None
+
+
+def transaction_fingerprint(
+    user_id: int,
+    transaction_date: date,
+    amount: Decimal,
+    transaction_type: str,
+    payee: str,
+    account_id: int | None,
+    occurrence: int = 1,
+) -> str:
+    """Hash identifying an imported row, unique per user.
+
+    Payees are compared case- and whitespace-insensitively. ``occurrence``
+    numbers identical rows within one file, so a statement that really has
+    two identical charges keeps both while re-importing it adds neither.
+    """
+    key = "|".join(
+        (
+            str(user_id),
+            transaction_date.isoformat(),
+            f"{Decimal(amount):.2f}",
+            transaction_type,
+            " ".join(payee.casefold().split()),
+            str(account_id or ""),
+            str(occurrence),
+        )
+    )
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+class _OccurrenceCounts:
+    """Occurrence counts of identical rows across one import.
+
+    Numbering needs a count for every distinct row seen so far, so the counts
+    live in a private temporary SQLite database (an empty filename), which
+    spills to a temp file once it outgrows its page cache. Memory stays
+    bounded by the batch; each batch costs one lookup and one upsert.
+    """
+
+    # Keys per lookup, below SQLite's bound parameter limit
+    LOOKUP_SIZE = 500
+
+    def __init__(self):
+        self.db = sqlite3.connect("")
+        self.db.execute(
+            "CREATE TABLE counts (key TEXT PRIMARY KEY, n INTEGER NOT NULL)"
+            " WITHOUT ROWID"
+        )
+
+    def close(self) -> None:
+        self.db.close()
+
+    def number(self, keys: list[str]) -> list[int]:
+        """The occurrence number of each key, counting every earlier call."""
+        distinct = list(dict.fromkeys(keys))
+        counts = {}
+        for i in range(0, len(distinct), self.LOOKUP_SIZE):
+            part = distinct[i : i + self.LOOKUP_SIZE]
+            counts.update(
+                self.db.execute(
+                    "SELECT key, n FROM counts WHERE key IN"
+                    f" ({','.join('?' * len(part))})",
+                    part,
+                )
+            )
+        numbers = []
+        for key in keys:
+            counts[key] = counts.get(key, 0) + 1
+            numbers.append(counts[key])
+        self.db.executemany(
+            "INSERT OR REPLACE INTO counts VALUES (?, ?)", counts.items()
+        )
+        return numbers
+
+
+def _assign_fingerprints(
+    txns: list[dict], account_id: int | None, seen: _OccurrenceCounts
+) -> None:
+    fields = [
+        (
+            txn["user_id"],
+            txn["transaction_date"],
+            txn["amount"],
+            txn["transaction_type"],
+            txn["payee"],
+            account_id,
+        )
+        for txn in txns
+    ]
+    firsts = [transaction_fingerprint(*f) for f in fields]
+    for txn, f, first, occurrence in zip(txns, fields, firsts, seen.number(firsts)):
+        txn["fingerprint"] = (
+            first if occurrence == 1 else transaction_fingerprint(*f, occurrence)
+        )
+
+
+def _next_fingerprint(txn: Transaction) -> str:
+    """Fingerprint a manually entered transaction as an import would.
+
+    Manual rows are fingerprinted like the rows backfilled by the
+    fingerprint migration, so a later import of the same bank row is
+    skipped whether the entry was made before or after it. Identical rows
+    the user already has hold occurrences 1..n; this one takes the first
+    free number.
+    """
+    account_id = (
+        txn.debit_account_id
+        if txn.transaction_type == TransactionType.DEBIT.value
+        else txn.credit_account_id
+    )
+    fields = (
+        txn.user_id,
+        txn.transaction_date,
+        txn.amount,
+        txn.transaction_type,
+        txn.payee,
+        account_id,
+    )
+    start = 1
+    while True:
+        candidates = [
+            transaction_fingerprint(*fields, occurrence)
+            for occurrence in range(start, start + 8)
+        ]
+        taken = set(
+            db.session.scalars(
+                select(Transaction.fingerprint).where(
+                    Transaction.user_id == txn.user_id,
+                    Transaction.fingerprint.in_(candidates),
+                )
+            )
+        )
+        for fingerprint in candidates:
+            if fingerprint not in taken:
+                return fingerprint
+        start += 8
+
+
+def _drop_existing(params: list[dict], user_id: int) -> list[dict]:
+    """params without rows whose fingerprint user_id already has (one query)."""
+    existing = set(
+        db.session.scalars(
+            select(Transaction.fingerprint).where(
+                Transaction.user_id == user_id,
+                Transaction.fingerprint.in_([p["fingerprint"] for p in params]),
+            )
+        )
+    )
+    if not existing:
+        return params
+    return [p for p in params if p["fingerprint"] not in existing]
+
+
+def _insert_fresh(params: list[dict], user_id: int) -> list[dict]:
+    """Insert the rows of params that user_id does not have yet; returns them.
+
+    A concurrent import of the same file can commit a matching row between
+    the lookup and the INSERT, which then fails on the fingerprint index.
+    The batch (nothing else is pending in it) is rolled back, filtered again
+    against the rows committed meanwhile and retried.
+    """
+    fresh = _drop_existing(params, user_id)
+    while fresh:
+        try:
+            bulk_insert_transactions(fresh, commit=False)
+            break
+        except IntegrityError:
+            db.session.rollback()
+            remaining = _drop_existing(fresh, user_id)
+            if len(remaining) == len(fresh):
+                raise  # Not a duplicate fingerprint
+            fresh = remaining
+    return fresh
+
+
+def _iter_chunks(rows: Iterator, size: int) -> Iterator[list]:
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def bulk_insert_transactions(params: list[dict], *, commit: bool = True) -> None:
+    """Write a batch of transaction column dicts with one executemany INSERT.
+
+    Every dict must carry the same keys. The monthly rollup and search index
+    are updated in the same transaction and, unless ``commit`` is false, the
+    batch is committed.
+    """
+    with search.indexing_inserts():
+        db.session.execute(insert(Transaction.__table__), params)
+    _apply_ledger_deltas(added=params)
+    for user_id in {p["user_id"] for p in params}:
+        cache.mark_user_changed(db.session, user_id)
+    if commit:
+        db.session.commit()
+
+
 def import_csv(
-    csv_data: str | io.StringIO,
+    csv_data: str | IO[str],
     user_id: int,
     *,
     account_id: int | None = None,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    resume_after: int = 0,
+    on_batch: Callable[[dict], None] | None = None,
 ) -> dict:
     """Import transactions from CSV data.
 
     Expected columns: date, payee, amount, type (debit/credit)
     Optional columns: post_date, description, notes
 
-    Returns dict with 'imported' count and 'errors' list.
+    The input is streamed in chunks of ``batch_size`` rows; each chunk is
+    validated and written with one bulk INSERT and committed on its own, so
+    at most one batch of rows is held at a time. ``last_row`` in the result
+    is the checkpoint: the CSV row number up to which everything is
+    committed. Pass it back as ``resume_after`` to continue an interrupted
+    import without duplicating rows.
+
+    Each row gets a fingerprint (see transaction_fingerprint()); rows whose
+    fingerprint the user already has are skipped with one lookup per batch,
+    so re-importing an overlapping export is idempotent. Identical rows are
+    numbered with occurrence counts kept on disk (see _OccurrenceCounts).
+
+    ``on_batch`` is called with the running result after every batch, before
+    its commit, so progress it records in the session is committed
+    atomically with the rows.
+
+    Returns dict with 'imported' and 'skipped' (duplicate) counts, 'errors'
+    list, 'min_date'/'max_date' of imported rows, 'batches' committed and
+    'last_row' checkpoint.
     """
     if isinstance(csv_data, str):
         csv_data = io.StringIO(csv_data)
 
     reader = csv.DictReader(csv_data)
-    imported = 0
-    errors = []
-    min_date: date | None = None
-    max_date: date | None = None
+    result = {
+        "imported": 0,
+        "skipped": 0,
+        "errors": [],
+        "min_date": None,
+        "max_date": None,
+        "batches": 0,
+        "last_row": resume_after,
+    }
 
-    for row_num, row in enumerate(reader, start=2):  # row 1 is header
-        try:
-            amount = Decimal(row["amount"].strip().replace(",", ""))
-        except (InvalidOperation, KeyError) as e:
-            errors.append({"row": row_num, "error": f"Invalid amount: {e}"})
-            continue
+    with closing(_OccurrenceCounts()) as seen:
+        numbered = enumerate(reader, start=2)  # row 1 is header
+        for chunk in _iter_chunks(numbered, batch_size):
+            parsed = [
+                (row_num, *_parse_csv_row(row, user_id, account_id))
+                for row_num, row in chunk
+            ]
+            # Committed rows still count towards occurrence numbers
+            _assign_fingerprints([txn for _, txn, _ in parsed if txn], account_id, seen)
+            params = []
+            for row_num, txn, error in parsed:
+                if row_num <= resume_after:
+                    continue
+                if error:
+                    result["errors"].append({"row": row_num, "error": error})
+                    continue
+                params.append(txn)
 
-        try:
-            txn_date = date.fromisoformat(row["date"].strip())
-        except (ValueError, KeyError) as e:
-            errors.append({"row": row_num, "error": f"Invalid date: {e}"})
-            continue
+            if params:
+                fresh = _insert_fresh(params, user_id)
+                result["skipped"] += len(params) - len(fresh)
+                params = fresh
+            if params:
+                dates = [p["transaction_date"] for p in params]
+                lo, hi = min(dates), max(dates)
+                result["imported"] += len(params)
+                result["batches"] += 1
+                if result["min_date"] is None or lo < result["min_date"]:
+                    result["min_date"] = lo
+                if result["max_date"] is None or hi > result["max_date"]:
+                    result["max_date"] = hi
 
-        txn_type_str = row.get("type", "debit").strip().lower()
-        try:
-            txn_type = TransactionType(txn_type_str)
-        except ValueError:
-            errors.append({"row": row_num, "error": f"Invalid type: {txn_type_str}"})
-            continue
-
-        post_date = None
-        if row.get("post_date"):
-            try:
-                post_date = date.fromisoformat(row["post_date"].strip())
-            except ValueError:
-                pass  # non-critical — skip post_date
-
-        txn = Transaction(
-            transaction_date=txn_date,
-            post_date=post_date,
-            payee=row.get("payee", "").strip(),
-            description=row.get("description", "").strip() or None,
-            amount=amount,
-            transaction_type=txn_type.value,
-            notes=row.get("notes", "").strip() or None,
-            user_id=user_id,
-            debit_account_id=account_id if txn_type == TransactionType.DEBIT else None,
-            credit_account_id=account_id
-            if txn_type == TransactionType.CREDIT
-            else None,
-        )
-        db.session.add(txn)
-        imported += 1
-        min_date = txn_date if min_date is None else min(min_date, txn_date)
-        max_date = txn_date if max_date is None else max(max_date, txn_date)
-
-    if imported:
-        db.session.commit()
+            result["last_row"] = max(result["last_row"], chunk[-1][0])
+            if on_batch:
+                on_batch(result)
+            db.session.commit()
 
-    return {
-        "imported": imported,
-        "errors": errors,
-        "min_date": min_date,
-        "max_date": max_date,
-    }
+    return result
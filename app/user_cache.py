@@ -0,0 +1,96 @@
+"""Per-process cache of the users Flask-Login loads on every request.
+
+Without it load_user() queries the users table before any view runs. Entries
+are CachedUser copies: plain values holding only what requests read from
+current_user, so they are never attached to a session. An entry lives
+USER_CACHE_TTL seconds, at most USER_CACHE_MAX_ENTRIES are kept, and a
+committed change to a User drops its entry in the committing process. Other
+processes notice when their entry expires, so keep the TTL short: it bounds
+how long a deactivated user stays signed in elsewhere.
+"""
+
+import time
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.cache import LRUCache
+from app.extensions import db
+from app.models.user import User
+
+_EXTENSION_KEY = "user_cache"
+_CHANGED_KEY = "changed_users"
+
+
+class CachedUser:
+    """Detached snapshot of a User for Flask-Login's current_user."""
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user: User):
+        self.id = user.id
+        self.username = user.username
+        self.first_name = user.first_name
+        self.is_active = user.is_active
+        # Part of conditional GET validators (app/conditional.py)
+        self.updated_at = user.updated_at
+
+    def get_id(self) -> str:
+        return str(self.id)
+
+    def __repr__(self):
+        return f"<CachedUser {self.username}>"
+
+
+def _entries() -> LRUCache:
+    entries = current_app.extensions.get(_EXTENSION_KEY)
+    if entries is None:
+        entries = current_app.extensions.setdefault(
+            _EXTENSION_KEY,
+            LRUCache(current_app.config.get("USER_CACHE_MAX_ENTRIES", 1024)),
+        )
+    return entries
+
+
+def load_user(user_id: int) -> CachedUser | None:
+    """The cached snapshot of user_id, loading it on a miss or after expiry."""
+    entries = _entries()
+    now = time.monotonic()
+    entry = entries.get(str(user_id))
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    user = db.session.get(User, user_id)
+    if user is None:
+        return None
+    snapshot = CachedUser(user)
+    ttl = current_app.config.get("USER_CACHE_TTL", 60)
+    entries.set(str(user_id), (now + ttl, snapshot))
+    return snapshot
+
+
+def forget(user_id: int) -> None:
+    """Drop user_id's entry so the next request reloads it."""
+    _entries().set(str(user_id), None)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_on_commit(session):
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if changed and has_app_context():
+        for user_id in changed:
+            forget(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_on_rollback(session, previous_transaction):
+    session.info.pop(_CHANGED_KEY, None)
@@ -0,0 +1,200 @@
+"""Synthetic large-ledger dataset for benchmarks.
+
+Builds N users, each with years of transactions spread over the seeded
+categories and their accounts, budget items of every Frequency, and
+overlapping monthly / quarterly / annual analysis periods. Transactions are
+written with bulk Core inserts so multi-hundred-thousand-row ledgers build in
+seconds.
+"""
+
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.extensions import db
+from app.models.account import Account
+from app.models.budget import BudgetedExpense
+from app.models.category import Category
+from app.models.enums import AccountType, Frequency, TransactionType, Variability
+from app.models.expense_analysis import AnalysisPeriod
+from app.models.user import User
+from app.models.vendor import Vendor
+from app.services import analysis_service, transaction_service
+from app.services.seed_service import seed_categories, seed_vendors
+
+PASSWORD = "benchmark-password"
+
+PAYEES = [
+    "AMAZON MARKETPLACE",
+    "WHOLE FOODS",
+    "SHELL OIL",
+    "NETFLIX",
+    "STARBUCKS",
+    "CITY UTILITIES",
+    "TARGET",
+    "COSTCO",
+    "UBER",
+    "PHARMACY PLUS",
+    "LANDLORD LLC",
+    "GYM MEMBERSHIP",
+]
+
+_INSERT_BATCH = 5000
+
+
+def _month_start(d: date, offset: int) -> date:
+    month = d.month - 1 + offset
+    return date(d.year + month // 12, month % 12 + 1, 1)
+
+
+def _periods(start: date, months: int) -> list[tuple[str, date, date]]:
+    periods = []
+    for m in range(months):
+        first = _month_start(start, m)
+        last = _month_start(start, m + 1) - timedelta(days=1)
+        periods.append((first.strftime("%b %Y"), first, last))
+        if first.month in (1, 4, 7, 10) and m + 3 <= months:
+            q_end = _month_start(start, m + 3) - timedelta(days=1)
+            quarter = (first.month - 1) // 3 + 1
+            periods.append((f"Q{quarter} {first.year}", first, q_end))
+        if first.month == 1 and m + 12 <= months:
+            periods.append((str(first.year), first, date(first.year, 12, 31)))
+    return periods
+
+
+def generate_ledger(
+    *,
+    users: int = 3,
+    years: int = 2,
+    txns_per_month: int = 300,
+    budget_items_per_frequency: int = 4,
+    seed: int = 0,
+    end: date | None = None,
+) -> dict:
+    """Populate the current app's database. Returns ids and row counts."""
+    rng = random.Random(seed)
+    seed_categories()
+    seed_vendors()
+
+    subs = Category.query.filter(Category.parent_id.is_not(None)).all()
+    vendor_ids = [v.id for v in Vendor.query.all()]
+    months = years * 12
+    end = end or date.today()
+    start = _month_start(end, -months + 1)
+    span_days = (_month_start(end, 1) - start).days
+
+    user_ids = []
+    total_txns = 0
+    for u in range(users):
+        user = User(
+            username=f"bench{u}",
+            email=f"bench{u}@example.com",
+            first_name="Bench",
+            last_name=str(u),
+        )
+        user.set_password(PASSWORD)
+        db.session.add(user)
+        db.session.flush()
+        user_ids.append(user.id)
+
+        accounts = [
+            Account(
+                name=f"{account_type.value.title()} {u}",
+                vendor_id=rng.choice(vendor_ids),
+                account_type=account_type.value,
+                owner_id=user.id,
+            )
+            for account_type in (
+                AccountType.CHECKING,
+                AccountType.SAVINGS,
+                AccountType.CREDIT_CARD,
+            )
+        ]
+        db.session.add_all(accounts)
+        db.session.flush()
+        account_ids = [a.id for a in accounts]
+
+        for frequency in Frequency:
+            for _ in range(budget_items_per_frequency):
+                sub = rng.choice(subs)
+                db.session.add(
+                    BudgetedExpense(
+                        payee=rng.choice(PAYEES),
+                        variability=rng.choice(list(Variability)).value,
+                        frequency=frequency.value,
+                        date_scheduled=start + timedelta(rng.randrange(span_days)),
+                        budgeted_amount=Decimal(rng.randrange(2000, 200000)) / 100,
+                        user_id=user.id,
+                        category_id=sub.parent_id,
+                        subcategory_id=sub.id,
+                    )
+                )
+
+        for name, first, last in _periods(start, months):
+            db.session.add(
+                AnalysisPeriod(
+                    name=name, start_date=first, end_date=last, user_id=user.id
+                )
+            )
+        db.session.commit()
+
+        rows = []
+        for _ in range(months * txns_per_month):
+            sub = rng.choice(subs)
+            txn_type = (
+                TransactionType.CREDIT if rng.random() < 0.1 else TransactionType.DEBIT
+            )
+            account_id = rng.choice(account_ids)
+            rows.append(
+                {
+                    "transaction_date": start + timedelta(rng.randrange(span_days)),
+                    "post_date": None,
+                    "payee": rng.choice(PAYEES),
+                    "description": None,
+                    "amount": Decimal(rng.randrange(100, 50000)) / 100,
+                    "transaction_type": txn_type.value,
+                    "notes": None,
+                    "user_id": user.id,
+                    "debit_account_id": account_id
+                    if txn_type == TransactionType.DEBIT
+                    else None,
+                    "credit_account_id": account_id
+                    if txn_type == TransactionType.CREDIT
+                    else None,
+                    "category_id": sub.parent_id,
+                    "subcategory_id": sub.id,
+                }
+            )
+            if len(rows) >= _INSERT_BATCH:
+                transaction_service.bulk_insert_transactions(rows)
+                total_txns += len(rows)
+                rows = []
+        if rows:
+            transaction_service.bulk_insert_transactions(rows)
+            total_txns += len(rows)
+
+        analysis_service.recompute_periods_in_range(
+            user.id, start, _month_start(end, 1) - timedelta(days=1)
+        )
+
+    return {
+        "user_ids": user_ids,
+        "start": start,
+        "end": _month_start(end, 1) - timedelta(days=1),
+        "transactions": total_txns,
+        "periods_per_user": len(_periods(start, months)),
+    }
+
+
+def csv_payload(rows: int, *, seed: int = 1, start: date | None = None) -> str:
+    """A bank-export style CSV with ``rows`` valid lines for import_csv()."""
+    rng = random.Random(seed)
+    start = start or date.today() - timedelta(days=365)
+    lines = ["date,payee,amount,type,description"]
+    for i in range(rows):
+        lines.append(
+            f"{start + timedelta(rng.randrange(365))},{rng.choice(PAYEES)},"
+            f"{rng.randrange(100, 50000) / 100:.2f},"
+            f"{'credit' if rng.random() < 0.1 else 'debit'},row {i}"
+        )
+    return "\n".join(lines) + "\n"
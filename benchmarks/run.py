@@ -0,0 +1,269 @@
+"""Benchmark the hot service functions and pages on a synthetic ledger.
+
+Usage:
+    python -m benchmarks.run [--users 3 --years 2 --txns-per-month 300]
+                             [--repeat 20] [--save-baseline PATH]
+                             [--compare PATH --threshold 0.25]
+                             [--hash-methods METHOD ...]
+
+A fresh SQLite database (BENCHMARK_DATABASE_URL, default ./benchmark.db) is
+built with benchmarks.datagen, then each benchmark is timed ``--repeat``
+times. Results (mean, percentiles and throughput per benchmark) are printed
+and can be saved as a JSON baseline. With --compare, the p50 of every
+benchmark is checked against the baseline and the exit status is non-zero
+if any is slower by more than the threshold.
+
+Each password hash method (PASSWORD_HASH_METHOD values) is timed on its own;
+its per_sec is hashes, and so logins, per second on one core.
+"""
+
+import argparse
+import io
+import json
+import statistics
+import sys
+import time
+from collections.abc import Callable
+
+from werkzeug.security import generate_password_hash
+
+from app import create_app
+from app.extensions import db
+from app.models.account import Account
+from app.models.expense_analysis import AnalysisPeriod
+from app.models.user import User
+from app.services import account_service, analysis_service, transaction_service
+from benchmarks.datagen import csv_payload, generate_ledger
+
+# Password hashing policies timed by default, strongest first
+HASH_METHODS = (
+    "scrypt:32768:8:1",
+    "scrypt:16384:8:1",
+    "pbkdf2:sha256:600000",
+    "pbkdf2:sha256:260000",
+)
+
+
+def time_call(fn: Callable[[], object], repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples: list[float], *, items: int = 1) -> dict:
+    """Timing statistics in milliseconds plus throughput in items per second."""
+    ms = sorted(s * 1000 for s in samples)
+    if len(ms) > 1:
+        cuts = statistics.quantiles(ms, n=100, method="inclusive")
+        p50, p90, p99 = cuts[49], cuts[89], cuts[98]
+    else:
+        p50 = p90 = p99 = ms[0]
+    mean = statistics.fmean(ms)
+    return {
+        "runs": len(ms),
+        "mean_ms": round(mean, 3),
+        "min_ms": round(ms[0], 3),
+        "p50_ms": round(p50, 3),
+        "p90_ms": round(p90, 3),
+        "p99_ms": round(p99, 3),
+        "max_ms": round(ms[-1], 3),
+        "per_sec": round(items * 1000 / mean, 1) if mean else None,
+    }
+
+
+def _login(client, user_id: int) -> None:
+    with client.session_transaction() as sess:
+        sess["_user_id"] = str(user_id)
+        sess["_fresh"] = True
+
+
+def run_benchmarks(
+    *, users: int, years: int, txns_per_month: int, repeat: int, import_rows: int
+) -> dict:
+    app = create_app("benchmark")
+    results: dict[str, dict] = {}
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        start = time.perf_counter()
+        ledger = generate_ledger(
+            users=users, years=years, txns_per_month=txns_per_month
+        )
+        build_s = time.perf_counter() - start
+        print(
+            f"Built {ledger['transactions']} transactions for {users} users "
+            f"in {build_s:.1f}s",
+            file=sys.stderr,
+        )
+
+        user_id = ledger["user_ids"][0]
+        periods = AnalysisPeriod.query.filter_by(user_id=user_id).all()
+        longest = max(periods, key=lambda p: p.end_date - p.start_date)
+        month = min(periods, key=lambda p: p.end_date - p.start_date)
+
+        results["recompute_analysis[longest]"] = summarize(
+            time_call(
+                lambda: analysis_service.recompute_analysis(longest.id, user_id),
+                repeat,
+            )
+        )
+        results["recompute_periods_in_range[all]"] = summarize(
+            time_call(
+                lambda: analysis_service.recompute_periods_in_range(
+                    user_id, ledger["start"], ledger["end"]
+                ),
+                max(1, repeat // 4),
+            )
+        )
+        results["aggregate_by_category"] = summarize(
+            time_call(
+                lambda: analysis_service.aggregate_by_category(month.id, user_id),
+                repeat,
+            )
+        )
+        results["get_transactions_page[first]"] = summarize(
+            time_call(
+                lambda: transaction_service.get_transactions_page(user_id, load="list"),
+                repeat,
+            )
+        )
+
+        account_id = (
+            Account.query.filter_by(owner_id=user_id).order_by(Account.id).first().id
+        )
+        results["get_transactions_page[account]"] = summarize(
+            time_call(
+                lambda: transaction_service.get_transactions_page(
+                    user_id, account_id=account_id, load="list"
+                ),
+                repeat,
+            )
+        )
+        results["get_transactions_page[q=amazon]"] = summarize(
+            time_call(
+                lambda: transaction_service.get_transactions_page(
+                    user_id, q="amazon", load="list"
+                ),
+                repeat,
+            )
+        )
+
+        account_ids = [
+            a.id for a in Account.query.filter_by(owner_id=user_id).order_by(Account.id)
+        ]
+        # Summed from the whole ledger, then from month-end snapshots
+        results["get_balances[no snapshots]"] = summarize(
+            time_call(lambda: account_service.get_balances(account_ids), repeat)
+        )
+        for account_id in account_ids:
+            account_service.snapshot_balances(account_id)
+        results["get_balances[snapshots]"] = summarize(
+            time_call(lambda: account_service.get_balances(account_ids), repeat)
+        )
+
+        client = app.test_client()
+        _login(client, user_id)
+        for name, url in (
+            ("GET /", "/"),
+            ("GET /transactions/", "/transactions/"),
+            ("GET /transactions/?q=amazon", "/transactions/?q=amazon"),
+            ("GET /accounts/", "/accounts/"),
+            ("GET /analysis/<id>/report", f"/analysis/{longest.id}/report"),
+        ):
+            client.get(url)  # warm caches and template compilation
+            results[name] = summarize(
+                time_call(lambda url=url: client.get(url), repeat)
+            )
+
+        import_user = User(
+            username="bench-import",
+            email="bench-import@example.com",
+            first_name="Bench",
+            last_name="Import",
+            password_hash="-",
+        )
+        db.session.add(import_user)
+        db.session.commit()
+        payload = csv_payload(import_rows)
+        results[f"import_csv[{import_rows} rows]"] = summarize(
+            time_call(
+                lambda: transaction_service.import_csv(
+                    io.StringIO(payload), import_user.id
+                ),
+                1,
+            ),
+            items=import_rows,
+        )
+    return results
+
+
+def run_password_benchmarks(methods: list[str], repeat: int) -> dict:
+    results = {}
+    for method in methods:
+        results[f"password_hash[{method}]"] = summarize(
+            time_call(
+                lambda method=method: generate_password_hash("benchmark", method),
+                repeat,
+            )
+        )
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print p50 changes; return the benchmarks that regressed beyond threshold."""
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        change = stats["p50_ms"] / base["p50_ms"] - 1 if base["p50_ms"] else 0
+        marker = "REGRESSION" if change > threshold else ""
+        print(
+            f"{name:40} {base['p50_ms']:>10.3f} -> {stats['p50_ms']:>10.3f} ms "
+            f"({change:+.1%}) {marker}"
+        )
+        if marker:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--years", type=int, default=2)
+    parser.add_argument("--txns-per-month", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--import-rows", type=int, default=20000)
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--hash-methods", nargs="*", default=list(HASH_METHODS))
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        users=args.users,
+        years=args.years,
+        txns_per_month=args.txns_per_month,
+        repeat=args.repeat,
+        import_rows=args.import_rows,
+    )
+    results.update(run_password_benchmarks(args.hash_methods, args.repeat))
+    print(json.dumps(results, indent=2))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,98 @@
 import os
+import tempfile
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 
 
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+def _env_names(name: str) -> set[str]:
+    """A comma-separated environment variable as a set of stripped names."""
+    return {n.strip() for n in os.environ.get(name, "").split(",") if n.strip()}
+
+
+# Applied to every new SQLite connection by app/database.py. WAL lets readers
+# run alongside the single writer, and busy_timeout makes a writer wait for
+# the lock instead of failing with "database is locked".
+SQLITE_TUNED_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000),
+    "mmap_size": _env_int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024),
+    "cache_size": -_env_int("SQLITE_CACHE_KIB", 64 * 1024),  # negative = KiB
+}
+
+
+def engine_options(database_uri: str | None) -> dict:
+    """SQLALCHEMY_ENGINE_OPTIONS tuned for the database behind database_uri.
+
+    Server databases get a connection pool sized from the environment
+    (DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE) with
+    pre-ping. SQLite tuning is done with SQLITE_PRAGMAS instead.
+    """
+    options = {"query_cache_size": _env_int("DB_QUERY_CACHE_SIZE", 1200)}
+    if database_uri and not database_uri.startswith("sqlite"):
+        options.update(
+            pool_size=_env_int("DB_POOL_SIZE", 5),
+            max_overflow=_env_int("DB_MAX_OVERFLOW", 10),
+            pool_timeout=_env_int("DB_POOL_TIMEOUT", 30),
+            pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+            pool_pre_ping=True,
+        )
+    return options
+
+
+def replica_binds() -> dict:
+    """SQLALCHEMY_BINDS with the read replica, when REPLICA_DATABASE_URL is set."""
+    url = os.environ.get("REPLICA_DATABASE_URL")
+    return {"replica": url} if url else {}
+
+
 class BaseConfig:
     SECRET_KEY = os.environ.get("SECRET_KEY", "dev-secret-key-change-me")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     REGISTRATION_ENABLED = True
+    # werkzeug hash method for passwords (see app/passwords.py); older hashes
+    # are upgraded at the next login
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt")
+    # Seconds before a cached category tree is re-checked (see category_service)
+    CATEGORY_CACHE_TTL = int(os.environ.get("CATEGORY_CACHE_TTL", 30))
+    # Signed-in users cached per process (see app/user_cache.py)
+    USER_CACHE_TTL = int(os.environ.get("USER_CACHE_TTL", 60))
+    USER_CACHE_MAX_ENTRIES = int(os.environ.get("USER_CACHE_MAX_ENTRIES", 1024))
+    # Uploads larger than this are rejected with 413 before reaching the view
+    MAX_CONTENT_LENGTH = int(os.environ.get("MAX_UPLOAD_BYTES", 16 * 1024 * 1024))
+    IMPORT_BATCH_SIZE = int(os.environ.get("IMPORT_BATCH_SIZE", 1000))
+    # Uploaded CSVs wait here until their background import finishes
+    IMPORT_SPOOL_DIR = os.environ.get(
+        "IMPORT_SPOOL_DIR", os.path.join(basedir, "spool")
+    )
+    # Failed imports can be retried this long before their spool file is deleted
+    IMPORT_RETRY_SECONDS = _env_int("IMPORT_RETRY_SECONDS", 7 * 24 * 3600)
+    # Per-request SQL statement counts and timings (see app/instrumentation.py)
+    SQL_METRICS_ENABLED = os.environ.get("SQL_METRICS_ENABLED", "0") == "1"
+    SQL_METRICS_SLOWEST = 5
+    # Usernames allowed to read /_debug/metrics; nobody else can see it
+    SQL_METRICS_USERS = _env_names("SQL_METRICS_USERS")
+    # PRAGMA name -> value run on each new SQLite connection (app/database.py)
+    SQLITE_PRAGMAS: dict = {}
+    # Background jobs (see app/jobs.py): "thread", "sqlite" or "sync"
+    JOBS_BACKEND = os.environ.get("JOBS_BACKEND", "thread")
+    JOBS_WORKERS = _env_int("JOBS_WORKERS", 2)
+    JOBS_DATABASE = os.environ.get("JOBS_DATABASE", os.path.join(basedir, "jobs.db"))
+    JOBS_POLL_SECONDS = 1.0
+    JOBS_STALE_SECONDS = _env_int("JOBS_STALE_SECONDS", 3600)
+    # Reads stay on the primary this long after a session's own write
+    REPLICA_READ_AFTER_WRITE_SECONDS = float(
+        os.environ.get("REPLICA_READ_AFTER_WRITE_SECONDS", 5)
+    )
+    # Dashboard cache (see app/cache.py): "memory", "redis" or "null"
+    CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+    CACHE_URL = os.environ.get("CACHE_URL", "redis://localhost:6379/0")
+    CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", 1024))
+    CACHE_TIMEOUT = int(os.environ.get("CACHE_TIMEOUT", 3600))
 
 
 class DevelopmentConfig(BaseConfig):
@@ -14,22 +100,42 @@ class DevelopmentConfig(BaseConfig):
     SQLALCHEMY_DATABASE_URI = os.environ.get(
         "DATABASE_URL", f"sqlite:///{os.path.join(basedir, 'budget.db')}"
     )
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_BINDS = replica_binds()
+    SQLITE_PRAGMAS = SQLITE_TUNED_PRAGMAS
 
 
 class TestingConfig(BaseConfig):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
     WTF_CSRF_ENABLED = False
+    JOBS_BACKEND = "sync"
+    # Cheap hashes keep the suite fast; never use this cost in production
+    PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"
+    IMPORT_SPOOL_DIR = os.path.join(tempfile.gettempdir(), "budget-test-spool")
+
+
+class BenchmarkConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = os.environ.get(
+        "BENCHMARK_DATABASE_URL",
+        f"sqlite:///{os.path.join(basedir, 'benchmark.db')}",
+    )
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    SQLITE_PRAGMAS = SQLITE_TUNED_PRAGMAS
 
 
 class ProductionConfig(BaseConfig):
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL")
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_BINDS = replica_binds()
+    SQLITE_PRAGMAS = SQLITE_TUNED_PRAGMAS
     REGISTRATION_ENABLED = False
 
 
 config = {
     "development": DevelopmentConfig,
     "testing": TestingConfig,
+    "benchmark": BenchmarkConfig,
     "production": ProductionConfig,
     "default": DevelopmentConfig,
 }
@@ -0,0 +1,64 @@
+"""account opening balances
+
+Revision ID: 33ed032dfd85
+Revises: 7d2fbfa4bb08
+Create Date: 2026-10-17 07:37:22.361644
+
+"""
+
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "33ed032dfd85"
+down_revision = "7d2fbfa4bb08"
+branch_labels = None
+depends_on = None
+
+accounts = sa.table(
+    "accounts",
+    sa.column("id", sa.Integer),
+    sa.column("balance", sa.Numeric(12, 2)),
+)
+transactions = sa.table(
+    "transactions",
+    sa.column("transaction_date", sa.Date),
+    sa.column("amount", sa.Numeric(12, 2)),
+    sa.column("debit_account_id", sa.Integer),
+    sa.column("credit_account_id", sa.Integer),
+)
+
+
+def _ledger_net():
+    """Credits minus debits of each account up to today, as a correlated subquery.
+
+    Balances are shown as of today, so later-dated transactions are left out.
+    """
+
+    def side(column):
+        return (
+            sa.select(sa.func.coalesce(sa.func.sum(transactions.c.amount), 0))
+            .where(
+                column == accounts.c.id,
+                transactions.c.transaction_date <= date.today(),
+            )
+            .scalar_subquery()
+        )
+
+    return side(transactions.c.credit_account_id) - side(
+        transactions.c.debit_account_id
+    )
+
+
+def upgrade():
+    # Account.balance was a manually kept current balance and now means the
+    # opening balance that the ledger is added to. Subtract each account's
+    # ledger net so the balance shown for it stays the same.
+    op.execute(accounts.update().values(balance=accounts.c.balance - _ledger_net()))
+
+
+def downgrade():
+    op.execute(accounts.update().values(balance=accounts.c.balance + _ledger_net()))
@@ -0,0 +1,45 @@
+"""transaction search
+
+Revision ID: bc05781a939d
+Revises: fa2139b77914
+Create Date: 2026-10-17 07:02:11.483920
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "bc05781a939d"
+down_revision = "fa2139b77914"
+branch_labels = None
+depends_on = None
+
+# Frozen copies of the DDL in app/search.py
+PG_DOCUMENT = (
+    "to_tsvector('simple', coalesce(payee, '') || ' ' || "
+    "coalesce(description, '') || ' ' || coalesce(notes, ''))"
+)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5("
+            "payee, description, notes, content='transactions', content_rowid='id')"
+        )
+        op.execute("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_transactions_search "
+            f"ON transactions USING gin ({PG_DOCUMENT})"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute("DROP TABLE IF EXISTS transactions_fts")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_transactions_search")
@@ -1,4 +1,5 @@
 import pytest
+from sqlalchemy import event
 
 from app import create_app
 from app.extensions import db as _db
@@ -20,6 +21,34 @@ def db(app):
     return _db
 
 
+class QueryCounter:
+    """Context manager recording every SQL statement sent to the engine."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+@pytest.fixture
+def count_queries(db):
+    """Factory for QueryCounter: ``with count_queries() as q: ...; q.count``."""
+    return lambda: QueryCounter(db.engine)
+
+
 @pytest.fixture
 def session(db):
     yield db.session
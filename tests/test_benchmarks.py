@@ -0,0 +1,54 @@
+"""Smoke tests keeping the benchmark harness runnable."""
+
+from datetime import date
+
+from app.models.budget import BudgetedExpense
+from app.models.enums import Frequency
+from app.models.expense_analysis import AnalysisPeriod, ExpenseAnalysis
+from app.services import transaction_service
+from benchmarks.datagen import csv_payload, generate_ledger
+from benchmarks.run import compare, run_password_benchmarks, summarize
+
+
+class TestDatagen:
+    def test_generate_small_ledger(self, session):
+        ledger = generate_ledger(
+            users=2, years=1, txns_per_month=5, end=date(2026, 12, 15)
+        )
+        assert ledger["transactions"] == 2 * 12 * 5
+        assert ledger["start"] == date(2026, 1, 1)
+        assert ledger["end"] == date(2026, 12, 31)
+        # 12 months + 4 quarters + 1 year
+        assert ledger["periods_per_user"] == 17
+        user_id = ledger["user_ids"][0]
+        assert AnalysisPeriod.query.filter_by(user_id=user_id).count() == 17
+        assert {b.frequency for b in BudgetedExpense.query} == {
+            f.value for f in Frequency
+        }
+        assert ExpenseAnalysis.query.filter_by(user_id=user_id).count() > 0
+
+    def test_csv_payload_imports_cleanly(self, session, user):
+        result = transaction_service.import_csv(csv_payload(50), user.id)
+        assert result["imported"] == 50
+        assert result["errors"] == []
+
+
+class TestReporting:
+    def test_summarize(self):
+        stats = summarize([0.001, 0.002, 0.003, 0.004], items=10)
+        assert stats["runs"] == 4
+        assert stats["min_ms"] == 1.0
+        assert stats["max_ms"] == 4.0
+        assert stats["mean_ms"] == 2.5
+        assert stats["per_sec"] == 4000.0
+
+    def test_compare_flags_regressions(self):
+        baseline = {"a": {"p50_ms": 10.0}, "b": {"p50_ms": 10.0}}
+        results = {"a": {"p50_ms": 11.0}, "b": {"p50_ms": 20.0}, "c": {"p50_ms": 1}}
+        assert compare(results, baseline, 0.25) == ["b"]
+
+    def test_password_benchmarks_report_hashes_per_second(self):
+        results = run_password_benchmarks(["pbkdf2:sha256:1000"], 3)
+        stats = results["password_hash[pbkdf2:sha256:1000]"]
+        assert stats["runs"] == 3
+        assert stats["per_sec"] > 0
@@ -0,0 +1,93 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app import cache
+from app.models.enums import TransactionType
+from app.services import analysis_service, transaction_service
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        lru = cache.LRUCache(max_entries=2)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        assert lru.get("a") == 1  # "b" is now least recently used
+        lru.set("c", 3)
+        assert lru.get("b") is None
+        assert lru.get("a") == 1
+        assert lru.get("c") == 3
+        assert len(lru) == 2
+
+    def test_versions_survive_eviction(self):
+        lru = cache.LRUCache(max_entries=1)
+        lru.bump("user:1")
+        lru.set("x", 1)
+        lru.set("y", 2)
+        assert lru.version("user:1") == 1
+
+    def test_null_cache_stores_nothing(self):
+        null = cache.NullCache()
+        null.set("a", 1)
+        assert null.get("a") is None
+        assert null.bump("user:1") == 1
+
+
+class TestRedisCache:
+    def test_round_trip(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        redis_cache = cache.RedisCache(fakeredis.FakeRedis())
+        redis_cache.set("k", {"amount": Decimal("1.50")})
+        assert redis_cache.get("k") == {"amount": Decimal("1.50")}
+        assert redis_cache.version("user:1") == 0
+        assert redis_cache.bump("user:1") == 1
+        redis_cache.clear()
+        assert redis_cache.get("k") is None
+
+
+class TestDataVersion:
+    def test_transaction_write_bumps_on_commit(self, app, session, user):
+        before = cache.data_version(user.id)
+        txn = transaction_service.create_transaction(
+            date(2026, 3, 1), "A", Decimal("1.00"), TransactionType.DEBIT, user.id
+        )
+        after_create = cache.data_version(user.id)
+        assert after_create > before
+        transaction_service.delete_transaction(txn.id)
+        assert cache.data_version(user.id) > after_create
+
+    def test_bulk_import_and_recompute_bump(self, app, session, user):
+        before = cache.data_version(user.id)
+        transaction_service.import_csv(
+            "date,payee,amount,type\n2026-03-01,A,1.00,debit\n", user.id
+        )
+        after_import = cache.data_version(user.id)
+        assert after_import > before
+        analysis_service.create_period(
+            "Mar", date(2026, 3, 1), date(2026, 3, 31), user.id
+        )
+        after_period = cache.data_version(user.id)
+        assert after_period > after_import
+        analysis_service.recompute_periods_in_range(
+            user.id, date(2026, 3, 1), date(2026, 3, 31)
+        )
+        assert cache.data_version(user.id) > after_period
+
+    def test_rollback_discards_pending_bump(self, app, session, user):
+        from app.models.transaction import Transaction
+
+        before = cache.data_version(user.id)
+        session.add(
+            Transaction(
+                transaction_date=date(2026, 3, 1),
+                payee="A",
+                amount=Decimal("1.00"),
+                transaction_type="debit",
+                user_id=user.id,
+            )
+        )
+        session.flush()
+        session.rollback()
+        session.commit()
+        assert cache.data_version(user.id) == before
@@ -0,0 +1,137 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+
+from app import create_app
+from app.extensions import db as _db
+from app.models.enums import TransactionType
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services import transaction_service
+from config import SQLITE_TUNED_PRAGMAS, engine_options
+
+
+@pytest.fixture
+def tuned_app(monkeypatch, tmp_path):
+    from config import TestingConfig
+
+    monkeypatch.setattr(
+        TestingConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 't.db'}"
+    )
+    monkeypatch.setattr(TestingConfig, "SQLITE_PRAGMAS", SQLITE_TUNED_PRAGMAS)
+    app = create_app("testing")
+    with app.app_context():
+        yield app
+        _db.engine.dispose()
+
+
+def _pragma(name):
+    return _db.session.execute(text(f"PRAGMA {name}")).scalar()
+
+
+class TestSQLitePragmas:
+    def test_applied_to_new_connections(self, tuned_app):
+        assert _pragma("journal_mode") == "wal"
+        assert _pragma("synchronous") == 1  # NORMAL
+        assert _pragma("busy_timeout") == SQLITE_TUNED_PRAGMAS["busy_timeout"]
+        assert _pragma("cache_size") == SQLITE_TUNED_PRAGMAS["cache_size"]
+
+    def test_testing_config_leaves_defaults(self, app):
+        assert app.config["SQLITE_PRAGMAS"] == {}
+
+
+class TestEngineOptions:
+    def test_sqlite_has_no_pool_sizing(self):
+        options = engine_options("sqlite:///budget.db")
+        assert "pool_size" not in options
+        assert options["query_cache_size"] > 0
+
+    def test_server_pool_from_environment(self, monkeypatch):
+        monkeypatch.setenv("DB_POOL_SIZE", "12")
+        monkeypatch.setenv("DB_MAX_OVERFLOW", "4")
+        options = engine_options("postgresql://db/budget")
+        assert options["pool_size"] == 12
+        assert options["max_overflow"] == 4
+        assert options["pool_pre_ping"] is True
+        assert options["pool_recycle"] == 1800
+
+
+@pytest.fixture
+def replica_app(monkeypatch, tmp_path):
+    from config import TestingConfig
+
+    monkeypatch.setattr(
+        TestingConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'p.db'}"
+    )
+    monkeypatch.setattr(
+        TestingConfig,
+        "SQLALCHEMY_BINDS",
+        {"replica": f"sqlite:///{tmp_path / 'r.db'}"},
+        raising=False,
+    )
+    app = create_app("testing")
+    with app.app_context():
+        _db.create_all()
+        _db.metadata.create_all(_db.engines["replica"])
+        user = User(username="r", email="r@test.com", first_name="R", last_name="U")
+        user.set_password("password123")
+        _db.session.add(user)
+        _db.session.commit()
+        yield app
+        _db.session.remove()
+        for engine in _db.engines.values():
+            engine.dispose()
+    # Flask-SQLAlchemy registers a metadata per bind key on the shared db
+    _db.metadatas.pop("replica", None)
+
+
+def _add_txn(user_id):
+    return transaction_service.create_transaction(
+        date(2026, 1, 5), "Store", Decimal("10.00"), TransactionType.DEBIT, user_id
+    )
+
+
+class TestReadReplicaRouting:
+    """The replica file is never written, so reads that reach it see no rows."""
+
+    def test_decorated_reads_use_replica(self, replica_app):
+        user_id = User.query.one().id
+        _add_txn(user_id)
+        assert transaction_service.count_transactions_for_user(user_id) == 0
+        # Undecorated reads stay on the primary
+        assert transaction_service.get_transaction_for_user(1, user_id) is not None
+
+    def test_uncommitted_writes_keep_reads_on_primary(self, replica_app):
+        user = User.query.one()
+        _db.session.add(
+            Transaction(
+                transaction_date=date(2026, 1, 5),
+                payee="Pending",
+                amount=Decimal("1.00"),
+                transaction_type=TransactionType.DEBIT.value,
+                user_id=user.id,
+            )
+        )
+        _db.session.flush()
+        assert transaction_service.count_transactions_for_user(user.id) == 1
+        _db.session.rollback()
+        assert transaction_service.count_transactions_for_user(user.id) == 0
+
+    def test_read_your_writes_window(self, replica_app, monkeypatch):
+        client = replica_app.test_client()
+        client.post("/auth/login", data={"username": "r", "password": "password123"})
+        client.post(
+            "/transactions/create",
+            data={
+                "transaction_date": "2026-01-05",
+                "payee": "Store",
+                "amount": "10.00",
+                "transaction_type": "debit",
+            },
+        )
+        assert b"Store" in client.get("/transactions/").data
+
+        monkeypatch.setitem(replica_app.config, "REPLICA_READ_AFTER_WRITE_SECONDS", 0)
+        assert b"Store" not in client.get("/transactions/").data
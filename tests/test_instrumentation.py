@@ -0,0 +1,94 @@
+import json
+import logging
+
+import pytest
+
+from app import create_app
+from app.extensions import db as _db
+from app.instrumentation import get_metrics
+from app.models.user import User
+
+
+@pytest.fixture
+def metrics_app(monkeypatch):
+    from config import TestingConfig
+
+    monkeypatch.setattr(TestingConfig, "SQL_METRICS_ENABLED", True)
+    monkeypatch.setattr(TestingConfig, "SQL_METRICS_USERS", {"metrics"})
+    app = create_app("testing")
+    with app.app_context():
+        _db.create_all()
+        u = User(username="metrics", email="m@test.com", first_name="M", last_name="U")
+        u.set_password("password123")
+        _db.session.add(u)
+        _db.session.commit()
+        yield app
+        _db.session.rollback()
+        _db.drop_all()
+
+
+@pytest.fixture
+def metrics_client(metrics_app):
+    client = metrics_app.test_client()
+    client.post("/auth/login", data={"username": "metrics", "password": "password123"})
+    return client
+
+
+class TestInstrumentationDisabled:
+    def test_no_metrics_by_default(self, app, logged_in_client):
+        resp = logged_in_client.get("/transactions/")
+        assert "Server-Timing" not in resp.headers
+        assert get_metrics() is None
+        assert logged_in_client.get("/_debug/metrics").status_code == 404
+
+
+class TestInstrumentationEnabled:
+    def test_server_timing_header(self, metrics_client):
+        resp = metrics_client.get("/transactions/")
+        assert resp.headers["Server-Timing"].startswith("db;dur=")
+        assert "queries" in resp.headers["Server-Timing"]
+
+    def test_endpoint_totals(self, metrics_client):
+        get_metrics().reset()
+        metrics_client.get("/transactions/")
+        metrics_client.get("/transactions/")
+        stats = metrics_client.get("/_debug/metrics").get_json()
+        txns = stats["transactions.list_transactions"]
+        assert txns["requests"] == 2
+        assert txns["avg_statements"] > 0
+        assert txns["max_statements"] >= txns["avg_statements"]
+        assert 0 < len(txns["slowest"]) <= 5
+        assert "SELECT" in txns["slowest"][0]["sql"]
+
+    def test_structured_log_line(self, metrics_client, caplog):
+        with caplog.at_level(logging.INFO):
+            metrics_client.get("/accounts/")
+        lines = [
+            json.loads(r.getMessage())
+            for r in caplog.records
+            if "request_metrics" in r.getMessage()
+        ]
+        assert lines[-1]["endpoint"] == "accounts.list_accounts"
+        assert lines[-1]["status"] == 200
+        assert lines[-1]["statements"] >= 1
+
+    def test_metrics_endpoint_requires_login(self, metrics_app):
+        resp = metrics_app.test_client().get("/_debug/metrics")
+        assert resp.status_code == 302
+
+    def test_metrics_endpoint_hidden_from_other_users(self, metrics_app):
+        u = User(username="other", email="o@test.com", first_name="O", last_name="U")
+        u.set_password("password123")
+        _db.session.add(u)
+        _db.session.commit()
+        client = metrics_app.test_client()
+        client.post(
+            "/auth/login", data={"username": "other", "password": "password123"}
+        )
+        assert client.get("/_debug/metrics").status_code == 404
+
+    def test_allow_list_ignores_spaces(self, monkeypatch):
+        from config import _env_names
+
+        monkeypatch.setenv("SQL_METRICS_USERS", "alice, bob ,,")
+        assert _env_names("SQL_METRICS_USERS") == {"alice", "bob"}
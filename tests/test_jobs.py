@@ -0,0 +1,180 @@
+import io
+import threading
+from datetime import date
+
+import pytest
+
+from app import create_app, jobs
+from app.extensions import db as _db
+from app.models.user import User
+from app.services import analysis_service
+
+calls = []
+release = threading.Event()
+
+
+@jobs.task("test_record", merge=jobs.merge_date_range)
+def _record_task(min_date, max_date, user_id=None, block=False):
+    if block:
+        release.wait(5)
+    calls.append((user_id, min_date, max_date))
+
+
+@jobs.task("test_fail")
+def _fail_task(user_id=None):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    calls.clear()
+    release.clear()
+    yield
+    release.set()
+
+
+def _record(queue, min_date, max_date, block=False, key="k"):
+    return queue.enqueue(
+        "test_record",
+        key=key,
+        user_id=1,
+        min_date=min_date,
+        max_date=max_date,
+        block=block,
+    )
+
+
+class TestThreadQueue:
+    def test_pending_jobs_coalesce(self, app):
+        queue = jobs.ThreadQueue(app, workers=2)
+        running = _record(queue, "2026-01-01", "2026-01-31", block=True)
+        first = _record(queue, "2026-03-01", "2026-03-31")
+        second = _record(queue, "2026-02-10", "2026-02-20")
+        assert first["id"] == second["id"] != running["id"]
+        assert second["kwargs"]["min_date"] == "2026-02-10"
+        assert second["kwargs"]["max_date"] == "2026-03-31"
+
+        release.set()
+        queue._executor.shutdown(wait=True)
+        # The same user's jobs ran one after the other, merged job second
+        assert calls == [
+            (1, "2026-01-01", "2026-01-31"),
+            (1, "2026-02-10", "2026-03-31"),
+        ]
+        assert queue.get(first["id"])["status"] == "done"
+        assert queue.active_for_user(1) == []
+
+    def test_failure_is_recorded(self, app):
+        queue = jobs.ThreadQueue(app, workers=1)
+        job = queue.enqueue("test_fail", key="f", user_id=1)
+        queue._executor.shutdown(wait=True)
+        job = queue.get(job["id"])
+        assert job["status"] == "failed"
+        assert job["error"] == "RuntimeError: boom"
+
+
+class TestSQLiteQueue:
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / "jobs.db")
+
+    def test_coalesces_and_survives_restart(self, app, path):
+        queue = jobs.SQLiteQueue(app, path, workers=0)
+        a = _record(queue, "2026-01-05", "2026-01-10")
+        b = _record(queue, "2026-01-01", "2026-01-07")
+        assert a["id"] == b["id"]
+        assert [j["id"] for j in queue.active_for_user(1)] == [a["id"]]
+
+        restarted = jobs.SQLiteQueue(app, path, workers=0)
+        assert restarted.run_pending() == 1
+        assert calls == [(1, "2026-01-01", "2026-01-10")]
+        assert restarted.get(a["id"])["status"] == "done"
+        assert queue.active_for_user(1) == []
+
+    def test_running_user_is_not_claimed_twice(self, app, path):
+        queue = jobs.SQLiteQueue(app, path, workers=0)
+        _record(queue, "2026-01-01", "2026-01-02", key="a")
+        _record(queue, "2026-02-01", "2026-02-02", key="b")
+        claimed = queue.claim()
+        assert claimed["status"] == "queued"  # row as read before the update
+        assert queue.claim() is None
+
+    def test_stale_running_job_is_retried(self, app, path):
+        queue = jobs.SQLiteQueue(app, path, workers=0, stale_seconds=0)
+        job = _record(queue, "2026-01-01", "2026-01-02")
+        assert queue.claim()["id"] == job["id"]
+        assert queue.run_pending() == 1
+        assert queue.get(job["id"])["status"] == "done"
+
+
+@pytest.fixture
+def queued_app(monkeypatch, tmp_path):
+    from config import TestingConfig
+
+    monkeypatch.setattr(TestingConfig, "JOBS_BACKEND", "sqlite")
+    monkeypatch.setattr(TestingConfig, "JOBS_WORKERS", 0, raising=False)
+    monkeypatch.setattr(
+        TestingConfig, "JOBS_DATABASE", str(tmp_path / "jobs.db"), raising=False
+    )
+    app = create_app("testing")
+    with app.app_context():
+        _db.create_all()
+        for name in ("owner", "other"):
+            user = User(
+                username=name, email=f"{name}@test.com", first_name="J", last_name="B"
+            )
+            user.set_password("password123")
+            _db.session.add(user)
+        _db.session.commit()
+        yield app
+        _db.session.rollback()
+        _db.drop_all()
+
+
+def _login(app, username):
+    client = app.test_client()
+    client.post("/auth/login", data={"username": username, "password": "password123"})
+    return client
+
+
+class TestRecomputeJobs:
+    def test_import_returns_before_import_and_recompute(self, queued_app):
+        client = _login(queued_app, "owner")
+        owner = User.query.filter_by(username="owner").one()
+        analysis_service.create_period(
+            "Jan", date(2026, 1, 1), date(2026, 1, 31), owner.id
+        )
+        resp = client.post(
+            "/transactions/import",
+            data={
+                "csv_file": (
+                    io.BytesIO(b"date,payee,amount,type\n2026-01-05,A,5.00,debit\n"),
+                    "t.csv",
+                ),
+                "account_id": "",
+            },
+            content_type="multipart/form-data",
+            follow_redirects=True,
+        )
+        assert b"Importing t.csv" in resp.data
+        assert b"Recomputing analysis" in client.get("/").data
+
+        (job,) = jobs.active_for_user(owner.id)
+        assert job["name"] == "import_csv"
+        assert client.get(f"/jobs/{job['id']}").get_json()["status"] == "queued"
+
+        # The import, then the recompute and balance snapshots it queued
+        assert jobs.get_queue().run_pending() == 3
+        assert client.get(f"/jobs/{job['id']}").get_json()["status"] == "done"
+        assert not jobs.active_for_user(owner.id)
+        assert (
+            b"recomputing in the background"
+            in client.get(f"/transactions/import/{job['kwargs']['import_id']}").data
+        )
+        assert b"Recomputing analysis" not in client.get("/").data
+
+    def test_status_is_private_to_owner(self, queued_app):
+        owner = User.query.filter_by(username="owner").one()
+        job = analysis_service.enqueue_recompute_period(1, owner.id)
+        client = _login(queued_app, "other")
+        assert client.get(f"/jobs/{job['id']}").status_code == 404
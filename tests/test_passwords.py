@@ -0,0 +1,42 @@
+from werkzeug.security import generate_password_hash
+
+from app import passwords
+from app.models.user import User
+
+
+class TestPolicy:
+    def test_hash_uses_configured_method(self, app):
+        pwhash = passwords.hash_password("secret")
+        assert pwhash.startswith("pbkdf2:sha256:1000$")
+        assert passwords.verify_password(pwhash, "secret")
+
+    def test_needs_rehash_compares_full_parameters(self, app):
+        assert not passwords.needs_rehash(passwords.hash_password("secret"))
+        assert passwords.needs_rehash(
+            generate_password_hash("secret", "pbkdf2:sha256:2000")
+        )
+        app.config["PASSWORD_HASH_METHOD"] = "pbkdf2"
+        # The bare name stands for werkzeug's default iterations
+        assert not passwords.needs_rehash(generate_password_hash("secret", "pbkdf2"))
+
+
+class TestRehashOnLogin:
+    def test_check_password_upgrades_old_hash(self, session, user):
+        old = generate_password_hash("password123", "pbkdf2:sha256:2000")
+        user.password_hash = old
+        assert not user.check_password("wrong")
+        assert user.password_hash == old
+        assert user.check_password("password123")
+        assert user.password_hash.startswith("pbkdf2:sha256:1000$")
+
+    def test_login_saves_upgraded_hash(self, client, session, user):
+        user.password_hash = generate_password_hash("password123", "pbkdf2:sha256:2000")
+        session.commit()
+        resp = client.post(
+            "/auth/login",
+            data={"username": "testuser", "password": "password123"},
+        )
+        assert resp.status_code == 302
+        session.expire_all()
+        stored = session.get(User, user.id).password_hash
+        assert stored.startswith("pbkdf2:sha256:1000$")
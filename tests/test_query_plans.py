@@ -0,0 +1,159 @@
+"""EXPLAIN QUERY PLAN checks that the hot service queries use their indexes.
+
+Each test captures the SELECTs a service call actually issues and asserts on
+SQLite's plan for them, so a change to a query shape or an index that loses
+the index-only / range scan fails here rather than in production.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app import conditional
+from app.models.account import Account
+from app.models.category import Category
+from app.models.enums import AccountType, Frequency, TransactionType, Variability
+from app.models.transaction import Transaction
+from app.models.vendor import Vendor
+from app.services import analysis_service, budget_service, transaction_service
+
+
+@pytest.fixture
+def plans(db):
+    """plans(fn) runs fn and returns (sql, plan details) for each SELECT it ran."""
+
+    def run(fn):
+        captured = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                captured.append((statement, parameters))
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            fn()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+        conn = db.session.connection()
+        return [
+            (
+                sql,
+                " | ".join(
+                    row[3]
+                    for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params)
+                ),
+            )
+            for sql, params in captured
+        ]
+
+    return run
+
+
+def _plan_for(captured, fragment):
+    (plan,) = [plan for sql, plan in captured if fragment in sql]
+    return plan
+
+
+@pytest.fixture
+def account(session, user):
+    vendor = Vendor(name="Bank", short_name="Bank")
+    session.add(vendor)
+    session.flush()
+    acct = Account(
+        name="Checking",
+        vendor_id=vendor.id,
+        owner_id=user.id,
+        account_type=AccountType.CHECKING.value,
+    )
+    session.add(acct)
+    session.commit()
+    return acct
+
+
+@pytest.fixture
+def ledger(session, user, account):
+    for day in range(1, 29):
+        transaction_service.create_transaction(
+            date(2026, 1, day),
+            f"Payee {day}",
+            Decimal("10.00"),
+            TransactionType.DEBIT,
+            user.id,
+            debit_account_id=account.id,
+        )
+
+
+class TestTransactionPlans:
+    def test_actuals_are_index_only(self, plans, user, ledger):
+        period = analysis_service.create_period(
+            "Mid", date(2026, 1, 10), date(2026, 2, 20), user.id
+        )
+        captured = plans(
+            lambda: analysis_service.recompute_analysis(period.id, user.id)
+        )
+        plan = _plan_for(captured, "sum(transactions.amount)")
+        assert "COVERING INDEX ix_transactions_user_id_type_date_category" in plan
+
+    def test_list_page_walks_date_index_in_order(self, plans, user, ledger):
+        captured = plans(
+            lambda: transaction_service.get_transactions_page(user.id, per_page=5)
+        )
+        plan = _plan_for(captured, "LIMIT")
+        assert "USING INDEX ix_transactions_user_id_transaction_date" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_account_filter_seeks_both_account_indexes(
+        self, plans, user, account, ledger
+    ):
+        captured = plans(
+            lambda: transaction_service.get_transactions_page(
+                user.id, account_id=account.id, per_page=5
+            )
+        )
+        plan = _plan_for(captured, "LIMIT")
+        for side in ("debit", "credit"):
+            assert (
+                f"COVERING INDEX ix_transactions_{side}_account_id_transaction_date"
+                in plan
+            )
+        assert "SCAN transactions" not in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_conditional_validators_are_index_only(self, app, plans, user, ledger):
+        with app.test_request_context():
+            captured = plans(
+                lambda: conditional.validators(
+                    conditional.table_state(Transaction, Transaction.user_id == user.id)
+                )
+            )
+        plan = _plan_for(captured, "max(transactions.updated_at)")
+        assert "COVERING INDEX ix_transactions_user_id_updated_at" in plan
+        assert plan.count("USING COVERING INDEX") == 2
+
+
+class TestBudgetPlans:
+    def test_budgeted_totals_are_index_only(self, session, plans, user):
+        category = Category(name="Food")
+        session.add(category)
+        session.flush()
+        budget_service.create_budget_item(
+            payee="Groceries",
+            variability=Variability.VARIABLE,
+            frequency=Frequency.MONTHLY,
+            date_scheduled=date(2026, 1, 1),
+            budgeted_amount=Decimal("100.00"),
+            user_id=user.id,
+            category_id=category.id,
+        )
+        captured = plans(
+            lambda: budget_service.budgeted_totals(
+                user.id, {"jan": (date(2026, 1, 1), date(2026, 1, 31))}
+            )
+        )
+        plan = _plan_for(captured, "budgeted_expenses")
+        assert (
+            "COVERING INDEX ix_budgeted_expenses_user_id_is_active_date_scheduled"
+            in plan
+        )
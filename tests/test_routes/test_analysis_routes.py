@@ -46,6 +46,28 @@ class TestCreatePeriod:
         assert b"Analysis period created" in resp.data
         assert b"March 2026" in resp.data
 
+    def test_post_computes_existing_spending(self, logged_in_client, user, categories):
+        transaction_service.create_transaction(
+            date(2026, 3, 5),
+            "Store",
+            Decimal("42.00"),
+            TransactionType.DEBIT,
+            user.id,
+            category_id=categories["food"].id,
+        )
+        logged_in_client.post(
+            "/analysis/create",
+            data={
+                "name": "March 2026",
+                "start_date": "2026-03-01",
+                "end_date": "2026-03-31",
+            },
+        )
+        (period,) = analysis_service.get_periods_for_user(user.id)
+        assert period.computed_at is not None
+        resp = logged_in_client.get(f"/analysis/{period.id}/report")
+        assert b"42.00" in resp.data
+
     @pytest.mark.parametrize(
         "data,error_fragment",
         [
@@ -188,7 +210,7 @@ class TestRecomputePeriod:
             follow_redirects=True,
         )
         assert resp.status_code == 200
-        assert b"recomputed" in resp.data
+        assert b"recomputing" in resp.data
 
     def test_recompute_nonexistent(self, logged_in_client):
         resp = logged_in_client.post("/analysis/9999/recompute", follow_redirects=True)
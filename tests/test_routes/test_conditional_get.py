@@ -0,0 +1,91 @@
+"""ETag / Last-Modified handling on the heavy read pages."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.models.enums import TransactionType
+from app.services import analysis_service, transaction_service
+
+
+@pytest.fixture
+def txn(session, user):
+    return transaction_service.create_transaction(
+        date(2026, 1, 5), "Store", Decimal("10.00"), TransactionType.DEBIT, user.id
+    )
+
+
+@pytest.fixture
+def period(session, user):
+    return analysis_service.create_period(
+        "Jan 2026", date(2026, 1, 1), date(2026, 1, 31), user.id
+    )
+
+
+def _revalidate(client, url, first):
+    return client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+
+
+class TestConditionalGet:
+    @pytest.mark.parametrize(
+        "url", ["/transactions/", "/", "/analysis/{period}/report"]
+    )
+    def test_unchanged_page_is_304(self, logged_in_client, txn, period, url):
+        url = url.format(period=period.id)
+        first = logged_in_client.get(url)
+        assert first.status_code == 200
+        assert first.headers["ETag"].startswith('W/"')
+        assert "Last-Modified" in first.headers
+        assert "no-cache" in first.headers["Cache-Control"]
+        assert "private" in first.headers["Cache-Control"]
+
+        second = _revalidate(logged_in_client, url, first)
+        assert second.status_code == 304
+        assert second.data == b""
+        assert second.headers["ETag"] == first.headers["ETag"]
+
+    def test_if_modified_since(self, logged_in_client, txn):
+        first = logged_in_client.get("/transactions/")
+        resp = logged_in_client.get(
+            "/transactions/",
+            headers={"If-Modified-Since": first.headers["Last-Modified"]},
+        )
+        assert resp.status_code == 304
+
+    def test_create_and_delete_change_etag(self, logged_in_client, user, txn):
+        first = logged_in_client.get("/transactions/")
+        other = transaction_service.create_transaction(
+            date(2026, 1, 6), "Cafe", Decimal("4.00"), TransactionType.DEBIT, user.id
+        )
+        after_create = _revalidate(logged_in_client, "/transactions/", first)
+        assert after_create.status_code == 200
+        assert b"Cafe" in after_create.data
+
+        transaction_service.delete_transaction(other.id)
+        after_delete = _revalidate(logged_in_client, "/transactions/", after_create)
+        assert after_delete.status_code == 200
+        assert b"Cafe" not in after_delete.data
+
+    def test_pending_flash_forces_full_page(self, logged_in_client, txn):
+        first = logged_in_client.get("/transactions/")
+        logged_in_client.post("/transactions/999/delete")
+        resp = _revalidate(logged_in_client, "/transactions/", first)
+        assert resp.status_code == 200
+        assert b"Transaction not found." in resp.data
+
+    def test_report_follows_period_not_raw_transactions(
+        self, logged_in_client, user, period
+    ):
+        url = f"/analysis/{period.id}/report"
+        first = logged_in_client.get(url)
+        # The report renders stored analysis rows, not transactions
+        transaction_service.create_transaction(
+            date(2026, 1, 9), "Store", Decimal("10.00"), TransactionType.DEBIT, user.id
+        )
+        assert _revalidate(logged_in_client, url, first).status_code == 304
+
+        analysis_service.update_period(period.id, name="January")
+        resp = _revalidate(logged_in_client, url, first)
+        assert resp.status_code == 200
+        assert b"January" in resp.data
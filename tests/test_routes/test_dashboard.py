@@ -2,8 +2,10 @@ from datetime import date, timedelta
 from decimal import Decimal
 
 import pytest
+from sqlalchemy import insert
 
 from app.models.category import Category
+from app.models.transaction import Transaction
 from app.models.enums import TransactionType, Variability, Frequency
 from app.services import analysis_service, budget_service, transaction_service
 
@@ -121,3 +123,52 @@ class TestDashboardContent:
     ):
         resp = logged_in_client.get("/")
         assert b"No analysis data" in resp.data
+
+
+class TestDashboardCache:
+    def test_repeat_view_skips_dashboard_queries(
+        self, logged_in_client, current_period, count_queries
+    ):
+        with count_queries() as first:
+            logged_in_client.get("/")
+        with count_queries() as repeat:
+            resp = logged_in_client.get("/")
+        assert resp.status_code == 200
+        assert current_period.name.encode() in resp.data
+        assert first.count > 0
+        # Only the conditional GET validator runs; the test session already
+        # holds the user and the page context comes from the cache
+        assert repeat.count == 1
+
+    def test_write_invalidates_cached_view(
+        self, logged_in_client, user, categories, current_period
+    ):
+        assert b"Corner Store" not in logged_in_client.get("/").data
+        transaction_service.create_transaction(
+            TODAY,
+            "Corner Store",
+            Decimal("12.00"),
+            TransactionType.DEBIT,
+            user.id,
+            category_id=categories["food"].id,
+            subcategory_id=categories["groceries"].id,
+        )
+        assert b"Corner Store" in logged_in_client.get("/").data
+
+    def test_write_without_version_bump_invalidates_cached_view(
+        self, logged_in_client, session, user, current_period
+    ):
+        # A Core insert bypasses the mapper, so this process's data version
+        # stays put, as it would for a write committed by another worker
+        assert b"Corner Store" not in logged_in_client.get("/").data
+        session.execute(
+            insert(Transaction).values(
+                transaction_date=TODAY,
+                payee="Corner Store",
+                amount=Decimal("12.00"),
+                transaction_type=TransactionType.DEBIT.value,
+                user_id=user.id,
+            )
+        )
+        session.commit()
+        assert b"Corner Store" in logged_in_client.get("/").data
@@ -0,0 +1,106 @@
+"""Route-level tests for the streaming CSV upload path."""
+
+import io
+
+from app.models.import_job import ImportJob
+from app.models.user import User
+from app.services import transaction_service
+
+
+def _upload(client, payload: bytes):
+    data = {"csv_file": (io.BytesIO(payload), "test.csv"), "account_id": ""}
+    return client.post(
+        "/transactions/import",
+        data=data,
+        content_type="multipart/form-data",
+        follow_redirects=True,
+    )
+
+
+def _fail_parse(row, *args):
+    raise RuntimeError("db down")
+
+
+class TestStreamingImport:
+    def test_imports_across_batches(self, app, logged_in_client, user):
+        app.config["IMPORT_BATCH_SIZE"] = 7
+        rows = "".join(f"2026-02-{d % 28 + 1:02d},P{d},1.00,debit\n" for d in range(50))
+        resp = _upload(logged_in_client, f"date,payee,amount,type\n{rows}".encode())
+        assert resp.status_code == 200
+        assert b"Imported 50 transactions" in resp.data
+        assert transaction_service.count_transactions_for_user(user.id) == 50
+
+    def test_utf8_bom_header_is_accepted(self, logged_in_client, user):
+        payload = "\ufeffdate,payee,amount,type\n2026-02-01,Café,5.00,debit\n"
+        resp = _upload(logged_in_client, payload.encode("utf-8"))
+        assert b"Imported 1 transactions" in resp.data
+        txn = transaction_service.get_transactions_for_user(user.id)[0]
+        assert txn.payee == "Café"
+
+    def test_invalid_utf8_is_reported(self, logged_in_client, user):
+        payload = b"date,payee,amount,type\n2026-02-01,\xff\xfe,5.00,debit\n"
+        resp = _upload(logged_in_client, payload)
+        assert resp.status_code == 200
+        assert b"not valid UTF-8" in resp.data
+
+    def test_upload_over_limit_rejected(self, app, logged_in_client):
+        app.config["MAX_CONTENT_LENGTH"] = 256
+        payload = b"date,payee,amount,type\n" + b"2026-02-01,X,1.00,debit\n" * 50
+        resp = _upload(logged_in_client, payload)
+        assert resp.status_code == 413
+        assert b"too large" in resp.data
+
+
+class TestImportProgress:
+    def test_upload_redirects_to_status_page(self, logged_in_client):
+        data = {
+            "csv_file": (io.BytesIO(b"date,payee,amount,type\n"), "bank.csv"),
+            "account_id": "",
+        }
+        resp = logged_in_client.post(
+            "/transactions/import", data=data, content_type="multipart/form-data"
+        )
+        assert resp.status_code == 302
+        assert "/transactions/import/" in resp.headers["Location"]
+
+    def test_progress_json(self, logged_in_client, user):
+        _upload(logged_in_client, b"date,payee,amount,type\n2026-02-01,A,1.00,debit\n")
+        job = ImportJob.query.filter_by(user_id=user.id).one()
+        progress = logged_in_client.get(
+            f"/transactions/import/{job.id}/progress"
+        ).get_json()
+        assert progress["status"] == "done"
+        assert progress["percent"] == 100.0
+        assert progress["imported"] == 1
+
+    def test_other_users_import_is_hidden(self, logged_in_client, session):
+        other = User(
+            username="other", email="o@test.com", first_name="O", last_name="U"
+        )
+        other.set_password("password123")
+        session.add(other)
+        session.flush()
+        job = ImportJob(user_id=other.id, filename="x.csv", spool_path="/x")
+        session.add(job)
+        session.commit()
+        assert logged_in_client.get(f"/transactions/import/{job.id}").status_code == 404
+        assert (
+            logged_in_client.get(f"/transactions/import/{job.id}/progress").status_code
+            == 404
+        )
+
+    def test_failed_import_offers_retry(self, logged_in_client, user, monkeypatch):
+        parse = transaction_service._parse_csv_row
+        monkeypatch.setattr(transaction_service, "_parse_csv_row", _fail_parse)
+        resp = _upload(
+            logged_in_client, b"date,payee,amount,type\n2026-02-01,A,1,debit\n"
+        )
+        assert b"Retry import" in resp.data
+
+        monkeypatch.setattr(transaction_service, "_parse_csv_row", parse)
+        job = ImportJob.query.filter_by(user_id=user.id).one()
+        resp = logged_in_client.post(
+            f"/transactions/import/{job.id}/retry", follow_redirects=True
+        )
+        assert b"Imported 1 transactions" in resp.data
+        assert b"Retry import" not in resp.data
@@ -0,0 +1,99 @@
+"""List pages must issue a fixed number of queries regardless of row count."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.models.category import Category
+from app.models.enums import AccountType, Frequency, TransactionType, Variability
+from app.models.vendor import Vendor
+from app.services import account_service, budget_service, transaction_service
+
+
+@pytest.fixture
+def categories(session):
+    food = Category(name="Food")
+    session.add(food)
+    session.flush()
+    subs = [Category(name=f"Sub{i}", parent_id=food.id) for i in range(6)]
+    session.add_all(subs)
+    session.commit()
+    return food, subs
+
+
+@pytest.fixture
+def vendors(session):
+    vs = [Vendor(name=f"Bank{i}", short_name=f"B{i}") for i in range(6)]
+    session.add_all(vs)
+    session.commit()
+    return vs
+
+
+def _add_transactions(user, categories, n, offset=0):
+    food, subs = categories
+    for i in range(offset, offset + n):
+        transaction_service.create_transaction(
+            date(2026, 2, 1 + i),
+            f"Payee{i}",
+            Decimal("10.00"),
+            TransactionType.DEBIT,
+            user.id,
+            category_id=food.id,
+            subcategory_id=subs[i].id,
+        )
+
+
+def _add_budgets(user, categories, n, offset=0):
+    food, subs = categories
+    for i in range(offset, offset + n):
+        budget_service.create_budget_item(
+            f"Budget{i}",
+            Variability.FIXED,
+            Frequency.MONTHLY,
+            date(2026, 2, 1),
+            Decimal("10.00"),
+            user.id,
+            food.id,
+            subcategory_id=subs[i].id,
+        )
+
+
+def _add_accounts(user, vendors, n, offset=0):
+    for i in range(offset, offset + n):
+        account_service.create_account(
+            f"Acct{i}", vendors[i].id, AccountType.CHECKING, user.id
+        )
+
+
+def _queries_for(client, count_queries, url, session):
+    session.expire_all()
+    with count_queries() as queries:
+        resp = client.get(url)
+    assert resp.status_code == 200
+    return queries.count
+
+
+@pytest.mark.parametrize(
+    "url,fixture_name,add_rows",
+    [
+        ("/transactions/", "categories", _add_transactions),
+        ("/budgets/", "categories", _add_budgets),
+        ("/accounts/", "vendors", _add_accounts),
+    ],
+    ids=["transactions", "budgets", "accounts"],
+)
+def test_query_count_independent_of_rows(
+    request, logged_in_client, user, session, count_queries, url, fixture_name, add_rows
+):
+    related = request.getfixturevalue(fixture_name)
+    # Warm per-process caches so only per-request queries are counted
+    logged_in_client.get(url)
+
+    add_rows(user, related, 1)
+    few = _queries_for(logged_in_client, count_queries, url, session)
+
+    add_rows(user, related, 5, offset=1)
+    many = _queries_for(logged_in_client, count_queries, url, session)
+
+    assert few == many
@@ -0,0 +1,78 @@
+"""Route-level tests for the keyset-paginated transactions list."""
+
+import re
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.models.enums import TransactionType
+from app.routes.transactions import PER_PAGE
+from app.services import transaction_service
+
+
+@pytest.fixture
+def many_txns(session, user):
+    for i in range(PER_PAGE + 5):
+        transaction_service.create_transaction(
+            date(2026, 1, 1 + i % 28),
+            f"Payee{i:03d}",
+            Decimal("10.00"),
+            TransactionType.DEBIT,
+            user.id,
+        )
+
+
+class TestTransactionList:
+    def test_first_page_has_next_link_only(self, logged_in_client, many_txns):
+        resp = logged_in_client.get("/transactions/")
+        assert resp.status_code == 200
+        assert b"after=" in resp.data
+        assert b"before=" not in resp.data
+        assert f"{PER_PAGE + 5} transactions".encode() in resp.data
+
+    def test_follow_next_link(self, logged_in_client, many_txns):
+        resp = logged_in_client.get("/transactions/")
+        cursor = re.search(rb"after=([\w-]+)", resp.data).group(1).decode()
+        resp = logged_in_client.get(f"/transactions/?after={cursor}")
+        assert resp.status_code == 200
+        assert resp.data.count(b"/edit") == 5
+        assert b"before=" in resp.data
+
+    def test_filters_preserved_in_links(self, logged_in_client, many_txns):
+        resp = logged_in_client.get("/transactions/?start_date=2026-01-01")
+        assert b"start_date=2026-01-01" in resp.data
+
+    def test_empty_list(self, logged_in_client):
+        resp = logged_in_client.get("/transactions/")
+        assert b"No transactions found" in resp.data
+
+    def test_search_narrows_list_and_keeps_query_in_links(
+        self, logged_in_client, many_txns, user
+    ):
+        for i in range(PER_PAGE + 2):
+            transaction_service.create_transaction(
+                date(2026, 2, 1 + i % 28),
+                "AMAZON MKTP",
+                Decimal("5.00"),
+                TransactionType.DEBIT,
+                user.id,
+            )
+        resp = logged_in_client.get("/transactions/?q=amazon")
+        assert f"{PER_PAGE + 2} transactions".encode() in resp.data
+        assert b"Payee0" not in resp.data
+        cursor = re.search(rb"after=([\w-]+)", resp.data).group(1).decode()
+        assert b"q=amazon" in resp.data
+
+        resp = logged_in_client.get(f"/transactions/?q=amazon&after={cursor}")
+        assert resp.data.count(b"/edit") == 2
+
+    def test_total_counted_once_across_pages(
+        self, logged_in_client, many_txns, count_queries
+    ):
+        resp = logged_in_client.get("/transactions/")
+        cursor = re.search(rb"after=([\w-]+)", resp.data).group(1).decode()
+        with count_queries() as queries:
+            resp = logged_in_client.get(f"/transactions/?after={cursor}")
+        assert f"{PER_PAGE + 5} transactions".encode() in resp.data
+        assert not any("count(transactions.id)" in s for s in queries.statements)
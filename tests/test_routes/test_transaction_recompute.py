@@ -1,10 +1,13 @@
 """Route-level tests verifying that transaction mutations trigger analysis recomputation."""
 
 import io
+import re
 from datetime import date
 from decimal import Decimal
 
 import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
 from app.models.category import Category
 from app.models.enums import TransactionType
@@ -84,6 +87,71 @@ class TestCreateTriggersRecompute:
         assert len(eas) == 0
 
 
+def _writes(statements):
+    """(verb, table) of each DML statement, in order."""
+    return [
+        (m[1], m[2])
+        for m in (
+            re.match(r"(INSERT INTO|UPDATE|DELETE FROM) (\w+)", s) for s in statements
+        )
+        if m
+    ]
+
+
+class TestAnalysisLock:
+    def test_write_and_delta_commit_together_under_lock(
+        self, logged_in_client, session, user, period, category, count_queries
+    ):
+        analysis_service.recompute_analysis(period.id, user.id)
+        commits = []
+
+        def count_commit(session):
+            commits.append(session)
+
+        event.listen(Session, "after_commit", count_commit)
+        try:
+            with count_queries() as queries:
+                _post_txn(
+                    logged_in_client,
+                    {"transaction_date": "2026-02-10", "category_id": str(category.id)},
+                )
+        finally:
+            event.remove(Session, "after_commit", count_commit)
+        writes = _writes(queries.statements)
+        # The lock comes first and the write commits together with its delta
+        assert writes[0] == ("UPDATE", "users")
+        assert ("INSERT INTO", "transactions") in writes
+        assert ("INSERT INTO", "expense_analysis") in writes
+        assert len(commits) == 1
+
+    def test_recomputes_take_lock_before_reading(
+        self, session, user, period, count_queries
+    ):
+        for recompute in (
+            lambda: analysis_service.recompute_analysis(period.id, user.id),
+            lambda: analysis_service.recompute_periods_in_range(
+                user.id, period.start_date, period.end_date
+            ),
+        ):
+            with count_queries() as queries:
+                recompute()
+            first_read = next(
+                i
+                for i, s in enumerate(queries.statements)
+                if "transaction_monthly_rollups" in s or "FROM transactions" in s
+            )
+            assert _writes(queries.statements[:first_read])[0] == ("UPDATE", "users")
+
+    def test_range_without_periods_does_not_take_lock(
+        self, session, user, count_queries
+    ):
+        with count_queries() as queries:
+            analysis_service.recompute_periods_in_range(
+                user.id, date(1990, 1, 1), date(1990, 12, 31)
+            )
+        assert _writes(queries.statements) == []
+
+
 class TestEditTriggersRecompute:
     def test_moving_date_recomputes_both_periods(
         self, logged_in_client, session, user, category
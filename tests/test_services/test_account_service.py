@@ -1,11 +1,18 @@
+import threading
+import time
+from datetime import date, timedelta
 from decimal import Decimal
 
 import pytest
 
-from app.models.enums import AccountType
+from app import create_app
+from app.extensions import db as _db
+from app.models.account import AccountBalanceSnapshot
+from app.models.enums import AccountType, TransactionType
 from app.models.user import User
 from app.models.vendor import Vendor
-from app.services import account_service
+from app.services import account_service, analysis_service, transaction_service
+from config import SQLITE_TUNED_PRAGMAS
 
 
 @pytest.fixture
@@ -83,3 +90,196 @@ class TestAccountCRUD:
             "D", vendor.id, AccountType.OTHER, user.id
         )
         assert account_service.deactivate_account(acct.id).is_active is False
+
+
+@pytest.fixture
+def accounts(session, user_and_vendor):
+    user, vendor = user_and_vendor
+    checking = account_service.create_account(
+        "Checking", vendor.id, AccountType.CHECKING, user.id, balance=Decimal("100.00")
+    )
+    card = account_service.create_account(
+        "Card", vendor.id, AccountType.CREDIT_CARD, user.id
+    )
+    return user, checking, card
+
+
+def _txn(user, day, amount, *, debit=None, credit=None):
+    return transaction_service.create_transaction(
+        day,
+        "Payee",
+        Decimal(amount),
+        TransactionType.DEBIT if debit else TransactionType.CREDIT,
+        user.id,
+        debit_account_id=debit.id if debit else None,
+        credit_account_id=credit.id if credit else None,
+    )
+
+
+def _snapshots(account):
+    return [
+        (s.as_of, s.balance)
+        for s in AccountBalanceSnapshot.query.filter_by(account_id=account.id)
+        .order_by(AccountBalanceSnapshot.as_of)
+        .all()
+    ]
+
+
+class TestBalances:
+    def test_opening_plus_credits_minus_debits(self, accounts):
+        user, checking, card = accounts
+        _txn(user, date(2026, 1, 5), "1000.00", credit=checking)
+        _txn(user, date(2026, 1, 9), "40.00", debit=checking)
+        _txn(user, date(2026, 2, 1), "60.00", debit=checking, credit=card)
+
+        assert account_service.get_balance(checking.id) == Decimal("1000.00")
+        assert account_service.get_balance(card.id) == Decimal("60.00")
+        assert account_service.get_balance(checking.id, date(2026, 1, 31)) == Decimal(
+            "1060.00"
+        )
+        assert account_service.get_balance(9999) is None
+
+    def test_snapshot_balances_writes_each_month_end(self, accounts):
+        user, checking, _ = accounts
+        _txn(user, date(2026, 1, 5), "1000.00", credit=checking)
+        _txn(user, date(2026, 3, 9), "40.00", debit=checking)
+
+        written = account_service.snapshot_balances(checking.id, date(2026, 3, 31))
+
+        assert written == 3
+        assert _snapshots(checking) == [
+            (date(2026, 1, 31), Decimal("1000.00")),
+            (date(2026, 2, 28), Decimal("1000.00")),
+            (date(2026, 3, 31), Decimal("960.00")),
+        ]
+        # Already up to date; a through date inside a month stops at the month before
+        assert account_service.snapshot_balances(checking.id, date(2026, 4, 15)) == 0
+
+    def test_writes_adjust_later_snapshots(self, accounts):
+        user, checking, card = accounts
+        _txn(user, date(2026, 1, 5), "1000.00", credit=checking)
+        account_service.snapshot_balances(checking.id, date(2026, 2, 28))
+
+        txn = _txn(user, date(2026, 2, 3), "25.00", debit=checking)
+        assert _snapshots(checking) == [
+            (date(2026, 1, 31), Decimal("1000.00")),
+            (date(2026, 2, 28), Decimal("975.00")),
+        ]
+        transaction_service.update_transaction(
+            txn.id, transaction_date=date(2026, 1, 3), credit_account_id=card.id
+        )
+        assert _snapshots(checking)[0] == (date(2026, 1, 31), Decimal("975.00"))
+        transaction_service.delete_transaction(txn.id)
+        assert _snapshots(checking)[-1] == (date(2026, 2, 28), Decimal("1000.00"))
+
+        transaction_service.import_csv(
+            "date,payee,amount,type\n2026-01-20,Shop,10.00,debit\n",
+            user.id,
+            account_id=checking.id,
+        )
+        assert [b for _, b in _snapshots(checking)] == [Decimal("990.00")] * 2
+        assert account_service.get_balance(checking.id, date(2026, 2, 28)) == Decimal(
+            "1090.00"
+        )
+
+    def test_balances_use_snapshot_plus_recent_rows(self, accounts, count_queries):
+        user, checking, card = accounts
+        _txn(user, date(2026, 1, 5), "1000.00", credit=checking)
+        account_service.snapshot_balances(checking.id, date(2026, 1, 31))
+        _txn(user, date(2026, 2, 3), "25.00", debit=checking, credit=card)
+
+        ids = [checking.id, card.id]
+
+        with count_queries() as queries:
+            balances = account_service.get_balances(ids, date(2026, 2, 28))
+
+        assert balances == dict(zip(ids, [Decimal("1075.00"), Decimal("25.00")]))
+        assert queries.count == 2
+
+    def test_write_after_month_close_queues_snapshots(self, accounts):
+        user, checking, card = accounts
+        _txn(user, date(2026, 1, 5), "1000.00", credit=checking)
+        last_month_end = date.today().replace(day=1) - timedelta(days=1)
+
+        # The sync job backend runs the queued job immediately
+        assert account_service.enqueue_snapshots_if_due(user.id) is not None
+        assert _snapshots(checking)[-1] == (last_month_end, Decimal("1000.00"))
+        assert _snapshots(card) == [(last_month_end, Decimal("0.00"))]
+        assert account_service.enqueue_snapshots_if_due(user.id) is None
+
+
+@pytest.fixture
+def file_app(monkeypatch, tmp_path):
+    """An app on a WAL SQLite file, so two sessions really run concurrently."""
+    from config import TestingConfig
+
+    monkeypatch.setattr(
+        TestingConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'a.db'}"
+    )
+    monkeypatch.setattr(TestingConfig, "SQLITE_PRAGMAS", SQLITE_TUNED_PRAGMAS)
+    app = create_app("testing")
+    with app.app_context():
+        _db.create_all()
+        yield app
+        _db.session.remove()
+        _db.engine.dispose()
+
+
+class TestSnapshotJobConcurrency:
+    def test_write_during_job_reaches_new_snapshot(self, file_app, monkeypatch):
+        user = User(username="u", email="u@test.com", first_name="U", last_name="U")
+        user.set_password("password123")
+        vendor = Vendor(name="Chase", short_name="Chase")
+        _db.session.add_all([user, vendor])
+        _db.session.commit()
+        account = account_service.create_account(
+            "Checking", vendor.id, AccountType.CHECKING, user.id
+        )
+        _txn(user, date(2026, 1, 5), "1000.00", credit=account)
+        user_id, account_id = user.id, account.id
+
+        # Pause the job between its ledger read and its snapshot insert
+        read_done, resume = threading.Event(), threading.Event()
+        real_insert = account_service.insert
+
+        def paused_insert(*args):
+            read_done.set()
+            resume.wait(10)
+            return real_insert(*args)
+
+        monkeypatch.setattr(account_service, "insert", paused_insert)
+
+        def run(fn):
+            def target():
+                with file_app.app_context():
+                    fn()
+
+            thread = threading.Thread(target=target)
+            thread.start()
+            return thread
+
+        def write():
+            # As the transaction routes do it
+            analysis_service.lock_analysis(user_id)
+            transaction_service.create_transaction(
+                date(2026, 2, 10),
+                "Refund",
+                Decimal("25.00"),
+                TransactionType.CREDIT,
+                user_id,
+                credit_account_id=account_id,
+                commit=False,
+            )
+            _db.session.commit()
+
+        job = run(lambda: account_service._snapshot_job(user_id))
+        assert read_done.wait(10)
+        writer = run(write)
+        time.sleep(0.3)
+        resume.set()
+        job.join(10)
+        writer.join(10)
+
+        _db.session.expire_all()
+        last_month_end = date.today().replace(day=1) - timedelta(days=1)
+        assert _snapshots(account)[-1] == (last_month_end, Decimal("1025.00"))
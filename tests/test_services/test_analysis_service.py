@@ -253,6 +253,25 @@ class TestRecomputeAnalysis:
         assert results[0].actual_amount == Decimal("150.00")
         assert results[0].transaction_count == 2
 
+    def test_recurring_budget_counted_per_occurrence(self, session, user, categories):
+        """A monthly item scheduled before the period is budgeted every month."""
+        period = analysis_service.create_period(
+            "Q1 2026", date(2026, 1, 1), date(2026, 3, 31), user.id
+        )
+        budget_service.create_budget_item(
+            "Groceries",
+            Variability.VARIABLE,
+            Frequency.MONTHLY,
+            date(2025, 11, 1),
+            Decimal("400.00"),
+            user.id,
+            categories["food"].id,
+            subcategory_id=categories["groceries"].id,
+        )
+        results = analysis_service.recompute_analysis(period.id, user.id)
+        assert len(results) == 1
+        assert results[0].budgeted_amount == Decimal("1200.00")
+
     def test_nonexistent_period(self, session, user):
         assert analysis_service.recompute_analysis(9999, user.id) == []
 
@@ -354,6 +373,72 @@ class TestOverlapFunctions:
 
         assert len(ExpenseAnalysis.query.filter_by(period_id=jan.id).all()) == 0
 
+    def test_recompute_periods_in_range_matches_per_period(
+        self, session, user, categories
+    ):
+        """Single-pass recompute over nested periods equals per-period recompute."""
+        from app.models.expense_analysis import ExpenseAnalysis
+
+        periods = [
+            analysis_service.create_period(name, start, end, user.id)
+            for name, start, end in (
+                ("Jan", date(2026, 1, 1), date(2026, 1, 31)),
+                ("Feb", date(2026, 2, 1), date(2026, 2, 28)),
+                ("Q1", date(2026, 1, 1), date(2026, 3, 31)),
+                ("2026", date(2026, 1, 1), date(2026, 12, 31)),
+            )
+        ]
+        for d, sub in (
+            (date(2026, 1, 5), "groceries"),
+            (date(2026, 1, 5), "groceries"),
+            (date(2026, 2, 14), "dining"),
+            (date(2026, 3, 20), "groceries"),
+            (date(2026, 7, 4), "dining"),
+        ):
+            transaction_service.create_transaction(
+                d,
+                "Store",
+                Decimal("25.00"),
+                TransactionType.DEBIT,
+                user.id,
+                category_id=categories["food"].id,
+                subcategory_id=categories[sub].id,
+            )
+        budget_service.create_budget_item(
+            "Groceries",
+            Variability.VARIABLE,
+            Frequency.MONTHLY,
+            date(2026, 2, 1),
+            Decimal("300.00"),
+            user.id,
+            categories["food"].id,
+            subcategory_id=categories["groceries"].id,
+        )
+
+        def snapshot():
+            return sorted(
+                (
+                    ea.period_id,
+                    ea.category_id,
+                    ea.subcategory_id,
+                    ea.budgeted_amount,
+                    ea.actual_amount,
+                    ea.variance,
+                    ea.transaction_count,
+                )
+                for ea in ExpenseAnalysis.query.all()
+            )
+
+        for p in periods:
+            analysis_service.recompute_analysis(p.id, user.id)
+        expected = snapshot()
+
+        ExpenseAnalysis.query.delete()
+        analysis_service.recompute_periods_in_range(
+            user.id, date(2026, 1, 1), date(2026, 12, 31)
+        )
+        assert snapshot() == expected
+
 
 class TestAggregateByCategory:
     """Tests for aggregate_by_category()."""
@@ -443,3 +528,321 @@ class TestAggregateByCategory:
         )
         # Dining Out ($200) should come before Groceries... wait, $350 > $200
         assert rows[0].actual_amount >= rows[1].actual_amount
+
+    def test_constant_query_count(self, session, user, setup, count_queries):
+        period, cats = setup
+        other = Category(name="Housing")
+        session.add(other)
+        session.flush()
+        transaction_service.create_transaction(
+            date(2026, 2, 3),
+            "Landlord",
+            Decimal("900.00"),
+            TransactionType.DEBIT,
+            user.id,
+            category_id=other.id,
+        )
+        analysis_service.recompute_analysis(period.id, user.id)
+        period_id, user_id, food_id = period.id, user.id, cats["food"].id
+        session.expire_all()
+
+        with count_queries() as queries:
+            top = analysis_service.aggregate_by_category(period_id, user_id)
+            drill = analysis_service.aggregate_by_category(
+                period_id, user_id, category_id=food_id
+            )
+
+        assert [r.category_name for r in top] == ["Housing", "Food"]
+        assert {r.category_name for r in drill} == {"Groceries", "Dining Out"}
+        assert queries.count == 2
+
+
+class TestApplyTransactionDelta:
+    @pytest.fixture
+    def period(self, session, user):
+        return analysis_service.create_period(
+            "Feb 2026", date(2026, 2, 1), date(2026, 2, 28), user.id
+        )
+
+    @staticmethod
+    def _rows(period_id):
+        from app.models.expense_analysis import ExpenseAnalysis
+
+        return {
+            (ea.category_id, ea.subcategory_id): (
+                ea.budgeted_amount,
+                ea.actual_amount,
+                ea.variance,
+                ea.transaction_count,
+            )
+            for ea in ExpenseAnalysis.query.filter_by(period_id=period_id)
+        }
+
+    def _create(self, user, categories, amount, day=10, sub="groceries"):
+        txn = transaction_service.create_transaction(
+            date(2026, 2, day),
+            "Store",
+            Decimal(amount),
+            TransactionType.DEBIT,
+            user.id,
+            category_id=categories["food"].id,
+            subcategory_id=categories[sub].id,
+        )
+        analysis_service.apply_transaction_delta(
+            user.id, new=analysis_service.transaction_snapshot(txn)
+        )
+        return txn
+
+    def test_create_edit_delete_match_full_recompute(
+        self, session, user, categories, period
+    ):
+        budget_service.create_budget_item(
+            "Groceries",
+            Variability.VARIABLE,
+            Frequency.MONTHLY,
+            date(2026, 2, 1),
+            Decimal("500.00"),
+            user.id,
+            categories["food"].id,
+            subcategory_id=categories["groceries"].id,
+        )
+        analysis_service.recompute_analysis(period.id, user.id)
+        a = self._create(user, categories, "120.00")
+        b = self._create(user, categories, "30.00", sub="dining")
+
+        before = analysis_service.transaction_snapshot(a)
+        transaction_service.update_transaction(
+            a.id, amount=Decimal("80.00"), subcategory_id=categories["dining"].id
+        )
+        analysis_service.apply_transaction_delta(
+            user.id, before, analysis_service.transaction_snapshot(a)
+        )
+        before = analysis_service.transaction_snapshot(b)
+        transaction_service.delete_transaction(b.id)
+        analysis_service.apply_transaction_delta(user.id, old=before)
+
+        incremental = self._rows(period.id)
+        analysis_service.recompute_analysis(period.id, user.id)
+        assert incremental == self._rows(period.id)
+
+    def test_budget_row_kept_when_spending_removed(
+        self, session, user, categories, period
+    ):
+        budget_service.create_budget_item(
+            "Groceries",
+            Variability.VARIABLE,
+            Frequency.MONTHLY,
+            date(2026, 2, 1),
+            Decimal("500.00"),
+            user.id,
+            categories["food"].id,
+            subcategory_id=categories["groceries"].id,
+        )
+        txn = self._create(user, categories, "100.00")
+        before = analysis_service.transaction_snapshot(txn)
+        transaction_service.delete_transaction(txn.id)
+        analysis_service.apply_transaction_delta(user.id, old=before)
+
+        key = (categories["food"].id, categories["groceries"].id)
+        assert self._rows(period.id)[key] == (
+            Decimal("500.00"),
+            Decimal("0.00"),
+            Decimal("500.00"),
+            0,
+        )
+
+    def test_credit_and_uncategorized_are_ignored(self, session, user, period):
+        txn = transaction_service.create_transaction(
+            date(2026, 2, 10),
+            "Refund",
+            Decimal("10.00"),
+            TransactionType.CREDIT,
+            user.id,
+        )
+        analysis_service.apply_transaction_delta(
+            user.id, new=analysis_service.transaction_snapshot(txn)
+        )
+        assert self._rows(period.id) == {}
+
+    def test_missing_rows_trigger_repair(self, session, user, categories, period):
+        # Transactions written without maintaining analysis leave it stale
+        txn = transaction_service.create_transaction(
+            date(2026, 2, 10),
+            "Store",
+            Decimal("100.00"),
+            TransactionType.DEBIT,
+            user.id,
+            category_id=categories["food"].id,
+            subcategory_id=categories["groceries"].id,
+        )
+        transaction_service.create_transaction(
+            date(2026, 2, 11),
+            "Store",
+            Decimal("40.00"),
+            TransactionType.DEBIT,
+            user.id,
+            category_id=categories["food"].id,
+            subcategory_id=categories["groceries"].id,
+        )
+        before = analysis_service.transaction_snapshot(txn)
+        transaction_service.delete_transaction(txn.id)
+        analysis_service.apply_transaction_delta(user.id, old=before)
+
+        key = (categories["food"].id, categories["groceries"].id)
+        assert self._rows(period.id)[key][1:] == (
+            Decimal("40.00"),
+            Decimal("-40.00"),
+            1,
+        )
+
+    def test_uncomputed_period_is_recomputed_not_delta(self, session, user, categories):
+        for day in range(1, 10):
+            transaction_service.create_transaction(
+                date(2026, 2, day),
+                "Store",
+                Decimal("10.00"),
+                TransactionType.DEBIT,
+                user.id,
+                category_id=categories["food"].id,
+                subcategory_id=categories["groceries"].id,
+            )
+        # Created after the spending; its rows have never been computed
+        period = analysis_service.create_period(
+            "Feb", date(2026, 2, 1), date(2026, 2, 28), user.id
+        )
+        assert period.computed_at is None
+        self._create(user, categories, "10.00", day=20)
+
+        key = (categories["food"].id, categories["groceries"].id)
+        assert self._rows(period.id)[key][1:] == (
+            Decimal("100.00"),
+            Decimal("-100.00"),
+            10,
+        )
+        assert period.computed_at is not None
+
+    def test_range_change_invalidates_rows(self, session, user, categories, period):
+        self._create(user, categories, "10.00", day=5)
+        analysis_service.recompute_analysis(period.id, user.id)
+        analysis_service.update_period(period.id, start_date=date(2026, 2, 10))
+        assert period.computed_at is None
+        analysis_service.update_period(period.id, name="Renamed")
+        assert period.computed_at is None
+
+        self._create(user, categories, "25.00", day=15)
+        key = (categories["food"].id, categories["groceries"].id)
+        assert self._rows(period.id)[key][1] == Decimal("25.00")
+
+
+class TestMonthlyRollupAggregation:
+    @pytest.mark.parametrize(
+        "start,end,months,edges",
+        [
+            (
+                date(2026, 1, 1),
+                date(2026, 3, 31),
+                (date(2026, 1, 1), date(2026, 3, 1)),
+                [],
+            ),
+            (
+                date(2026, 1, 15),
+                date(2026, 3, 10),
+                (date(2026, 2, 1), date(2026, 2, 1)),
+                [
+                    (date(2026, 1, 15), date(2026, 1, 31)),
+                    (date(2026, 3, 1), date(2026, 3, 10)),
+                ],
+            ),
+            (
+                date(2026, 2, 3),
+                date(2026, 2, 20),
+                None,
+                [(date(2026, 2, 3), date(2026, 2, 20))],
+            ),
+            (
+                date(2026, 1, 31),
+                date(2026, 2, 1),
+                None,
+                [(date(2026, 1, 31), date(2026, 2, 1))],
+            ),
+            (
+                date(2025, 12, 1),
+                date(2026, 1, 30),
+                (date(2025, 12, 1), date(2025, 12, 1)),
+                [(date(2026, 1, 1), date(2026, 1, 30))],
+            ),
+        ],
+    )
+    def test_split_months(self, start, end, months, edges):
+        assert analysis_service._split_months(start, end) == (months, edges)
+
+    def test_unaligned_periods_match_raw_transactions(self, session, user, categories):
+        from app.models.expense_analysis import ExpenseAnalysis
+        from app.models.transaction import Transaction
+
+        for month in range(1, 5):
+            for day in (1, 14, 28):
+                transaction_service.create_transaction(
+                    date(2026, month, day),
+                    "Store",
+                    Decimal(f"{month}{day}.25"),
+                    TransactionType.DEBIT,
+                    user.id,
+                    category_id=categories["food"].id,
+                    subcategory_id=categories["groceries"].id,
+                )
+        periods = [
+            analysis_service.create_period(
+                "A", date(2026, 1, 14), date(2026, 3, 14), user.id
+            ),
+            analysis_service.create_period(
+                "B", date(2026, 2, 1), date(2026, 4, 30), user.id
+            ),
+            analysis_service.create_period(
+                "C", date(2026, 2, 2), date(2026, 2, 27), user.id
+            ),
+        ]
+        analysis_service.recompute_periods_in_range(
+            user.id, date(2026, 1, 1), date(2026, 4, 30)
+        )
+
+        for period in periods:
+            raw = [
+                t
+                for t in Transaction.query.filter_by(user_id=user.id)
+                if period.start_date <= t.transaction_date <= period.end_date
+            ]
+            ea = ExpenseAnalysis.query.filter_by(period_id=period.id).one()
+            assert ea.actual_amount == sum(t.amount for t in raw)
+            assert ea.transaction_count == len(raw)
+
+            analysis_service.recompute_analysis(period.id, user.id)
+            ea = ExpenseAnalysis.query.filter_by(period_id=period.id).one()
+            assert ea.actual_amount == sum(t.amount for t in raw)
+            assert ea.transaction_count == len(raw)
+
+    def test_whole_months_read_from_rollup(self, session, user, categories):
+        from app.models.expense_analysis import ExpenseAnalysis
+        from app.models.transaction import TransactionMonthlyRollup
+
+        transaction_service.create_transaction(
+            date(2026, 2, 10),
+            "Store",
+            Decimal("40.00"),
+            TransactionType.DEBIT,
+            user.id,
+            category_id=categories["food"].id,
+            subcategory_id=categories["groceries"].id,
+        )
+        # Tamper with the rollup so it is distinguishable from raw rows
+        TransactionMonthlyRollup.query.update({"total_amount": Decimal("99.00")})
+        session.commit()
+        period = analysis_service.create_period(
+            "Feb", date(2026, 2, 1), date(2026, 2, 28), user.id
+        )
+        analysis_service.recompute_analysis(period.id, user.id)
+        assert ExpenseAnalysis.query.one().actual_amount == Decimal("99.00")
+
+        transaction_service.rebuild_monthly_rollup(user.id)
+        analysis_service.recompute_analysis(period.id, user.id)
+        assert ExpenseAnalysis.query.one().actual_amount == Decimal("40.00")
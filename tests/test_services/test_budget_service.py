@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 
 import pytest
@@ -115,3 +115,173 @@ class TestBudgetCRUD:
             cat.id,
         )
         assert budget_service.deactivate_budget_item(item.id).is_active is False
+
+
+def _brute_force_occurrences(frequency, anchor, start, end):
+    """Reference implementation that walks every occurrence."""
+    if frequency == Frequency.ONE_TIME:
+        return int(start <= anchor <= end)
+    count, k = 0, 0
+    while True:
+        if frequency in (Frequency.WEEKLY, Frequency.BIWEEKLY):
+            step = 7 if frequency == Frequency.WEEKLY else 14
+            occurrence = anchor + timedelta(days=k * step)
+        else:
+            step = {Frequency.MONTHLY: 1, Frequency.QUARTERLY: 3, Frequency.ANNUAL: 12}
+            occurrence = budget_service._add_months(anchor, k * step[frequency])
+        if occurrence > end:
+            return count
+        if occurrence >= start:
+            count += 1
+        k += 1
+
+
+class TestCountOccurrences:
+    @pytest.mark.parametrize(
+        "frequency,anchor,start,end,expected",
+        [
+            (
+                Frequency.MONTHLY,
+                date(2026, 1, 1),
+                date(2026, 1, 1),
+                date(2026, 3, 31),
+                3,
+            ),
+            (
+                Frequency.MONTHLY,
+                date(2026, 1, 31),
+                date(2026, 2, 1),
+                date(2026, 2, 28),
+                1,
+            ),
+            (
+                Frequency.MONTHLY,
+                date(2026, 1, 15),
+                date(2026, 3, 16),
+                date(2026, 4, 14),
+                0,
+            ),
+            (
+                Frequency.WEEKLY,
+                date(2026, 1, 1),
+                date(2026, 1, 1),
+                date(2026, 1, 31),
+                5,
+            ),
+            (
+                Frequency.BIWEEKLY,
+                date(2026, 1, 2),
+                date(2026, 1, 1),
+                date(2026, 1, 31),
+                3,
+            ),
+            (
+                Frequency.QUARTERLY,
+                date(2025, 11, 10),
+                date(2026, 1, 1),
+                date(2026, 12, 31),
+                4,
+            ),
+            (
+                Frequency.ANNUAL,
+                date(2024, 2, 29),
+                date(2026, 2, 1),
+                date(2026, 2, 28),
+                1,
+            ),
+            (
+                Frequency.ONE_TIME,
+                date(2026, 1, 5),
+                date(2026, 1, 1),
+                date(2026, 1, 31),
+                1,
+            ),
+            (
+                Frequency.ONE_TIME,
+                date(2025, 1, 5),
+                date(2026, 1, 1),
+                date(2026, 1, 31),
+                0,
+            ),
+            (
+                Frequency.MONTHLY,
+                date(2026, 6, 1),
+                date(2026, 1, 1),
+                date(2026, 3, 31),
+                0,
+            ),
+        ],
+    )
+    def test_known_cases(self, frequency, anchor, start, end, expected):
+        assert (
+            budget_service.count_occurrences(frequency, anchor, start, end) == expected
+        )
+
+    @pytest.mark.parametrize("frequency", list(Frequency))
+    def test_matches_brute_force(self, frequency):
+        import random
+
+        rng = random.Random(frequency.value)
+        base = date(2024, 1, 1)
+        for _ in range(300):
+            anchor = base + timedelta(days=rng.randrange(1000))
+            start = base + timedelta(days=rng.randrange(1200))
+            end = start + timedelta(days=rng.randrange(500))
+            assert budget_service.count_occurrences(
+                frequency, anchor, start, end
+            ) == _brute_force_occurrences(frequency, anchor, start, end)
+
+
+class TestBudgetedTotals:
+    def test_recurring_items_expand_per_window(self, session, user_and_category):
+        user, cat, sub = user_and_category
+        budget_service.create_budget_item(
+            "Rent",
+            Variability.FIXED,
+            Frequency.MONTHLY,
+            date(2025, 6, 1),
+            Decimal("1500.00"),
+            user.id,
+            cat.id,
+            subcategory_id=sub.id,
+        )
+        budget_service.create_budget_item(
+            "Repair",
+            Variability.VARIABLE,
+            Frequency.ONE_TIME,
+            date(2026, 2, 10),
+            Decimal("200.00"),
+            user.id,
+            cat.id,
+        )
+        totals = budget_service.budgeted_totals(
+            user.id,
+            {
+                "jan": (date(2026, 1, 1), date(2026, 1, 31)),
+                "q1": (date(2026, 1, 1), date(2026, 3, 31)),
+                "before": (date(2025, 1, 1), date(2025, 5, 31)),
+            },
+        )
+        assert totals["jan"] == {(cat.id, sub.id): Decimal("1500.00")}
+        assert totals["q1"] == {
+            (cat.id, sub.id): Decimal("4500.00"),
+            (cat.id, None): Decimal("200.00"),
+        }
+        assert totals["before"] == {}
+
+    def test_inactive_items_excluded(self, session, user_and_category):
+        user, cat, sub = user_and_category
+        item = budget_service.create_budget_item(
+            "Rent",
+            Variability.FIXED,
+            Frequency.WEEKLY,
+            date(2026, 1, 1),
+            Decimal("10.00"),
+            user.id,
+            cat.id,
+        )
+        budget_service.deactivate_budget_item(item.id)
+        totals = budget_service.budgeted_totals(
+            user.id, {1: (date(2026, 1, 1), date(2026, 1, 31))}
+        )
+        assert totals == {1: {}}
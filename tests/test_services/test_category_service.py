@@ -0,0 +1,112 @@
+from sqlalchemy import insert
+
+from app.models.category import Category
+from app.services import category_service
+from app.services.seed_service import DEFAULT_CATEGORIES, seed_categories
+
+
+class TestCategoryTree:
+    def test_tree_matches_seeded_categories(self, session):
+        seed_categories()
+        top = category_service.get_top_level_categories()
+        assert [c.name for c in top] == sorted(DEFAULT_CATEGORIES)
+        food = next(c for c in top if c.name == "Food")
+        assert [c.name for c in category_service.get_subcategories(food.id)] == [
+            "Coffee",
+            "Dining Out",
+            "Groceries",
+        ]
+        assert category_service.get_category(food.id).name == "Food"
+
+    def test_unknown_ids(self, session):
+        assert category_service.get_category(9999) is None
+        assert category_service.get_subcategories(9999) == []
+
+    def test_loaded_once(self, session, count_queries):
+        seed_categories()
+        with count_queries() as queries:
+            category_service.get_top_level_categories()
+            category_service.get_subcategories()
+            category_service.get_category(1)
+        assert queries.count == 1
+
+
+class TestInvalidation:
+    def test_insert_invalidates_on_commit(self, session):
+        session.add(Category(name="Food"))
+        session.commit()
+        assert [c.name for c in category_service.get_top_level_categories()] == ["Food"]
+        session.add(Category(name="Housing"))
+        session.flush()
+        # Not yet committed — still the cached tree
+        assert len(category_service.get_top_level_categories()) == 1
+        session.commit()
+        assert len(category_service.get_top_level_categories()) == 2
+
+    def test_update_and_delete_invalidate(self, session):
+        cat = Category(name="Food")
+        session.add(cat)
+        session.commit()
+        version = category_service.get_category_tree().version
+
+        cat.name = "Groceries"
+        session.commit()
+        assert category_service.get_category(cat.id).name == "Groceries"
+
+        session.delete(cat)
+        session.commit()
+        assert category_service.get_category(cat.id) is None
+        assert category_service.get_category_tree().version > version
+
+    def test_rollback_does_not_invalidate(self, session):
+        session.add(Category(name="Food"))
+        session.commit()
+        version = category_service.get_category_tree().version
+        session.add(Category(name="Housing"))
+        session.flush()
+        session.rollback()
+        session.commit()
+        assert category_service.get_category_tree().version == version
+
+    def test_manual_invalidate(self, session):
+        version = category_service.get_category_tree().version
+        category_service.invalidate_category_cache()
+        assert category_service.get_category_tree().version == version + 1
+
+
+class TestCrossProcessCheck:
+    def test_write_outside_orm_seen_after_ttl(self, session):
+        session.add(Category(name="Food"))
+        session.commit()
+        category_service.get_top_level_categories()
+
+        # A Core insert fires no ORM events, like a write from another process
+        session.execute(insert(Category).values(name="Housing"))
+        session.commit()
+        assert len(category_service.get_top_level_categories()) == 1
+
+        category_service._cache().ttl = 0
+        assert len(category_service.get_top_level_categories()) == 2
+
+    def test_unchanged_table_is_not_reloaded(self, session, count_queries):
+        seed_categories()
+        cache = category_service._cache()
+        cache.ttl = 0
+        tree = category_service.get_category_tree()
+        with count_queries() as queries:
+            assert category_service.get_category_tree() is tree
+        assert queries.count == 1
+
+
+class TestCachedRoutes:
+    def test_subcategory_api_served_from_cache(
+        self, logged_in_client, session, count_queries
+    ):
+        seed_categories()
+        food = Category.query.filter_by(name="Food", parent_id=None).first()
+        category_service.get_category_tree()
+        with count_queries() as queries:
+            resp = logged_in_client.get(f"/budgets/api/subcategories/{food.id}")
+        names = [row["name"] for row in resp.get_json()]
+        assert names == ["Coffee", "Dining Out", "Groceries"]
+        assert not any("FROM categories" in s for s in queries.statements)
@@ -0,0 +1,186 @@
+import io
+import json
+import os
+from datetime import date, datetime
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from app.models.import_job import ImportJob
+from app.services import import_service, transaction_service
+
+
+@pytest.fixture(autouse=True)
+def spool_dir(app, tmp_path):
+    app.config["IMPORT_SPOOL_DIR"] = str(tmp_path / "spool")
+    app.config["IMPORT_BATCH_SIZE"] = 2
+    return tmp_path / "spool"
+
+
+def _upload(payload: bytes, filename="bank.csv"):
+    return FileStorage(stream=io.BytesIO(payload), filename=filename)
+
+
+def _csv(rows: list[str]) -> bytes:
+    return ("date,payee,amount,type\n" + "".join(r + "\n" for r in rows)).encode()
+
+
+def _fail_parse(row, *args):
+    raise RuntimeError("db down")
+
+
+class TestStartImport:
+    def test_spools_and_imports(self, user, spool_dir):
+        rows = [f"2026-03-{d:02d},P{d},1.00,debit" for d in range(1, 6)]
+        job = import_service.start_import(_upload(_csv(rows)), user.id)
+
+        assert job.status == "done"
+        assert job.imported == 5
+        assert job.last_row == 6
+        assert job.processed_bytes == job.total_bytes
+        assert (job.min_date, job.max_date) == (date(2026, 3, 1), date(2026, 3, 5))
+        assert "Imported 5 transactions." in job.message
+        assert os.listdir(spool_dir) == []
+
+    def test_records_row_errors(self, user):
+        rows = ["2026-03-01,A,1.00,debit", "bad,B,1.00,debit", "2026-03-02,C,x,debit"]
+        job = import_service.start_import(_upload(_csv(rows)), user.id)
+
+        assert job.imported == 1
+        assert job.error_count == 2
+        assert [e["row"] for e in json.loads(job.errors)] == [3, 4]
+
+    def test_invalid_utf8_fails_and_keeps_committed_batches(self, user, spool_dir):
+        # Well past the decoder's read-ahead so some batches commit first
+        payload = _csv([f"2026-03-01,P{i},1.00,debit" for i in range(1000)])
+        payload += b"2026-03-03,\xff,1.00,debit\n"
+        job = import_service.start_import(_upload(payload), user.id)
+
+        assert job.status == "failed"
+        assert "not valid UTF-8" in job.message
+        assert 0 < job.imported < 1000
+        assert transaction_service.count_transactions_for_user(user.id) == job.imported
+        assert os.listdir(spool_dir) == []
+
+    def test_reimport_reports_skipped_duplicates(self, user):
+        payload = _csv(["2026-03-01,A,1.00,debit", "2026-03-02,B,1.00,debit"])
+        import_service.start_import(_upload(payload), user.id)
+        job = import_service.start_import(_upload(payload), user.id)
+
+        assert (job.imported, job.skipped) == (0, 2)
+        assert "Skipped 2 already imported." in job.message
+
+
+class TestResume:
+    def test_rerun_continues_after_last_committed_row(self, user, monkeypatch):
+        parse = transaction_service._parse_csv_row
+
+        def fail_on_p5(row, *args):
+            if row["payee"] == "P5":
+                raise RuntimeError("worker died")
+            return parse(row, *args)
+
+        monkeypatch.setattr(transaction_service, "_parse_csv_row", fail_on_p5)
+        rows = [f"2026-03-{d:02d},P{d},1.00,debit" for d in range(1, 8)]
+        job = import_service.start_import(_upload(_csv(rows)), user.id)
+        assert job.status == "failed"
+        assert (job.imported, job.last_row) == (4, 5)
+        assert os.path.exists(job.spool_path)
+
+        monkeypatch.setattr(transaction_service, "_parse_csv_row", parse)
+        # A failed job is only run again once it is retried
+        import_service.run_import(job.id)
+        assert (job.status, job.imported) == ("failed", 4)
+        assert import_service.retry_import(job)
+
+        assert job.status == "done"
+        assert job.imported == 7
+        assert transaction_service.count_transactions_for_user(user.id) == 7
+
+    def test_retry_queues_failed_import_again(self, user, monkeypatch):
+        monkeypatch.setattr(transaction_service, "_parse_csv_row", _fail_parse)
+        job = import_service.start_import(
+            _upload(_csv(["2026-03-01,A,1.00,debit"])), user.id
+        )
+        assert import_service.import_progress(job)["can_retry"]
+
+        monkeypatch.undo()
+        assert import_service.retry_import(job)
+        assert (job.status, job.imported) == ("done", 1)
+        assert not os.path.exists(job.spool_path)
+        assert not import_service.retry_import(job)
+
+    def test_stale_running_import_is_marked_failed(self, app, user, session):
+        job = ImportJob(
+            user_id=user.id,
+            filename="big.csv",
+            spool_path="/nonexistent",
+            status="running",
+            imported=40,
+            updated_at=datetime(2026, 1, 1),
+        )
+        session.add(job)
+        session.commit()
+
+        found = import_service.get_import_for_user(job.id, user.id)
+        assert found.status == "failed"
+        assert "after 40 transactions" in found.message
+        assert found.finished_at is not None
+
+    def test_long_queued_import_is_not_marked_failed(self, user, session):
+        job = ImportJob(
+            user_id=user.id,
+            filename="big.csv",
+            spool_path="/nonexistent",
+            status="queued",
+            updated_at=datetime(2026, 1, 1),
+        )
+        session.add(job)
+        session.commit()
+
+        assert import_service.get_import_for_user(job.id, user.id).status == "queued"
+
+    def test_old_failed_spools_are_purged(self, app, user, monkeypatch):
+        monkeypatch.setattr(transaction_service, "_parse_csv_row", _fail_parse)
+        job = import_service.start_import(
+            _upload(_csv(["2026-03-01,A,1.00,debit"])), user.id
+        )
+        path = job.spool_path
+        assert import_service.purge_failed_spools() == 0
+        assert os.path.exists(path)
+
+        app.config["IMPORT_RETRY_SECONDS"] = -1
+        assert import_service.purge_failed_spools() == 1
+        assert not os.path.exists(path)
+        assert not import_service.can_retry(job)
+        assert import_service.purge_failed_spools() == 0
+
+    def test_done_job_is_not_rerun(self, user):
+        job = import_service.start_import(
+            _upload(_csv(["2026-03-01,A,1.00,debit"])), user.id
+        )
+        import_service.run_import(job.id)
+        assert transaction_service.count_transactions_for_user(user.id) == 1
+
+
+class TestImportProgress:
+    def test_running_job_reports_percent_and_eta(self, user):
+        job = ImportJob(
+            user_id=user.id,
+            filename="big.csv",
+            spool_path="/nonexistent",
+            status="running",
+            total_bytes=1000,
+            processed_bytes=250,
+            last_row=51,
+            imported=48,
+            error_count=2,
+            started_at=import_service._utcnow(),
+        )
+        progress = import_service.import_progress(job)
+
+        assert progress["percent"] == 25.0
+        assert progress["rows_processed"] == 50
+        assert progress["imported"] == 48
+        assert progress["eta_seconds"] is not None
+        assert progress["errors"] == []
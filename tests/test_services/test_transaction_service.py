@@ -97,6 +97,32 @@ class TestTransactionCRUD:
         assert len(result) == 1
         assert result[0].payee == "A"
 
+    def test_account_filter_matches_either_side_once(self, session, user, account):
+        for payee, debit, credit in (
+            ("Out", account.id, None),
+            ("In", None, account.id),
+            ("Self", account.id, account.id),
+        ):
+            transaction_service.create_transaction(
+                date(2026, 2, 1),
+                payee,
+                Decimal("10"),
+                TransactionType.DEBIT,
+                user.id,
+                debit_account_id=debit,
+                credit_account_id=credit,
+            )
+        result = transaction_service.get_transactions_for_user(
+            user.id, account_id=account.id
+        )
+        assert sorted(t.payee for t in result) == ["In", "Out", "Self"]
+        assert (
+            transaction_service.count_transactions_for_user(
+                user.id, account_id=account.id
+            )
+            == 3
+        )
+
     def test_list_with_limit(self, session, user):
         for i in range(5):
             transaction_service.create_transaction(
@@ -193,3 +219,365 @@ class TestCSVImport:
         result = transaction_service.import_csv(csv, user.id)
         assert result["imported"] == 2
         assert len(result["errors"]) == 1
+
+
+class TestKeysetPagination:
+    @pytest.fixture
+    def txns(self, session, user):
+        # Two rows per day so the id tie-breaker is exercised
+        created = []
+        for day in range(1, 6):
+            for n in range(2):
+                created.append(
+                    transaction_service.create_transaction(
+                        date(2026, 2, day),
+                        f"P{day}-{n}",
+                        Decimal("10"),
+                        TransactionType.DEBIT,
+                        user.id,
+                    )
+                )
+        return created
+
+    def test_first_page(self, session, user, txns):
+        page = transaction_service.get_transactions_page(user.id, per_page=4)
+        assert [t.payee for t in page.items] == ["P5-1", "P5-0", "P4-1", "P4-0"]
+        assert page.prev_cursor is None
+        assert page.next_cursor is not None
+
+    def test_walk_forward_covers_all_rows_once(self, session, user, txns):
+        seen = []
+        cursor = None
+        while True:
+            page = transaction_service.get_transactions_page(
+                user.id, after=cursor, per_page=3
+            )
+            seen.extend(t.id for t in page.items)
+            if not page.next_cursor:
+                break
+            cursor = page.next_cursor
+        assert len(seen) == len(txns)
+        assert len(set(seen)) == len(txns)
+
+    def test_before_returns_previous_page(self, session, user, txns):
+        first = transaction_service.get_transactions_page(user.id, per_page=3)
+        second = transaction_service.get_transactions_page(
+            user.id, after=first.next_cursor, per_page=3
+        )
+        third = transaction_service.get_transactions_page(
+            user.id, after=second.next_cursor, per_page=3
+        )
+        back = transaction_service.get_transactions_page(
+            user.id, before=third.prev_cursor, per_page=3
+        )
+        assert [t.id for t in back.items] == [t.id for t in second.items]
+
+    def test_before_near_top_returns_first_page(self, session, user, txns):
+        first = transaction_service.get_transactions_page(user.id, per_page=3)
+        second = transaction_service.get_transactions_page(
+            user.id, after=first.next_cursor, per_page=3
+        )
+        back = transaction_service.get_transactions_page(
+            user.id, before=second.prev_cursor, per_page=3
+        )
+        assert [t.id for t in back.items] == [t.id for t in first.items]
+        assert back.prev_cursor is None
+
+    def test_invalid_cursor_returns_first_page(self, session, user, txns):
+        page = transaction_service.get_transactions_page(
+            user.id, after="not-a-cursor", per_page=2
+        )
+        assert [t.payee for t in page.items] == ["P5-1", "P5-0"]
+
+    def test_cursor_roundtrip(self, session, user, txns):
+        txn = txns[0]
+        assert transaction_service.decode_cursor(
+            transaction_service.encode_cursor(txn)
+        ) == (txn.transaction_date, txn.id)
+
+    def test_count_respects_filters(self, session, user, txns):
+        assert transaction_service.count_transactions_for_user(user.id) == 10
+        assert (
+            transaction_service.count_transactions_for_user(
+                user.id, start_date=date(2026, 2, 4)
+            )
+            == 4
+        )
+
+
+class TestBatchedCSVImport:
+    CSV = "date,payee,amount,type\n" + "".join(
+        f"2026-03-{d:02d},P{d},{d}.00,debit\n" for d in range(1, 11)
+    )
+
+    def test_commits_in_batches(self, session, user):
+        result = transaction_service.import_csv(self.CSV, user.id, batch_size=3)
+        assert result["imported"] == 10
+        assert result["batches"] == 4
+        assert result["last_row"] == 11
+        assert result["min_date"] == date(2026, 3, 1)
+        assert result["max_date"] == date(2026, 3, 10)
+        assert transaction_service.count_transactions_for_user(user.id) == 10
+
+    def test_on_batch_reports_progress(self, session, user):
+        seen = []
+        transaction_service.import_csv(
+            self.CSV,
+            user.id,
+            batch_size=4,
+            on_batch=lambda r: seen.append((r["imported"], r["last_row"])),
+        )
+        assert seen == [(4, 5), (8, 9), (10, 11)]
+
+    def test_resume_after_checkpoint_skips_committed_rows(self, session, user):
+        result = transaction_service.import_csv(self.CSV, user.id, resume_after=7)
+        assert result["imported"] == 4
+        txns = transaction_service.get_transactions_for_user(user.id)
+        assert {t.payee for t in txns} == {"P7", "P8", "P9", "P10"}
+
+    def test_errors_do_not_break_batch(self, session, user):
+        csv = (
+            "date,payee,amount,type\n"
+            "2026-02-01,Good,10.00,debit\n"
+            "2026-02-02,Bad,oops,debit\n"
+            "2026-02-03,Good2,30.00,credit\n"
+        )
+        result = transaction_service.import_csv(csv, user.id, batch_size=2)
+        assert result["imported"] == 2
+        assert result["errors"] == [{"row": 3, "error": result["errors"][0]["error"]}]
+        assert result["errors"][0]["error"].startswith("Invalid amount")
+
+    def test_imported_rows_get_timestamps(self, session, user):
+        transaction_service.import_csv(self.CSV, user.id)
+        txn = transaction_service.get_transactions_for_user(user.id, limit=1)[0]
+        assert txn.created_at is not None
+        assert txn.updated_at is not None
+
+
+class TestSearch:
+    def _create(self, user, payee, day=1, **kwargs):
+        return transaction_service.create_transaction(
+            date(2026, 3, day),
+            payee,
+            Decimal("1.00"),
+            TransactionType.DEBIT,
+            user.id,
+            **kwargs,
+        )
+
+    def _payees(self, user, q):
+        return [
+            t.payee for t in transaction_service.get_transactions_for_user(user.id, q=q)
+        ]
+
+    def test_matches_word_prefixes_in_any_text_column(self, session, user):
+        self._create(user, "AMAZON MKTP")
+        self._create(user, "Grocer", description="amazon fresh order")
+        self._create(user, "Cafe", notes="Met Amazonian explorer")
+        self._create(user, "Netflix")
+        assert sorted(self._payees(user, "amaz")) == ["AMAZON MKTP", "Cafe", "Grocer"]
+
+    def test_all_terms_must_match(self, session, user):
+        self._create(user, "AMAZON PRIME VIDEO")
+        self._create(user, "AMAZON MKTP")
+        assert self._payees(user, "prime amazon") == ["AMAZON PRIME VIDEO"]
+
+    def test_query_syntax_is_treated_as_text(self, session, user):
+        self._create(user, 'O\'Neil "Hardware" AND co*')
+        for q in ['"', "AND", "co*", "o'neil", "NEAR(", "payee:x"]:
+            transaction_service.get_transactions_for_user(user.id, q=q)
+        assert self._payees(user, '"hardware"') == ['O\'Neil "Hardware" AND co*']
+
+    def test_index_follows_update_and_delete(self, session, user):
+        txn = self._create(user, "Old Name")
+        transaction_service.update_transaction(txn.id, payee="New Name")
+        assert self._payees(user, "old") == []
+        assert self._payees(user, "new") == ["New Name"]
+        transaction_service.delete_transaction(txn.id)
+        assert self._payees(user, "new") == []
+
+    def test_imported_rows_are_searchable(self, session, user):
+        transaction_service.import_csv(
+            "date,payee,amount,type,description\n"
+            "2026-03-01,SHELL OIL,40.00,debit,fuel\n"
+            "2026-03-02,WHOLE FOODS,20.00,debit,\n",
+            user.id,
+        )
+        assert self._payees(user, "fuel") == ["SHELL OIL"]
+
+    def test_scoped_to_user(self, session, user):
+        other = User(
+            username="other",
+            email="o@test.com",
+            password_hash="h",
+            first_name="O",
+            last_name="U",
+        )
+        session.add(other)
+        session.flush()
+        self._create(other, "AMAZON MKTP")
+        assert self._payees(user, "amazon") == []
+
+    def test_combines_with_keyset_pagination(self, session, user):
+        for day in range(1, 8):
+            self._create(user, f"AMAZON {day}", day=day)
+            self._create(user, f"Other {day}", day=day)
+        first = transaction_service.get_transactions_page(
+            user.id, q="amazon", per_page=4
+        )
+        second = transaction_service.get_transactions_page(
+            user.id, q="amazon", per_page=4, after=first.next_cursor
+        )
+        assert [t.payee for t in first.items + second.items] == [
+            f"AMAZON {day}" for day in range(7, 0, -1)
+        ]
+        assert second.next_cursor is None
+        assert transaction_service.count_transactions_for_user(user.id, q="amazon") == 7
+
+
+class TestImportDeduplication:
+    CSV = TestBatchedCSVImport.CSV
+
+    def test_reimport_skips_every_row(self, session, user):
+        transaction_service.import_csv(self.CSV, user.id)
+        result = transaction_service.import_csv(self.CSV, user.id, batch_size=3)
+        assert result["imported"] == 0
+        assert result["skipped"] == 10
+        assert result["min_date"] is None
+        assert transaction_service.count_transactions_for_user(user.id) == 10
+
+    def test_overlapping_export_imports_only_new_rows(self, session, user):
+        transaction_service.import_csv(self.CSV, user.id)
+        overlap = self.CSV + "2026-03-11,P11,11.00,debit\n"
+        result = transaction_service.import_csv(overlap, user.id)
+        assert (result["imported"], result["skipped"]) == (1, 10)
+
+    def test_identical_rows_in_one_file_are_kept(self, session, user):
+        csv = "date,payee,amount,type\n" + "2026-03-01,Coffee,4.50,debit\n" * 2
+        assert transaction_service.import_csv(csv, user.id)["imported"] == 2
+        assert transaction_service.import_csv(csv, user.id)["skipped"] == 2
+        more = csv + "2026-03-01,Coffee,4.50,debit\n"
+        assert transaction_service.import_csv(more, user.id)["imported"] == 1
+
+    def test_identical_rows_numbered_across_batches(self, session, user):
+        csv = "date,payee,amount,type\n" + "2026-03-01,Coffee,4.50,debit\n" * 3
+        result = transaction_service.import_csv(csv, user.id, batch_size=1)
+        assert (result["imported"], result["batches"]) == (3, 3)
+        result = transaction_service.import_csv(csv, user.id, batch_size=2)
+        assert result["skipped"] == 3
+
+    def test_manual_entries_are_fingerprinted_like_imports(self, session, user):
+        for _ in range(2):
+            transaction_service.create_transaction(
+                date(2026, 3, 1),
+                "Coffee",
+                Decimal("4.50"),
+                TransactionType.DEBIT,
+                user.id,
+            )
+        csv = "date,payee,amount,type\n" + "2026-03-01,Coffee,4.50,debit\n" * 3
+        result = transaction_service.import_csv(csv, user.id)
+        assert (result["imported"], result["skipped"]) == (1, 2)
+
+    def test_payee_case_and_spacing_ignored(self, session, user):
+        transaction_service.import_csv(
+            "date,payee,amount,type\n2026-03-01,Whole Foods,10.0,debit\n", user.id
+        )
+        result = transaction_service.import_csv(
+            "date,payee,amount,type\n2026-03-01,  WHOLE  foods ,10.00,debit\n",
+            user.id,
+        )
+        assert result["skipped"] == 1
+
+    def test_other_account_is_not_a_duplicate(self, session, user, account):
+        transaction_service.import_csv(self.CSV, user.id)
+        result = transaction_service.import_csv(
+            self.CSV, user.id, account_id=account.id
+        )
+        assert result["imported"] == 10
+
+    def test_rows_committed_by_concurrent_import_are_skipped(
+        self, session, user, monkeypatch
+    ):
+        transaction_service.import_csv(self.CSV, user.id)
+        drop_existing = transaction_service._drop_existing
+        calls = []
+
+        def stale_first_lookup(params, user_id):
+            # The first lookup ran before the other import committed its rows
+            calls.append(len(params))
+            return params if len(calls) == 1 else drop_existing(params, user_id)
+
+        monkeypatch.setattr(transaction_service, "_drop_existing", stale_first_lookup)
+        result = transaction_service.import_csv(self.CSV, user.id)
+
+        assert (result["imported"], result["skipped"]) == (0, 10)
+        assert calls[:2] == [10, 10]
+        assert transaction_service.count_transactions_for_user(user.id) == 10
+
+    def test_one_lookup_per_batch(self, session, user, count_queries):
+        transaction_service.import_csv(self.CSV, user.id)
+        with count_queries() as q:
+            transaction_service.import_csv(self.CSV, user.id, batch_size=4)
+        lookups = [s for s in q.statements if "fingerprint IN" in s]
+        assert len(lookups) == 3
+
+
+class TestMonthlyRollup:
+    @staticmethod
+    def _rollup(user_id):
+        from app.models.transaction import TransactionMonthlyRollup
+
+        rows = TransactionMonthlyRollup.query.filter_by(user_id=user_id).all()
+        return {
+            (r.month, r.transaction_type): (r.total_amount, r.transaction_count)
+            for r in rows
+        }
+
+    def test_create_update_delete_keep_rollup_in_sync(self, session, user):
+        a = transaction_service.create_transaction(
+            date(2026, 3, 5), "A", Decimal("10.00"), TransactionType.DEBIT, user.id
+        )
+        b = transaction_service.create_transaction(
+            date(2026, 3, 20), "B", Decimal("5.50"), TransactionType.DEBIT, user.id
+        )
+        assert self._rollup(user.id) == {
+            (date(2026, 3, 1), "debit"): (Decimal("15.50"), 2)
+        }
+
+        transaction_service.update_transaction(
+            a.id, transaction_date=date(2026, 4, 1), amount=Decimal("12.00")
+        )
+        transaction_service.update_transaction(
+            b.id, transaction_type=TransactionType.CREDIT
+        )
+        assert self._rollup(user.id) == {
+            (date(2026, 3, 1), "credit"): (Decimal("5.50"), 1),
+            (date(2026, 4, 1), "debit"): (Decimal("12.00"), 1),
+        }
+
+        transaction_service.delete_transaction(b.id)
+        assert self._rollup(user.id) == {
+            (date(2026, 4, 1), "debit"): (Decimal("12.00"), 1)
+        }
+
+    def test_import_updates_rollup_per_batch(self, session, user):
+        csv = "date,payee,amount,type\n" + "".join(
+            f"2026-0{m}-{d:02d},P,{d}.00,debit\n" for m in (1, 2) for d in (1, 2, 3)
+        )
+        transaction_service.import_csv(csv, user.id, batch_size=4)
+        assert self._rollup(user.id) == {
+            (date(2026, 1, 1), "debit"): (Decimal("6.00"), 3),
+            (date(2026, 2, 1), "debit"): (Decimal("6.00"), 3),
+        }
+
+    def test_rebuild_matches_maintained_rollup(self, session, user):
+        from app.models.transaction import TransactionMonthlyRollup
+
+        transaction_service.import_csv(TestBatchedCSVImport.CSV, user.id)
+        maintained = self._rollup(user.id)
+        TransactionMonthlyRollup.query.delete()
+        session.commit()
+
+        assert transaction_service.rebuild_monthly_rollup(user.id) == 1
+        assert self._rollup(user.id) == maintained
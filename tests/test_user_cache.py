@@ -0,0 +1,48 @@
+from app import user_cache
+from app.models.user import User
+
+
+class TestUserLoader:
+    def test_returns_detached_snapshot(self, session, user):
+        cached = user_cache.load_user(user.id)
+        assert isinstance(cached, user_cache.CachedUser)
+        assert (cached.id, cached.username, cached.is_active) == (
+            user.id,
+            "testuser",
+            True,
+        )
+        assert cached.get_id() == str(user.id)
+        # Reading it needs no session
+        session.expunge_all()
+        assert cached.first_name == "Test"
+
+    def test_unknown_user_is_none(self, session):
+        assert user_cache.load_user(9999) is None
+
+    def test_hit_runs_no_query(self, session, user, count_queries):
+        cached = user_cache.load_user(user.id)
+        session.expunge_all()
+        with count_queries() as queries:
+            assert user_cache.load_user(user.id) is cached
+        assert queries.count == 0
+
+    def test_expired_entry_is_reloaded(self, app, session, user, count_queries):
+        app.config["USER_CACHE_TTL"] = 0
+        cached = user_cache.load_user(user.id)
+        session.expunge_all()
+        with count_queries() as queries:
+            assert user_cache.load_user(user.id) is not cached
+        assert queries.count == 1
+
+    def test_committed_update_invalidates(self, session, user):
+        user_cache.load_user(user.id)
+        session.get(User, user.id).first_name = "Renamed"
+        session.commit()
+        assert user_cache.load_user(user.id).first_name == "Renamed"
+
+    def test_rolled_back_update_keeps_entry(self, session, user):
+        cached = user_cache.load_user(user.id)
+        user.first_name = "Discarded"
+        session.flush()
+        session.rollback()
+        assert user_cache.load_user(user.id) is cached